@@ -1,5 +1,21 @@
 from budget.common import EXPECTED_RAW_FIELDS
-from budget.import_data import load_data
+from budget.import_data import (
+    load_data,
+    iter_transactions,
+    iter_batches,
+    load_many,
+    ValidationReport,
+    DataValidationError,
+)
 from budget.transaction import Transaction, save_transactions
 from budget.raw_transaction import RawTransaction
-from budget import screens
+from budget.transaction_store import TransactionStore, TransactionRow
+
+
+def __getattr__(name):
+    # The screens import Textual, which headless use (budget_tool.py report)
+    # has no need for, so they are only imported when first used
+    if name == "screens":
+        import importlib  # pylint: disable=import-outside-toplevel
+        return importlib.import_module("budget.screens")
+    raise AttributeError(f"module 'budget' has no attribute {name!r}")
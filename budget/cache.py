@@ -0,0 +1,273 @@
+"""
+Binary sidecar cache for parsed CSV sessions.
+
+Parsing a large export means running csv.DictReader, parse_date and float()
+over every row. The cache stores the already parsed columns next to the CSV
+(``<file>.btcache``) so that reopening an unchanged file skips all of that.
+
+The cache is keyed by the CSV's size, mtime and a SHA-256 of its content. A
+matching size and mtime is trusted as is, so reopening costs no read of the
+CSV; the content is only hashed when the mtime has changed, to keep the cache
+of a file that was touched or copied but not edited. The cache then takes on
+the new mtime, so the next open needn't hash again. Any other mismatch (or
+any problem reading the cache at all) falls back to the CSV.
+"""
+import datetime
+import hashlib
+import marshal
+import os
+import sys
+from typing import Iterable, Iterator, List
+
+from budget.transaction import Transaction
+from budget.raw_transaction import RawTransaction
+
+CACHE_SUFFIX = ".btcache"
+CACHE_VERSION = 4
+_MAGIC = b"BTCACHE\0"
+
+# Rows per batch written by write_cache(). The cache is a series of
+# length-prefixed batches, so a streaming load can decode the start of a
+# file without reading the rest.
+CACHE_BATCH_SIZE = 2000
+
+# marshal's format can change between interpreter versions
+_FORMAT_KEY = (CACHE_VERSION, sys.version_info[:2], tuple(Transaction.fields_to_persist))
+
+
+def cache_path(csv_filename) -> str:
+    return f"{os.fspath(csv_filename)}{CACHE_SUFFIX}"
+
+
+def _sha256(csv_filename) -> str:
+    digest = hashlib.sha256()
+    with open(csv_filename, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _file_key(csv_filename) -> dict:
+    stat = os.stat(csv_filename)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns,
+            "sha256": _sha256(csv_filename)}
+
+
+def _matches(header: dict, csv_filename) -> bool:
+    """
+    Whether the cache with header was written for csv_filename as it is now.
+    If only the mtime differs, header is updated to the current one.
+    """
+    stat = os.stat(csv_filename)
+    if header["size"] != stat.st_size:
+        return False
+    if header["mtime_ns"] == stat.st_mtime_ns:
+        return True
+    if header["sha256"] != _sha256(csv_filename):
+        return False
+    header["mtime_ns"] = stat.st_mtime_ns
+    return True
+
+
+def _rewrite_header(csv_filename, old: bytes, new: bytes) -> None:
+    """
+    Overwrites the header of the cache in place. Only done if new is the same
+    length as old, which it is for a new mtime of the same magnitude;
+    otherwise the cache is left to be hashed again next time.
+    """
+    if len(new) != len(old):
+        return
+    try:
+        with open(cache_path(csv_filename), "r+b") as fh:
+            fh.seek(len(_MAGIC) + 8)
+            if fh.read(len(old)) == old:
+                fh.seek(len(_MAGIC) + 8)
+                fh.write(new)
+    except OSError:
+        pass
+
+
+class CacheError(Exception):
+    """A cache found to be damaged part way through reading it."""
+
+
+def _read_chunk(fh) -> bytes | None:
+    """The next length-prefixed chunk of fh, or None at the end marker."""
+    prefix = fh.read(8)
+    if len(prefix) != 8:
+        raise CacheError("Cache is truncated")
+    size = int.from_bytes(prefix, "little")
+    if size == 0:
+        return None
+    data = fh.read(size)
+    if len(data) != size:
+        raise CacheError("Cache is truncated")
+    return data
+
+
+def _write_chunk(fh, data: bytes) -> None:
+    fh.write(len(data).to_bytes(8, "little"))
+    fh.write(data)
+
+
+def open_cache(csv_filename) -> Iterator[List[Transaction]] | None:
+    """
+    Returns an iterator over the cached transactions for csv_filename in the
+    batches they were written in, or None if there is no usable cache for the
+    file as it is on disk now. Each batch is only read and decoded when it is
+    reached; the iterator raises CacheError if the cache turns out to be
+    damaged part way through.
+    """
+    try:
+        fh = open(cache_path(csv_filename), "rb")  # pylint: disable=consider-using-with
+    except OSError:
+        return None
+    try:
+        if fh.read(len(_MAGIC)) != _MAGIC:
+            fh.close()
+            return None
+        header_bytes = _read_chunk(fh)
+        header = marshal.loads(header_bytes)
+        if header.get("format") != _FORMAT_KEY or not _matches(header, csv_filename):
+            fh.close()
+            return None
+        updated = marshal.dumps(header)
+        if updated != header_bytes:
+            _rewrite_header(csv_filename, header_bytes, updated)
+    except (OSError, EOFError, ValueError, TypeError, KeyError, AttributeError, CacheError):
+        fh.close()
+        return None
+    return _iter_batches(fh)
+
+
+def _iter_batches(fh) -> Iterator[List[Transaction]]:
+    with fh:
+        while True:
+            try:
+                data = _read_chunk(fh)
+                if data is None:
+                    return
+                batch = from_columns(marshal.loads(data))
+            except (OSError, EOFError, ValueError, TypeError, KeyError, AttributeError) as e:
+                raise CacheError(f"Cache is damaged: {e}") from e
+            yield batch
+
+
+def read_cache(csv_filename) -> List[Transaction] | None:
+    """
+    Returns the cached transactions for csv_filename, or None if there is no
+    usable cache for the file as it is on disk now.
+    """
+    batches = open_cache(csv_filename)
+    if batches is None:
+        return None
+    try:
+        return [trx for batch in batches for trx in batch]
+    except CacheError:
+        return None
+
+
+def from_columns(payload: dict) -> List[Transaction]:
+    """
+    Rebuilds transactions from the column layout produced by to_columns().
+    """
+    fromordinal = datetime.date.fromordinal
+    restore_raw = RawTransaction.restore
+    restore = Transaction.restore
+
+    transactions = []
+    for raw, values, ordinal, amount, processed in zip(
+            payload["raw"], payload["values"], payload["dates"], payload["amounts"],
+            zip(*payload["processed"])):
+        rt = restore_raw(
+            raw,
+            raw if values is None else values,
+            fromordinal(ordinal) if ordinal else None,
+            amount,
+        )
+        transactions.append(restore(rt, *processed))
+    return transactions
+
+
+def to_columns(transactions: List[Transaction]) -> dict | None:
+    """
+    Flattens transactions into plain columns of builtin types, suitable for
+    marshal or for cheap transfer between processes. Returns None if a row has
+    raw columns outside common.EXPECTED_RAW_FIELDS, which the layout can't hold.
+    """
+    raw_column, values_column, dates, amounts = [], [], [], []
+    processed = [[] for _ in Transaction.fields_to_persist]
+
+    # Repeated cells (dates, types, merchants, ...) are written once and shared
+    # by reference, which keeps the cache small and quick to load
+    shared = {}
+
+    def share(values: tuple) -> tuple:
+        return tuple(shared.setdefault(v, v) for v in values)
+
+    # pylint: disable=protected-access
+    for trx in transactions:
+        rt = trx.raw
+        if rt._extra:
+            return None
+        raw = share(rt._raw)
+        raw_column.append(raw)
+        values_column.append(None if rt._values is rt._raw else share(rt._values))
+
+        try:
+            dates.append(rt.date().toordinal())
+        except ValueError:
+            dates.append(0)
+        try:
+            amounts.append(rt.amount_pence())
+        except ValueError:
+            amounts.append(None)
+
+        for field, column in zip(Transaction.fields_to_persist, processed):
+            column.append(getattr(trx, field)())
+
+    return {
+        "raw": raw_column,
+        "values": values_column,
+        "dates": dates,
+        "amounts": amounts,
+        "processed": processed,
+    }
+
+
+def write_cache(csv_filename, transactions: List[Transaction]) -> None:
+    """
+    Writes the sidecar cache for csv_filename. Failures are ignored: the cache
+    is only an optimisation and the CSV remains the source of truth.
+    """
+    write_columns(csv_filename, (
+        to_columns(transactions[start:start + CACHE_BATCH_SIZE])
+        for start in range(0, len(transactions), CACHE_BATCH_SIZE)))
+
+
+def write_columns(csv_filename, batches: Iterable[dict | None]) -> None:
+    """
+    As write_cache, for batches of columns already produced by to_columns().
+    Nothing is written if any batch is None.
+    """
+    tmp_path = cache_path(csv_filename) + ".tmp"
+    try:
+        header = {"format": _FORMAT_KEY, **_file_key(csv_filename)}
+        complete = False
+        with open(tmp_path, "wb") as fh:
+            fh.write(_MAGIC)
+            _write_chunk(fh, marshal.dumps(header))
+            for columns in batches:
+                if columns is None:
+                    break
+                _write_chunk(fh, marshal.dumps(columns))
+            else:
+                # A zero length marks the end, so that a truncated cache is noticed
+                fh.write(bytes(8))
+                complete = True
+        if complete:
+            os.replace(tmp_path, cache_path(csv_filename))
+        else:
+            os.remove(tmp_path)
+    except OSError:
+        pass
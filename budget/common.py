@@ -19,3 +19,6 @@ EXPECTED_RAW_FIELDS = [
     "Money Out",
     "Money In"
 ]
+
+# Shared by every RawTransaction so rows only need to store a tuple of values
+RAW_FIELD_INDEX = {field: index for index, field in enumerate(EXPECTED_RAW_FIELDS)}
@@ -0,0 +1,105 @@
+"""
+Filter membership index for the transaction table.
+
+Every row position is filed under the filter keys it matches ("excluded",
+"all (active)", "uncategorized", "categorized", "unlinked pot" and its
+lowercased category). The app keeps the index current from the transaction
+observer, so applying a filter is a union of sets rather than a rescan of
+every row, and the size of each set is the count FilterScreen shows.
+"""
+from typing import Iterable, Sequence
+
+from budget.row_index import RowIndex, RowPositions
+from budget.transaction import Transaction
+
+# Filters that aren't a category; matched case-insensitively, like categories
+STATUS_FILTERS = ["All (Active)", "Excluded", "Uncategorized", "Categorized", "Unlinked Pot"]
+
+
+def filter_keys(trx: Transaction) -> frozenset[str]:
+    """
+    The lowercased filter keys trx is shown under.
+    """
+    if trx.excluded():
+        return frozenset(["excluded"])
+
+    cat = trx.category()
+    if not cat:
+        return frozenset(["all (active)", "uncategorized"])
+
+    keys = ["all (active)", "categorized", cat.lower()]
+    if cat == "Pot" and not trx.link():
+        keys.append("unlinked pot")
+    return frozenset(keys)
+
+
+class FilterIndex(RowIndex):
+    """
+    Maps each filter key to the set of row positions in a transaction
+    sequence that match it.
+    """
+
+    def __init__(self, transactions: Sequence[Transaction] = (),
+                 positions: RowPositions | None = None):
+        super().__init__(positions)
+        self._members: dict[str, set[int]] = {}
+        # Category of each row, excluded or not, and how many rows have each
+        self._row_categories: list[str] = []
+        self._category_counts: dict[str, int] = {}
+        self.extend(transactions)
+
+    def _keys(self, trx: Transaction) -> frozenset[str]:
+        return filter_keys(trx)
+
+    def _append(self, position: int, trx: Transaction, keys: frozenset[str]) -> None:
+        self._add(position, keys)
+        cat = trx.category()
+        self._row_categories.append(cat)
+        self._count_category(cat, 1)
+
+    def _edited(self, position: int, trx: Transaction) -> None:
+        cat = trx.category()
+        if cat != self._row_categories[position]:
+            self._count_category(self._row_categories[position], -1)
+            self._count_category(cat, 1)
+            self._row_categories[position] = cat
+
+    def _move(self, position: int, old: frozenset[str], new: frozenset[str]) -> None:
+        for key in old - new:
+            members = self._members[key]
+            members.discard(position)
+            if not members:
+                del self._members[key]
+        self._add(position, new - old)
+
+    def _add(self, position: int, keys: Iterable[str]) -> None:
+        for key in keys:
+            self._members.setdefault(key, set()).add(position)
+
+    def _count_category(self, cat: str, change: int) -> None:
+        if not cat:
+            return
+        count = self._category_counts.get(cat, 0) + change
+        if count:
+            self._category_counts[cat] = count
+        else:
+            del self._category_counts[cat]
+
+    def positions(self, filters: Iterable[str]) -> list[int]:
+        """
+        Positions of the rows matching any of filters, in sequence order.
+        """
+        matched: set[int] = set()
+        for key in {f.lower() for f in filters}:
+            matched |= self._members.get(key, set())
+        return sorted(matched)
+
+    def count(self, filter_name: str) -> int:
+        return len(self._members.get(filter_name.lower(), ()))
+
+    def categories(self) -> list[str]:
+        """
+        Every category in use, on excluded rows as well as active ones, in
+        sorted order, as FilterScreen has always listed them.
+        """
+        return sorted(self._category_counts)
@@ -0,0 +1,44 @@
+"""
+Transaction lookup by ID.
+
+Links between transactions are stored as the partner's Transaction ID, so
+the sidebar, pot linking and the summary screen all resolve IDs. IdIndex
+answers those lookups from a dict instead of scanning the session.
+"""
+from typing import Iterable, Iterator
+
+from budget.transaction import Transaction
+
+
+class IdIndex:
+    """
+    Maps Transaction ID to transaction. If an ID occurs more than once, the
+    first occurrence is the one found, as a front-to-back scan would.
+    """
+
+    def __init__(self, transactions: Iterable[Transaction] = ()):
+        self._by_id: dict[str, Transaction] = {}
+        self.extend(transactions)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __iter__(self) -> Iterator[Transaction]:
+        return iter(self._by_id.values())
+
+    def __contains__(self, trx_id: str) -> bool:
+        return trx_id in self._by_id
+
+    def add(self, trx: Transaction) -> Transaction:
+        """
+        Indexes trx unless its ID is already present, and returns the
+        transaction now held for that ID.
+        """
+        return self._by_id.setdefault(trx.id(), trx)
+
+    def extend(self, transactions: Iterable[Transaction]) -> None:
+        for trx in transactions:
+            self.add(trx)
+
+    def get(self, trx_id: str) -> Transaction | None:
+        return self._by_id.get(trx_id)
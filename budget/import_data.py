@@ -1,17 +1,71 @@
 import csv
-from typing import List
+import datetime
+import glob
+import itertools
+import os
+from typing import Iterable, Iterator, List
 
 from budget.transaction import Transaction
 from budget.raw_transaction import RawTransaction
 from budget.common import EXPECTED_RAW_FIELDS
+from budget import cache, journal
+from budget.id_index import IdIndex
 
 
-def load_data(csv_filename: str) -> List[Transaction]:
+class ValidationReport:
     """
-    Reads a raw or processed data file. 
+    Collects every bad cell found while decoding a file, so a load can report
+    them all at once instead of failing on the first one deep inside the UI.
+    """
+
+    def __init__(self):
+        # (CSV line number, field, raw value, error message)
+        self.errors: list[tuple[int, str, str, str]] = []
+
+    def __bool__(self) -> bool:
+        return bool(self.errors)
+
+    def __len__(self) -> int:
+        return len(self.errors)
+
+    def add(self, line: int, field: str, value: str, message: str) -> None:
+        self.errors.append((line, field, value, message))
+
+    def summary(self, limit: int = 5) -> str:
+        lines = [f"line {line}, {field}: {message}"
+                 for line, field, _value, message in self.errors[:limit]]
+        if len(self.errors) > limit:
+            lines.append(f"... and {len(self.errors) - limit} more")
+        return f"{len(self.errors)} invalid cell(s): " + "; ".join(lines)
+
+
+class DataValidationError(ValueError):
+    def __init__(self, report: ValidationReport):
+        super().__init__(report.summary())
+        self.report = report
+
+
+def iter_transactions(csv_filename: str, apply_journal: bool = True,
+                      report: ValidationReport | None = None) -> Iterator[Transaction]:
+    """
+    Lazily reads a raw or processed data file, yielding one Transaction per row.
     The data file must have at least all of common.EXPECTED_RAW_FIELDS
+
+    Only the current row is held in memory, so this is suitable for headless
+    jobs (totals, exports, validation) over very large histories.
+
+    If apply_journal is set, any edits in the file's journal (see budget.journal)
+    are applied to each row as it is read.
+
+    Every date and numeric column is decoded once as the row is read. Bad cells
+    are added to report; without one, a DataValidationError listing them all is
+    raised after the last row.
     """
-    rows: List[Transaction] = []
+    raise_at_end = report is None
+    if report is None:
+        report = ValidationReport()
+    edits = journal.read_journal(csv_filename) if apply_journal else {}
+
     with open(csv_filename, newline='', encoding='utf-8') as fh:
         reader = csv.DictReader(fh)
 
@@ -36,8 +90,169 @@ def load_data(csv_filename: str) -> List[Transaction]:
                 processed_data[internal_field] = row[csv_col]
 
             rt = RawTransaction(raw_data)
+            for field, value, message in rt.decode():
+                report.add(reader.line_num, field, value, message)
+
             trx = Transaction(rt, processed_data)
+            if edits:
+                journal.apply_edits(trx, edits)
+            yield trx
+
+    if raise_at_end and report:
+        raise DataValidationError(report)
+
+
+def load_data(csv_filename: str, use_cache: bool = True) -> List[Transaction]:
+    """
+    Reads a raw or processed data file.
+    The data file must have at least all of common.EXPECTED_RAW_FIELDS
+
+    If use_cache is set, an unchanged file is loaded from its binary sidecar
+    cache (see budget.cache), and a fresh cache is written after parsing.
+    Edits from the file's journal are replayed on top in either case.
+    """
+    transactions = cache.read_cache(csv_filename) if use_cache else None
+
+    if transactions is None:
+        # The cache mirrors the CSV alone, so parse without the journal here
+        transactions = list(iter_transactions(csv_filename, apply_journal=False))
+        if use_cache:
+            cache.write_cache(csv_filename, transactions)
+
+    journal.replay_journal(csv_filename, transactions)
+    return transactions
+
+
+def iter_batches(csv_filename: str, batch_size: int = 2000,
+                 first_batch: int = 100) -> Iterator[List[Transaction]]:
+    """
+    Loads the same transactions as load_data, yielding them in batches as they
+    are parsed so a caller can show the start of a large file straight away.
+
+    The first batch is kept small (about a screenful); later ones hold
+    batch_size rows. Journal edits are already applied to every yielded row.
+    """
+    column_batches = None
+    edits = journal.read_journal(csv_filename)
+    cached = cache.open_cache(csv_filename)
+    if cached is not None:
+        rows = _cached_rows(csv_filename, cached, edits)
+    else:
+        rows = iter_transactions(csv_filename, apply_journal=bool(edits))
+        if not edits:
+            # The cache mirrors the CSV alone, so only write it when no
+            # journal edit has been applied to the parsed rows
+            column_batches = []
+
+    size = first_batch
+    while batch := list(itertools.islice(rows, size)):
+        if column_batches is not None:
+            # Snapshot before yielding, as the caller may edit the rows
+            column_batches.append(cache.to_columns(batch))
+        yield batch
+        size = batch_size
+
+    if column_batches is not None:
+        cache.write_columns(csv_filename, column_batches)
+
+
+def _cached_rows(csv_filename: str, batches: Iterator[List[Transaction]],
+                 edits: dict[str, dict]) -> Iterator[Transaction]:
+    """
+    The rows of an open cache, with journal edits applied. If the cache turns
+    out to be damaged part way through, the remaining rows are parsed from
+    the CSV instead.
+    """
+    count = 0
+    try:
+        for batch in batches:
+            for trx in batch:
+                journal.apply_edits(trx, edits)
+                count += 1
+                yield trx
+    except cache.CacheError:
+        rows = iter_transactions(csv_filename, apply_journal=bool(edits))
+        yield from itertools.islice(rows, count, None)
+
+
+def _expand_sources(sources) -> List[str]:
+    if isinstance(sources, (str, os.PathLike)):
+        pattern = os.fspath(sources)
+        paths = sorted(glob.glob(pattern))
+        if not paths and not glob.has_magic(pattern):
+            # Let load_data raise the usual error for a missing file
+            paths = [pattern]
+        return paths
+    return [os.fspath(p) for p in sources]
+
+
+def _merge_processed(kept: Transaction, duplicate: Transaction) -> None:
+    """
+    Folds duplicate's processed values into kept: a set value beats an empty
+    one, and between two set values the later source wins.
+    """
+    for field in Transaction.fields_to_persist:
+        value = getattr(duplicate, field)()
+        if value:
+            getattr(kept, f"set_{field}")(value)
+
+
+def _chronological_key(trx: Transaction):
+    try:
+        date = trx.date()
+    except ValueError:
+        date = datetime.date.min
+    return date, trx.raw.time()
+
+
+def load_many(sources, max_workers: int | None = None) -> List[Transaction]:
+    """
+    Loads several raw or processed data files (a glob pattern or an iterable
+    of paths) and merges them into one chronologically ordered list.
+
+    Files are parsed in parallel in a process pool. Rows that appear in more
+    than one file (overlapping monthly exports) are de-duplicated by
+    Transaction ID; the first occurrence is kept and the processed values of
+    the others are merged into it, in source order, following
+    _merge_processed.
+    """
+    paths = _expand_sources(sources)
+    if max_workers is None:
+        max_workers = min(len(paths), os.cpu_count() or 1)
+    if len(paths) <= 1 or max_workers <= 1:
+        return _merge(map(load_data, paths))
+
+    # Deferred, as the process pool machinery is slow to import and most
+    # callers (the headless report among them) never need it
+    from concurrent.futures import ProcessPoolExecutor  # pylint: disable=import-outside-toplevel
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        loaded = (cache.from_columns(columns)
+                  for columns in pool.map(_load_columns, paths))
+        return _merge(loaded)
+
+
+def _load_columns(csv_filename: str) -> dict:
+    """
+    Process pool worker for load_many. Columns of builtins pickle far more
+    cheaply than a list of Transaction objects.
+    """
+    transactions = load_data(csv_filename)
+    columns = cache.to_columns(transactions)
+    if columns is None:
+        raise ValueError(f"Unexpected raw columns in {csv_filename}")
+    return columns
+
 
+def _merge(loaded: Iterable[List[Transaction]]) -> List[Transaction]:
+    by_id = IdIndex()
+    for transactions in loaded:
+        for trx in transactions:
+            kept = by_id.add(trx)
+            if kept is not trx:
+                _merge_processed(kept, trx)
 
-            rows.append(trx)
-    return rows
+    # sort() is stable, so same-timestamp rows keep their file order
+    merged = list(by_id)
+    merged.sort(key=_chronological_key)
+    return merged
@@ -0,0 +1,164 @@
+"""
+Append-only edit journal for CSV sessions.
+
+Rather than rewriting the whole CSV on every save, each change to a processed
+field is appended to ``<file>.btjournal`` as one JSON line holding the
+transaction ID, the field and its new value. load_data() replays the journal
+on top of the CSV, and compact() periodically folds it back into the CSV.
+
+The first line of a journal records the size and modification time of the
+CSV it was started against. If the CSV has since been rewritten, by a full
+save or by anything else, the journal no longer applies and is ignored.
+"""
+import json
+import os
+from typing import Iterable
+
+from budget.journal_file import journal_path
+from budget.transaction import Transaction, save_transactions
+
+# Once the journal holds this many entries a save folds it back into the CSV
+DEFAULT_COMPACT_AFTER = 5000
+
+
+def _csv_stamp(csv_filename) -> dict | None:
+    try:
+        st = os.stat(csv_filename)
+    except FileNotFoundError:
+        return None
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def _is_current(fh, csv_filename) -> bool:
+    """
+    Reads the header line of an open journal and returns whether it was
+    started against csv_filename as it is now. A journal without a header
+    (from before headers were written) is taken to be current.
+    """
+    first = fh.readline()
+    try:
+        header = json.loads(first)
+    except ValueError:
+        header = None
+    if not isinstance(header, dict) or "csv" not in header:
+        fh.seek(0)
+        return True
+    return header["csv"] == _csv_stamp(csv_filename)
+
+
+def read_journal(csv_filename) -> dict[str, dict]:
+    """
+    Returns {transaction id: {field: value}} with the latest value of every
+    journalled field. A torn last line (e.g. from a crash mid-write) is ignored,
+    and so is a journal left over from before the CSV was last rewritten.
+    """
+    edits: dict[str, dict] = {}
+    try:
+        with open(journal_path(csv_filename), encoding="utf-8") as fh:
+            if not _is_current(fh, csv_filename):
+                return edits
+            for line in fh:
+                try:
+                    entry = json.loads(line)
+                    field = entry["field"]
+                    if field in Transaction.fields_to_persist:
+                        edits.setdefault(entry["id"], {})[field] = entry["value"]
+                except (ValueError, KeyError, TypeError):
+                    continue
+    except FileNotFoundError:
+        pass
+    return edits
+
+
+def apply_edits(trx: Transaction, edits: dict[str, dict]) -> None:
+    for field, value in edits.get(trx.id(), {}).items():
+        getattr(trx, f"set_{field}")(value)
+
+
+def replay_journal(csv_filename, transactions: Iterable[Transaction]) -> None:
+    edits = read_journal(csv_filename)
+    if not edits:
+        return
+    for trx in transactions:
+        apply_edits(trx, edits)
+
+
+class EditJournal:
+    """
+    Collects processed-field changes for one CSV session.
+
+    record() is a Transaction observer callback; changes are only buffered
+    until flush(), so unsaved edits never reach disk, matching the app's
+    explicit save model.
+    """
+
+    def __init__(self, csv_filename, compact_after: int = DEFAULT_COMPACT_AFTER):
+        self.csv_filename = os.fspath(csv_filename)
+        self.path = journal_path(csv_filename)
+        self.compact_after = compact_after
+        self._pending: list[dict] = []
+        # None until there is a journal current with the CSV
+        self._entries_on_disk = self._count_entries()
+
+    def _count_entries(self) -> int | None:
+        """Entries in the journal on disk, or None if there is no current one."""
+        try:
+            with open(self.path, encoding="utf-8") as fh:
+                if not _is_current(fh, self.csv_filename):
+                    return None
+                return sum(1 for _ in fh)
+        except FileNotFoundError:
+            return None
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def record(self, trx: Transaction, field: str, _old, new) -> None:
+        if field in Transaction.fields_to_persist:
+            self._pending.append({"id": trx.id(), "field": field, "value": new})
+
+    def flush(self) -> None:
+        """
+        Appends the buffered changes and fsyncs, so a crash loses at most the
+        write in progress.
+        """
+        if not self._pending:
+            return
+        if self._entries_on_disk is None:
+            # Start a new journal, replacing any stale one, against the CSV as it is now
+            mode, header = "w", {"csv": _csv_stamp(self.csv_filename)}
+            self._entries_on_disk = 0
+        else:
+            mode, header = "a", None
+        with open(self.path, mode, encoding="utf-8") as fh:
+            if header is not None:
+                fh.write(json.dumps(header) + "\n")
+            for entry in self._pending:
+                fh.write(json.dumps(entry) + "\n")
+            fh.flush()
+            os.fsync(fh.fileno())
+        self._entries_on_disk += len(self._pending)
+        self._pending = []
+
+    def needs_compaction(self) -> bool:
+        return (self._entries_on_disk or 0) >= self.compact_after
+
+    def compact(self, transactions: Iterable[Transaction], progress=None) -> None:
+        """
+        Rewrites the CSV from transactions (which must already include every
+        journalled change) and truncates the journal. Changes still pending are
+        kept, so edits made while a compaction runs are not lost.
+        """
+        # save_transactions() discards the journal once the CSV is replaced
+        save_transactions(self.csv_filename, transactions, progress=progress)
+        self._entries_on_disk = None
+
+    def save(self, transactions: Iterable[Transaction]) -> None:
+        """
+        Makes every change so far durable, compacting if the journal has grown
+        large enough.
+        """
+        self.flush()
+        if self.needs_compaction():
+            self.compact(transactions)
@@ -0,0 +1,22 @@
+"""
+Where a CSV's edit journal lives (see budget.journal).
+
+Kept apart from budget.journal so that save_transactions() can discard the
+journal of a file it rewrites without importing the journal machinery, which
+itself builds on budget.transaction.
+"""
+import os
+
+JOURNAL_SUFFIX = ".btjournal"
+
+
+def journal_path(csv_filename) -> str:
+    return f"{os.fspath(csv_filename)}{JOURNAL_SUFFIX}"
+
+
+def discard_journal(csv_filename) -> None:
+    """Deletes the journal of csv_filename, if it has one."""
+    try:
+        os.remove(journal_path(csv_filename))
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,119 @@
+"""
+Link graph integrity.
+
+A link is stored on both sides as the partner's Transaction ID (or, for a
+group, the member IDs joined by Transaction.LINK_SEPARATOR), so an edit that
+updates one side only leaves the graph inconsistent and the sidebar shows
+"ID: ... (Not found)". check_links() finds such links in one pass over the
+session and repair_links() drops them.
+"""
+from typing import Iterable
+
+from budget.transaction import Transaction
+
+
+class LinkReport:
+    """
+    The broken links of a session. A link holds only if both sides list each
+    other; anything else is reported, and is what repair_links() removes.
+    """
+
+    def __init__(self):
+        # (transaction, ID it links to that isn't in the session)
+        self.orphans: list[tuple[Transaction, str]] = []
+        # (transaction, ID of a partner that doesn't link back to it)
+        self.asymmetric: list[tuple[Transaction, str]] = []
+        # Partner ID -> the transactions claiming it, where several do and
+        # the partner doesn't list them all
+        self.collisions: dict[str, list[Transaction]] = {}
+        # (transaction, the IDs of its links that hold) for every row to repair
+        self.repairs: list[tuple[Transaction, list[str]]] = []
+
+    def __bool__(self) -> bool:
+        return bool(self.repairs)
+
+    def __len__(self) -> int:
+        return len(self.orphans) + len(self.asymmetric)
+
+    def summary(self) -> str:
+        parts = [f"{len(self.orphans)} dangling", f"{len(self.asymmetric)} one-sided"]
+        if self.collisions:
+            parts.append(f"{len(self.collisions)} claimed by several transactions")
+        return f"{len(self)} broken link(s): " + ", ".join(parts)
+
+
+def _lists(link: str, trx_id: str) -> bool:
+    """Whether the stored link includes trx_id."""
+    return link == trx_id or (Transaction.LINK_SEPARATOR in link
+                              and trx_id in link.split(Transaction.LINK_SEPARATOR))
+
+
+def check_links(transactions: Iterable[Transaction]) -> LinkReport:
+    """
+    Checks that every link in transactions is reciprocated.
+
+    A single pass files every ID, and the stored link of every linked row, in
+    hash tables; the checks are then lookups, so the cost is linear in the
+    number of rows. Manual links have no partner and are always valid. If an
+    ID occurs more than once, its first occurrence is the one checked, as in
+    IdIndex.
+    """
+    all_ids: set[str] = set()
+    # Stored link and transaction of each linked row, by ID. Links are kept
+    # as stored, and only split when checked, to keep this pass cheap.
+    links: dict[str, str] = {}
+    rows: dict[str, Transaction] = {}
+    for trx in transactions:
+        trx_id = trx.id()
+        if trx_id in all_ids:
+            continue
+        all_ids.add(trx_id)
+        link = trx.link()
+        if link and link != Transaction.MANUAL_LINK_ID:
+            links[trx_id] = link
+            rows[trx_id] = trx
+
+    def holds(trx_id: str, partner_id: str) -> bool:
+        partner_link = links.get(partner_id)
+        return partner_link is not None and _lists(partner_link, trx_id)
+
+    report = LinkReport()
+    # Partner ID -> transactions linking to it that it doesn't link back to
+    unreciprocated: dict[str, list[Transaction]] = {}
+    for trx_id, link in links.items():
+        trx = rows[trx_id]
+        ids = link.split(Transaction.LINK_SEPARATOR)
+        broken = False
+        for partner_id in ids:
+            if holds(trx_id, partner_id):
+                continue
+            broken = True
+            if partner_id in all_ids:
+                report.asymmetric.append((trx, partner_id))
+                unreciprocated.setdefault(partner_id, []).append(trx)
+            else:
+                report.orphans.append((trx, partner_id))
+        if broken:
+            report.repairs.append((trx, [i for i in ids if holds(trx_id, i)]))
+
+    for partner_id, claimed_by in unreciprocated.items():
+        partner_link = links.get(partner_id, "")
+        listed = [rows[i] for i in partner_link.split(Transaction.LINK_SEPARATOR)
+                  if partner_link and holds(partner_id, i)]
+        if len(listed) + len(claimed_by) > 1:
+            report.collisions[partner_id] = listed + claimed_by
+    return report
+
+
+def repair_links(report: LinkReport) -> list[Transaction]:
+    """
+    Removes every broken link found by check_links, keeping the ones that
+    hold, and returns the transactions changed. A row left with no link goes
+    back to being unlinked, to be linked again by hand or with auto-link.
+    """
+    changed = []
+    for trx, kept in report.repairs:
+        trx.set_link(Transaction.LINK_SEPARATOR.join(kept))
+        changed.append(trx)
+    report.repairs = []
+    return changed
@@ -1,19 +1,117 @@
+import os
+import sqlite3
+from typing import Iterable
+
 from textual.app import App, ComposeResult
-from textual.widgets import Header, Footer, DataTable
+from textual.widgets import Header, Footer, Label, ProgressBar
+from textual.worker import Worker, WorkerState, get_current_worker
 from textual.containers import Horizontal, Vertical
 from textual.binding import Binding
-from budget import load_data, save_transactions
+from budget import iter_batches, save_transactions
 from budget.transaction import Transaction
+from budget.transaction_store import TransactionStore
+from budget.sqlite_store import SqliteSession, is_sqlite_path, save_sqlite
+from budget.journal import EditJournal
+from budget.filter_index import STATUS_FILTERS, FilterIndex, filter_keys
+from budget.id_index import IdIndex
+from budget.link_graph import check_links, repair_links
+from budget.money import format_pence
+from budget.pot_linking import (
+    POT_TRANSFER_TYPE,
+    PotTransferIndex,
+    find_groupings,
+    is_pot_spend,
+    link_group,
+    link_pair,
+    linked_ids,
+    propose_links,
+    unlink_partners,
+)
+from budget.summary_totals import SUMMARY_FIELDS, SummaryTotals
+from budget.period_cube import PeriodCube
+from budget.row_index import RowPositions
+from budget.rules import DEFAULT_RULES_PATH, load_rules
 from budget.screens import (
     SaveOrLoadScreen,
     SaveChangesConfirmScreen,
     FilterScreen,
     PotCategoryScreen,
     SummaryScreen,
+    AutoLinkScreen,
+    PeriodComparisonScreen,
 )
 from budget.screens.pot_transfer import PotTransferSelectScreen
+from budget.screens.pot_group import PotGroupSelectScreen
 from budget.widgets import TransactionDetails, TransactionTable
 
+def _same_file(path_a: str, path_b: str) -> bool:
+    return os.path.abspath(path_a) == os.path.abspath(path_b)
+
+def _matches_filters(trx: Transaction, filters: set[str]) -> bool:
+    """
+    Whether trx is shown under filters, a set of lowercased filter names.
+    """
+    return not filter_keys(trx).isdisjoint(filters)
+
+class _DisplayPositions:
+    """
+    Index in displayed_transactions of each shown row, by its position in the
+    session, kept current as rows are appended and removed.
+
+    Rows are numbered in the order they were shown, and a Fenwick tree over
+    the numbers marks the rows still shown. A row's index is then the prefix
+    sum before its number, so lookups and removals both cost O(log n).
+    """
+
+    def __init__(self, positions: Iterable[int] = ()):
+        # Number -> session position, and back for rows still shown
+        self._rows: list[int] = []
+        self._numbers: dict[int, int] = {}
+        # 1-based Fenwick tree of the shown flags of the numbers
+        self._tree: list[int] = [0]
+        self.extend(positions)
+
+    def extend(self, positions: Iterable[int]) -> None:
+        tree = self._tree
+        for position in positions:
+            self._numbers[position] = len(self._rows)
+            self._rows.append(position)
+            # The new node holds its own flag and those of the nodes it spans
+            node = len(tree)
+            total, child, stop = 1, node - 1, node - (node & -node)
+            while child > stop:
+                total += tree[child]
+                child -= child & -child
+            tree.append(total)
+
+    def remove_at(self, index: int) -> None:
+        """Records that the row at index was removed."""
+        tree = self._tree
+        # Descend to the last number with index shown rows up to it
+        number, remaining = 0, index
+        step = 1 << (len(tree) - 1).bit_length()
+        while step:
+            node = number + step
+            if node < len(tree) and tree[node] <= remaining:
+                number, remaining = node, remaining - tree[node]
+            step >>= 1
+        # The row removed is the one after, whose node is number + 1
+        node = number + 1
+        while node < len(tree):
+            tree[node] -= 1
+            node += node & -node
+        del self._numbers[self._rows[number]]
+
+    def index(self, position: int) -> int | None:
+        number = self._numbers.get(position)
+        if number is None:
+            return None
+        tree, total = self._tree, 0
+        while number:
+            total += tree[number]
+            number -= number & -number
+        return total
+
 class BudgetApp(App):
     CSS_PATH = "styles/style.tcss"
 
@@ -28,83 +126,275 @@ class BudgetApp(App):
         Binding("f", "filter_menu", "Filter"),
         Binding("ctrl+s", "save_transactions", "Save"),
         Binding("s", "show_summary", "Summary"),
+        Binding("C", "compare_periods", "Compare"),
         Binding("l", "load_file", "Load"),
         Binding("c", "clear_row_data", "Clear Row"),
         Binding("x", "toggle_excluded", "Exclude"),
         Binding("m", "mark_manual_link", "Manual Link"),
         Binding("i", "toggle_income", "Income"),
+        Binding("a", "auto_link", "Auto Link"),
+        Binding("G", "group_link", "Group Link"),
+        Binding("A", "auto_categorise", "Auto Categorise"),
+        Binding("R", "repair_links", "Repair Links"),
         Binding("q", "quit", "Quit"),
+        Binding("escape", "cancel_load", "Cancel Load", show=False),
     ]
 
-    def __init__(self, file_path: str | None = None):
+    def __init__(self, file_path: str | None = None, rules_path: str | None = None):
         super().__init__()
         self.file_path = file_path
-        self.transactions = []
+        self.rules_path = rules_path or str(DEFAULT_RULES_PATH)
+        self._transactions = []
+        self._row_positions = RowPositions()
+        self._filter_index = FilterIndex()
+        self._id_index = IdIndex()
+        self._transfer_index = PotTransferIndex()
+        self._summary_totals = SummaryTotals()
+        self._period_cube = PeriodCube()
+        self._totals_refresh_pending = False
+        self._sqlite_session: SqliteSession | None = None
+        self._journal: EditJournal | None = None
         self.displayed_transactions = []
         self.filter_categories = {"All (Active)"}
-        self.unsaved_changes = False
+        # Bumped on every edit so a background save can tell whether the
+        # session changed while it was being written
+        self._edit_generation = 0
+        self._unsaved_changes = False
+        self._save_worker: Worker | None = None
+        self._save_context = None
+        self._load_worker: Worker | None = None
+        self._load_path: str | None = None
+        self._display_positions = _DisplayPositions()
+
+    @property
+    def unsaved_changes(self) -> bool:
+        return self._unsaved_changes
+
+    @unsaved_changes.setter
+    def unsaved_changes(self, value: bool) -> None:
+        if value:
+            self._edit_generation += 1
+        self._unsaved_changes = value
+
+    @property
+    def transactions(self):
+        return self._transactions
+
+    @transactions.setter
+    def transactions(self, transactions) -> None:
+        self._transactions = transactions
+        # One position map for every index that tracks rows by position
+        positions = self._row_positions = RowPositions()
+        self._filter_index = FilterIndex(transactions, positions)
+        self._id_index = IdIndex(transactions)
+        self._transfer_index = PotTransferIndex(transactions)
+        self._summary_totals = SummaryTotals(transactions, positions)
+        self._period_cube = PeriodCube(transactions, positions=positions)
+        self._schedule_totals_refresh()
+        if isinstance(transactions, TransactionStore):
+            transactions.set_observer(self._on_transaction_changed)
+        else:
+            for trx in transactions:
+                trx.set_observer(self._on_transaction_changed)
+
+    def _on_transaction_changed(self, trx, field: str, old, new) -> None:
+        """Called by every loaded transaction when one of its processed fields changes."""
+        if self._sqlite_session is not None:
+            self._sqlite_session.record_change(trx, field, old, new)
+        if self._journal is not None:
+            self._journal.record(trx, field, old, new)
+        self._filter_index.update(trx)
+        if field in ("link", "excluded"):
+            self._transfer_index.update(trx)
+        if field in SUMMARY_FIELDS:
+            self._summary_totals.update(trx)
+            self._period_cube.update(trx)
+            self._schedule_totals_refresh()
+        self.unsaved_changes = True
+
+    def _schedule_totals_refresh(self) -> None:
+        """Updates the running totals once the current batch of edits is done."""
+        if not self._totals_refresh_pending:
+            self._totals_refresh_pending = True
+            self.call_after_refresh(self._refresh_totals)
+
+    def _totals(self):
+        """
+        Where summary totals are read from: a SQLite session answers them in
+        SQL, other sessions from the running SummaryTotals.
+        """
+        if self._sqlite_session is not None:
+            return self._sqlite_session
+        return self._summary_totals
+
+    def _refresh_totals(self) -> None:
+        self._totals_refresh_pending = False
+        totals = self._totals()
+        uncategorized = totals.category_totals().get("Uncategorized", 0)
+        self.query_one("#running-totals", Label).update(
+            f"Income {format_pence(totals.income_total())}  "
+            f"Spending {format_pence(totals.spending_total())}  "
+            f"Pots {format_pence(sum(totals.pot_totals().values()))}  "
+            f"Uncategorized {format_pence(uncategorized)}")
 
     def compose(self) -> ComposeResult:
         yield Header()
         with Horizontal():
             with Vertical(id="left-pane"):
                 yield TransactionTable()
+                yield Label(id="running-totals")
+                yield Label(id="load-status")
+                yield ProgressBar(id="save-progress", show_eta=False)
             yield TransactionDetails(id="right-pane")
         yield Footer()
 
     def on_mount(self) -> None:
         if self.file_path:
-            self.load_transactions(self.file_path)
+            self.stream_transactions(self.file_path)
 
-    def load_transactions(self, file_path: str) -> None:
+    def load_transactions(self, file_path: str) -> bool:
+        """
+        Loads file_path in one go, returning whether it was loaded.
+        """
         try:
-            self.transactions = load_data(file_path)
-            self.unsaved_changes = False
-        except (ValueError, IOError) as e:
+            if is_sqlite_path(file_path):
+                session, journal = SqliteSession(file_path), None
+                transactions = session.load()
+            else:
+                session, journal = None, EditJournal(file_path)
+                transactions = TransactionStore.from_csv(file_path)
+        except (ValueError, IOError, sqlite3.Error) as e:
             self.notify(f"Error loading file: {e}", severity="error")
-            return
+            return False
+
+        self._cancel_load()
+        self._close_sqlite_session()
+        self._sqlite_session = session
+        self._journal = journal
+        self.transactions = transactions
+        self.unsaved_changes = False
 
         self._apply_filters()
+        self._check_links()
+        return True
 
-    def _apply_filters(self) -> None:
+    def stream_transactions(self, file_path: str) -> None:
+        """
+        Loads a CSV on a worker thread, adding rows to the table in batches as
+        they are parsed, so the start of a large file can be browsed at once.
+        The load can be cancelled with escape, which discards the partial data.
+
+        SQLite sessions are queried quickly enough to load directly.
+        """
+        if is_sqlite_path(file_path):
+            if self.load_transactions(file_path):
+                self.notify(f"Loaded {file_path}")
+            return
+
+        self._reset_session()
+        self._journal = EditJournal(file_path)
+        self._load_path = file_path
+        self._set_load_status(f"Loading {file_path}... (Esc to cancel)")
+        self._load_worker = self.run_worker(
+            lambda: self._stream_batches(file_path),
+            name=f"load {file_path}",
+            group="load",
+            thread=True,
+            exit_on_error=False,
+        )
+
+    def _stream_batches(self, file_path: str) -> None:
+        """Worker thread body for stream_transactions."""
+        worker = get_current_worker()
+        for batch in iter_batches(file_path):
+            if worker.is_cancelled:
+                return
+            self.call_from_thread(self._add_loaded_batch, worker, batch)
+
+    def _add_loaded_batch(self, worker: Worker, batch: list[Transaction]) -> None:
+        # A batch can still arrive from a load that has since been cancelled
+        if worker is not self._load_worker:
+            return
+
+        # The parsed Transactions are copied into the store's columns; from
+        # here on the session works with the store's row views
+        start = len(self._transactions)
+        self._transactions.extend(batch)
+        batch = [self._transactions[i] for i in range(start, len(self._transactions))]
+        self._filter_index.extend(batch)
+        self._id_index.extend(batch)
+        self._transfer_index.extend(batch)
+        self._summary_totals.extend(batch)
+        self._period_cube.extend(batch)
+        self._schedule_totals_refresh()
+
+        filters = self._normalised_filters()
+        shown_at = [start + i for i, trx in enumerate(batch) if _matches_filters(trx, filters)]
+        shown = [batch[position - start] for position in shown_at]
+        table = self.query_one(TransactionTable)
+        first_rows = not self.displayed_transactions
+        table.append_rows(shown)
+        self.displayed_transactions.extend(shown)
+        self._display_positions.extend(shown_at)
+        if first_rows and shown:
+            table.focus()
+
+        self._set_load_status(
+            f"Loading {self._load_path}: {len(self._transactions):,} rows (Esc to cancel)")
+
+    def _load_finished(self, event: Worker.StateChanged) -> None:
+        file_path = self._load_path
+        self._load_worker = None
+        self._load_path = None
+        self._set_load_status(None)
+
+        if event.state == WorkerState.SUCCESS:
+            self.notify(f"Loaded {file_path}")
+            self._check_links()
+            return
+
+        # Never leave a partial file open, where a save could drop the rest
+        self._reset_session()
+        if event.state == WorkerState.CANCELLED:
+            self.notify("Load cancelled")
+        else:
+            self.notify(f"Error loading file: {event.worker.error}", severity="error")
+
+    def action_cancel_load(self) -> None:
+        if self._load_worker is not None:
+            self._load_worker.cancel()
+
+    def _cancel_load(self) -> None:
+        """Abandons a load in progress without waiting for it."""
+        if self._load_worker is not None:
+            worker = self._load_worker
+            self._load_worker = None
+            self._load_path = None
+            worker.cancel()
+            self._set_load_status(None)
+
+    def _set_load_status(self, text: str | None) -> None:
+        status = self.query_one("#load-status", Label)
+        status.update(text or "")
+        status.display = text is not None
+
+    def _normalised_filters(self) -> set[str]:
         # Normalize filter categories to lowercase for case-insensitive comparison
-        # Keep special keys as is or handle them specifically
-        filters = {f.lower() for f in self.filter_categories}
+        return {f.lower() for f in self.filter_categories}
+
+    def _apply_filters(self) -> None:
+        filters = self._normalised_filters()
 
         table = self.query_one(TransactionTable)
         cursor_row = table.cursor_coordinate.row
 
-        self.displayed_transactions = []
-        for trx in self.transactions:
-            is_excluded = trx.excluded()
-
-            # 1. Check Excluded filter
-            if "excluded" in filters and is_excluded:
-                self.displayed_transactions.append(trx)
-                continue
-
-            # 2. If excluded, skip (unless we matched above)
-            if is_excluded:
-                continue
-
-            # 3. Non-excluded filters
-            if "all (active)" in filters:
-                self.displayed_transactions.append(trx)
-                continue
-
-            cat = trx.category()
-            if "uncategorized" in filters and not cat:
-                self.displayed_transactions.append(trx)
-                continue
-            if "categorized" in filters and cat:
-                self.displayed_transactions.append(trx)
-                continue
-            if "unlinked pot" in filters and cat == "Pot" and not trx.link():
-                self.displayed_transactions.append(trx)
-                continue
-            if cat.lower() in filters:
-                self.displayed_transactions.append(trx)
-                continue
+        transactions = self.transactions
+        if self._sqlite_session is not None:
+            shown_at = self._sqlite_session.filtered_positions(filters)
+        else:
+            shown_at = self._filter_index.positions(filters)
+        self.displayed_transactions = [transactions[i] for i in shown_at]
+        self._display_positions = _DisplayPositions(shown_at)
 
         table.load_data(self.displayed_transactions)
 
@@ -114,8 +404,8 @@ class BudgetApp(App):
             table.cursor_coordinate = (new_row, 0)
 
     def action_filter_menu(self) -> None:
-        # Collect unique categories
-        categories = [t.category() for t in self.transactions if t.category()]
+        categories = self._filter_index.categories()
+        counts = {name: self._filter_index.count(name) for name in STATUS_FILTERS + categories}
 
         def check_filter(result: list[str] | None) -> None:
             if result is not None:
@@ -123,9 +413,11 @@ class BudgetApp(App):
                 self.notify(f"Filter: {', '.join(self.filter_categories)}")
                 self._apply_filters()
 
-        self.push_screen(FilterScreen(categories, self.filter_categories), check_filter)
+        self.push_screen(FilterScreen(categories, self.filter_categories, counts),
+                         check_filter)
 
-    def on_data_table_row_highlighted(self, _event: DataTable.RowHighlighted) -> None:
+    def on_transaction_table_row_highlighted(
+            self, _event: TransactionTable.RowHighlighted) -> None:
         """Updates the sidebar using the row key from the highlight event."""
         if not self.displayed_transactions:
             return
@@ -155,10 +447,13 @@ class BudgetApp(App):
                                 linked_trx.set_category("Pot")
                                 linked_trx.set_pot_category(result)
                                 linked_trx.set_link(trx.id())
+                                self._update_row(linked_trx)
+                                return
 
                         self._update_row()
 
-                    self.push_screen(PotTransferSelectScreen(trx, self.transactions), check_link)
+                    self.push_screen(PotTransferSelectScreen(trx, self._transfer_index),
+                                     check_link)
                 else:
                     self._update_row()
 
@@ -177,14 +472,11 @@ class BudgetApp(App):
         trx = self._get_trx_for_cursor()
 
         # Handle unlinking if necessary
-        if trx.link():
-            linked_trx = self._find_transaction_by_id(trx.link())
-            if linked_trx:
-                linked_trx.set_link("")
+        partners = unlink_partners(trx, self._find_transaction_by_id)
 
         trx.clear_processed_fields()
         self.unsaved_changes = True
-        self._update_row()
+        self._update_row(*partners)
 
     def action_toggle_excluded(self) -> None:
         table = self.query_one(TransactionTable)
@@ -209,16 +501,13 @@ class BudgetApp(App):
             self.notify("Only 'Pot' transactions can be manually linked.", severity="warning")
             return
 
-        # If currently linked to a real transaction, unlink the partner
-        if trx.link() and trx.link() != Transaction.MANUAL_LINK_ID:
-            linked_trx = self._find_transaction_by_id(trx.link())
-            if linked_trx:
-                linked_trx.set_link("")
+        # If currently linked to real transactions, unlink the partners
+        partners = unlink_partners(trx, self._find_transaction_by_id)
 
         trx.set_link(Transaction.MANUAL_LINK_ID)
         self.unsaved_changes = True
         self.notify("Transaction marked as manually linked")
-        self._update_row()
+        self._update_row(*partners)
 
     def action_toggle_income(self) -> None:
         table = self.query_one(TransactionTable)
@@ -232,15 +521,106 @@ class BudgetApp(App):
         self.notify(f"Transaction marked as {'Income' if new_state else 'Expense'}")
         self._update_row()
 
+    def action_auto_link(self) -> None:
+        pairs = propose_links(self.transactions)
+        if not pairs:
+            self.notify("No pot transfers to link")
+            return
+
+        def apply_accepted(accepted: list | None) -> None:
+            if not accepted:
+                return
+            for spend, transfer in accepted:
+                link_pair(spend, transfer)
+            self.notify(f"Linked {len(accepted)} pot transfer(s)")
+            self._apply_filters()
+            if self.displayed_transactions:
+                self._update_sidebar(self._get_trx_for_cursor())
+
+        self.push_screen(AutoLinkScreen(pairs), apply_accepted)
+
+    def action_auto_categorise(self) -> None:
+        """Categorises every uncategorised row with the rules file."""
+        try:
+            rules = load_rules(self.rules_path)
+        except (ValueError, IOError) as e:
+            self.notify(f"Error loading rules: {e}", severity="error")
+            return
+
+        transactions = self.transactions
+        changed = sum(1 for i in self._filter_index.positions(["Uncategorized"])
+                      if rules.categorise(transactions[i]))
+        if not changed:
+            self.notify("No uncategorised transactions matched a rule")
+            return
+
+        self.notify(f"Categorised {changed} transaction(s)")
+        self._apply_filters()
+        if self.displayed_transactions:
+            self._update_sidebar(self._get_trx_for_cursor())
+
+    def _check_links(self) -> None:
+        """Warns about broken links in a newly loaded session."""
+        report = check_links(self.transactions)
+        if report:
+            self.notify(f"{report.summary()}. Press R to repair.",
+                        severity="warning", timeout=10)
+
+    def action_repair_links(self) -> None:
+        changed = repair_links(check_links(self.transactions))
+        if not changed:
+            self.notify("No broken links")
+            return
+
+        self.notify(f"Repaired the links of {len(changed)} transaction(s)")
+        self._apply_filters()
+        if self.displayed_transactions:
+            self._update_sidebar(self._get_trx_for_cursor())
+
+    def action_group_link(self) -> None:
+        table = self.query_one(TransactionTable)
+        if table.row_count == 0:
+            return
+
+        trx = self._get_trx_for_cursor()
+        if trx.link():
+            self.notify("Unlink this transaction first.", severity="warning")
+            return
+
+        if trx.type() == POT_TRANSFER_TYPE:
+            unlinked_pot = self._filter_index.positions(["Unlinked Pot"])
+            candidates = [t for t in (self.transactions[i] for i in unlinked_pot)
+                          if is_pot_spend(t)]
+        elif trx.category() == "Pot":
+            candidates = self._transfer_index.up_to(trx.amount_pence())
+        else:
+            self.notify("Only 'Pot' spends and pot transfers can be group linked.",
+                        severity="warning")
+            return
+
+        groupings = find_groupings(trx, candidates)
+        if not groupings:
+            self.notify("No group of transactions adds up to this amount")
+            return
+
+        def check_group(members: list[Transaction] | None) -> None:
+            if members:
+                link_group(trx, members)
+                self.notify(f"Linked a group of {len(members)} transactions")
+                self._update_row(*members)
+
+        self.push_screen(PotGroupSelectScreen(trx, groupings), check_group)
+
     def action_show_summary(self) -> None:
-        self.push_screen(SummaryScreen(self.transactions))
+        self.push_screen(SummaryScreen(self.transactions, self._id_index, self._totals()))
+
+    def action_compare_periods(self) -> None:
+        self.push_screen(PeriodComparisonScreen(self._period_cube))
 
     def action_save_transactions(self) -> None:
         def check_save(filename: str | None) -> None:
             if filename:
-                save_transactions(filename, self.transactions)
-                self.unsaved_changes = False
-                self.notify(f"Saved to {filename}")
+                self._save(filename)
 
         self.push_screen(SaveOrLoadScreen("save"), check_save)
 
@@ -264,8 +644,7 @@ class BudgetApp(App):
     def _show_load_screen(self) -> None:
         def check_load(filename: str | None) -> None:
             if filename:
-                self.load_transactions(filename)
-                self.notify(f"Loaded {filename}")
+                self.stream_transactions(filename)
 
         self.push_screen(SaveOrLoadScreen("load"), check_load)
 
@@ -288,22 +667,122 @@ class BudgetApp(App):
     def _save_and_clear(self, next_action=None):
         def after_save(filename: str | None) -> None:
             if filename:
-                save_transactions(filename, self.transactions)
-                self.unsaved_changes = False
-                self.notify(f"Saved to {filename}")
-                self._clear_internal()
-                if next_action:
-                    next_action()
+                def clear() -> None:
+                    self._clear_internal()
+                    if next_action:
+                        next_action()
+
+                self._save(filename, on_saved=clear)
             # If cancelled, filename==None, do nothing.
 
         self.push_screen(SaveOrLoadScreen("save"), after_save)
 
-    def _clear_internal(self):
-        self.transactions = []
+    def _save(self, filename: str, on_saved=None) -> None:
+        """
+        Saves the session to filename, then calls on_saved.
+
+        Journal appends and SQLite commits only cost O(changes) and happen
+        straight away. Full rewrites run on a worker thread with a progress bar,
+        so the UI stays usable while a large file is written.
+        """
+        if self._save_worker is not None:
+            self.notify("A save is already in progress", severity="warning")
+            return
+        if self._load_worker is not None:
+            self.notify("Wait for the file to finish loading", severity="warning")
+            return
+
+        generation = self._edit_generation
+        transactions = self.transactions
+        session = self._sqlite_session
+        journal = self._journal
+
+        if session is not None and _same_file(filename, session.path):
+            # Edits are already in the database as row updates; just make them durable
+            session.commit()
+            self._save_finished(filename, generation, on_saved)
+            return
+
+        if journal is not None and _same_file(filename, journal.csv_filename):
+            # Append only what changed rather than rewriting the whole CSV
+            journal.flush()
+            if not journal.needs_compaction():
+                self._save_finished(filename, generation, on_saved)
+                return
+
+            def job(progress):
+                journal.compact(transactions, progress=progress)
+        elif is_sqlite_path(filename):
+            def job(_progress):
+                save_sqlite(filename, transactions)
+        else:
+            # Also discards any journal of filename, left by an earlier
+            # session, which would otherwise be replayed over this save
+            def job(progress):
+                save_transactions(filename, transactions, progress=progress)
+
+        progress_bar = self.query_one("#save-progress", ProgressBar)
+        progress_bar.update(total=len(transactions) or None, progress=0)
+        progress_bar.display = True
+
+        def report_progress(rows: int) -> None:
+            self.call_from_thread(progress_bar.update, progress=rows)
+
+        self._save_context = (filename, generation, on_saved)
+        self._save_worker = self.run_worker(
+            lambda: job(report_progress),
+            name=f"save {filename}",
+            group="save",
+            thread=True,
+            exit_on_error=False,
+        )
+
+    def _save_finished(self, filename: str, generation: int, on_saved=None) -> None:
+        # Rows edited while the save was running may not be in the file
+        if self._edit_generation == generation:
+            self.unsaved_changes = False
+        self.notify(f"Saved to {filename}")
+        if on_saved:
+            on_saved()
+
+    def on_worker_state_changed(self, event: Worker.StateChanged) -> None:
+        if event.worker is self._load_worker:
+            if event.state in (WorkerState.SUCCESS, WorkerState.ERROR, WorkerState.CANCELLED):
+                self._load_finished(event)
+            return
+        if event.worker is not self._save_worker:
+            return
+        if event.state not in (WorkerState.SUCCESS, WorkerState.ERROR, WorkerState.CANCELLED):
+            return
+
+        filename, generation, on_saved = self._save_context
+        self._save_worker = None
+        self._save_context = None
+        self.query_one("#save-progress", ProgressBar).display = False
+
+        if event.state == WorkerState.SUCCESS:
+            self._save_finished(filename, generation, on_saved)
+        else:
+            self.notify(f"Error saving {filename}: {event.worker.error}", severity="error")
+
+    def _close_sqlite_session(self) -> None:
+        if self._sqlite_session is not None:
+            self._sqlite_session.close()
+            self._sqlite_session = None
+
+    def _reset_session(self) -> None:
+        self._cancel_load()
+        self._close_sqlite_session()
+        self._journal = None
+        self.transactions = TransactionStore()
         self.displayed_transactions = []
+        self._display_positions = _DisplayPositions()
         self.query_one(TransactionTable).clear()
         self.query_one(TransactionDetails).clear_transaction()
         self.unsaved_changes = False
+
+    def _clear_internal(self):
+        self._reset_session()
         self.notify("Data cleared")
 
     async def action_quit(self) -> None:
@@ -312,10 +791,7 @@ class BudgetApp(App):
                 if response == "yes":
                     def after_save(filename: str | None) -> None:
                         if filename:
-                            save_transactions(filename, self.transactions)
-                            self.unsaved_changes = False
-                            self.notify(f"Saved to {filename}")
-                            self.exit()
+                            self._save(filename, on_saved=self.exit)
 
                     self.push_screen(SaveOrLoadScreen("save"), after_save)
                 elif response == "no":
@@ -334,12 +810,34 @@ class BudgetApp(App):
         index = table.get_current_transaction_index()
         return self.displayed_transactions[index]
 
-    def _update_row(self) -> None:
+    def _update_row(self, *partners: Transaction) -> None:
         """
-        Reloads the table data to reflect changes and apply filters,
-        then updates the sidebar.
+        Refreshes the cursor row, and any linked partners the edit touched,
+        in place, then updates the sidebar.
+
+        Only the affected cells are rewritten; a row that no longer matches
+        the active filter is removed. Rows that start matching the filter are
+        picked up the next time filters are applied.
         """
-        self._apply_filters()
+        table = self.query_one(TransactionTable)
+        rows = {}
+        if self.displayed_transactions and table.row_count:
+            rows[table.get_current_transaction_index()] = self._get_trx_for_cursor()
+        for partner in partners:
+            index = self._displayed_index(partner)
+            if index is not None:
+                rows[index] = self.displayed_transactions[index]
+
+        filters = self._normalised_filters()
+        # Bottom up, so a removal doesn't shift rows still to be visited
+        for index in sorted(rows, reverse=True):
+            trx = rows[index]
+            if _matches_filters(trx, filters):
+                table.update_row_by_index(index, trx)
+            else:
+                del self.displayed_transactions[index]
+                self._display_positions.remove_at(index)
+                table.remove_row_at(index)
 
         if self.displayed_transactions:
             trx = self._get_trx_for_cursor()
@@ -347,14 +845,19 @@ class BudgetApp(App):
         else:
             self.query_one(TransactionDetails).clear_transaction()
 
+    def _displayed_index(self, trx: Transaction) -> int | None:
+        """Position of trx in displayed_transactions, or None if it isn't shown."""
+        position = self._row_positions.get(trx)
+        if position is None:
+            return None
+        return self._display_positions.index(position)
+
     def _update_sidebar(self, trx: Transaction) -> None:
         linked_trx = None
-        if trx.link() and trx.link() != Transaction.MANUAL_LINK_ID:
-            linked_trx = self._find_transaction_by_id(trx.link())
+        ids = linked_ids(trx)
+        if len(ids) == 1:
+            linked_trx = self._find_transaction_by_id(ids[0])
         self.query_one(TransactionDetails).update_transaction(trx, linked_trx)
 
     def _find_transaction_by_id(self, trx_id: str) -> Transaction | None:
-        for t in self.transactions:
-            if t.id() == trx_id:
-                return t
-        return None
+        return self._id_index.get(trx_id)
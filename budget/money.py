@@ -0,0 +1,40 @@
+"""
+Fixed-point money helpers.
+
+Amounts are held as integer pence so that totals are exact; adding up floats
+drifts by fractions of a penny over a year of transactions.
+"""
+from decimal import Decimal, InvalidOperation, ROUND_HALF_EVEN
+
+_PENNY = Decimal("0.01")
+
+
+def to_pence(value: str) -> int:
+    """
+    Parses a decimal amount such as "-3.50" into integer pence. Amounts with
+    more than two decimal places are rounded half-to-even.
+    """
+    # Fast path for the usual "[-]pounds.pp" form, avoiding Decimal
+    whole, dot, frac = value.partition(".")
+    digits = whole.lstrip("+-")
+    if (dot and len(frac) == 2 and frac.isdecimal() and digits.isdecimal()
+            and len(whole) - len(digits) <= 1):
+        pence = int(digits) * 100 + int(frac)
+        return -pence if whole.startswith("-") else pence
+
+    try:
+        amount = Decimal(value)
+        if not amount.is_finite():
+            raise ValueError(f"Invalid amount: {value}")
+        return int(amount.quantize(_PENNY, rounding=ROUND_HALF_EVEN) * 100)
+    except InvalidOperation as exc:
+        raise ValueError(f"Invalid amount: {value}") from exc
+
+
+def format_pence(pence: int) -> str:
+    """
+    Formats integer pence with two decimal places, e.g. -350 -> "-3.50".
+    """
+    sign = "-" if pence < 0 else ""
+    pounds, pennies = divmod(abs(pence), 100)
+    return f"{sign}{pounds}.{pennies:02d}"
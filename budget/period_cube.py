@@ -0,0 +1,147 @@
+"""
+Summary totals by period.
+
+PeriodCube keeps the totals of SummaryTotals broken down by month (or week):
+one column of per-period totals for each summary bucket, with prefix sums
+over the period axis built on demand. The total of a bucket over any range
+of periods is then a difference of two prefix sums, however much history is
+loaded, and dates are only decoded once, when a row is added.
+"""
+import datetime
+import itertools
+from typing import Iterable, Sequence
+
+from budget.summary_totals import summary_keys
+from budget.row_index import RowIndex, RowPositions
+from budget.transaction import Transaction
+
+MONTH = "month"
+WEEK = "week"
+
+
+def period_of(date: datetime.date, by: str = MONTH) -> int:
+    """The month (or week, starting on Monday) date falls in, as a number."""
+    if by == MONTH:
+        return date.year * 12 + date.month - 1
+    # date.min, ordinal 1, is a Monday
+    return (date.toordinal() - 1) // 7
+
+
+def period_start(period: int, by: str = MONTH) -> datetime.date:
+    """The first day of period, the inverse of period_of."""
+    if by == MONTH:
+        return datetime.date(period // 12, period % 12 + 1, 1)
+    return datetime.date.fromordinal(period * 7 + 1)
+
+
+def period_label(period: int, by: str = MONTH) -> str:
+    start = period_start(period, by)
+    if by == MONTH:
+        return start.strftime("%b %Y")
+    year, week, _ = start.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+class PeriodCube(RowIndex):
+    """
+    Per-period totals in pence of each (kind, name) summary bucket, for a
+    transaction sequence. Kept current with update(), like SummaryTotals.
+    """
+
+    def __init__(self, transactions: Sequence[Transaction] = (), by: str = MONTH,
+                 positions: RowPositions | None = None):
+        if by not in (MONTH, WEEK):
+            raise ValueError("by must be 'month' or 'week'")
+        super().__init__(positions)
+        self.by = by
+        # The period axis runs from _first for as many periods as each column
+        self._first: int | None = None
+        self._size = 0
+        self._cells: dict[tuple[str, str], list[int]] = {}
+        # Prefix sums of _cells, rebuilt for a column after it changes
+        self._prefix: dict[tuple[str, str], list[int]] = {}
+        self._row_periods: list[int | None] = []
+        self._amounts: list[int] = []
+        self.extend(transactions)
+
+    def _keys(self, trx: Transaction) -> tuple[tuple[str, str], ...]:
+        return summary_keys(trx)
+
+    def _append(self, position: int, trx: Transaction,
+                keys: tuple[tuple[str, str], ...]) -> None:
+        try:
+            period, amount = period_of(trx.date(), self.by), trx.amount_pence()
+        except ValueError:
+            period, amount = None, 0
+        self._row_periods.append(period)
+        self._amounts.append(amount)
+        self._add(position, keys, 1)
+
+    def _move(self, position: int, old: tuple[tuple[str, str], ...],
+              new: tuple[tuple[str, str], ...]) -> None:
+        self._add(position, old, -1)
+        self._add(position, new, 1)
+
+    def _add(self, position: int, keys: Iterable[tuple[str, str]], sign: int) -> None:
+        period = self._row_periods[position]
+        if period is None:
+            return
+        slot = self._slot(period)
+        amount = sign * self._amounts[position]
+        for key in keys:
+            cells = self._cells.get(key)
+            if cells is None:
+                cells = self._cells[key] = [0] * self._size
+            cells[slot] += amount
+            self._prefix.pop(key, None)
+
+    def _slot(self, period: int) -> int:
+        """Index of period on the axis, growing the axis to cover it."""
+        if self._first is None:
+            self._first, self._size = period, 1
+            return 0
+        if period < self._first:
+            grow = self._first - period
+            for cells in self._cells.values():
+                cells[:0] = [0] * grow
+            self._first = period
+            self._size += grow
+            self._prefix.clear()
+        elif period >= self._first + self._size:
+            grow = period - self._first - self._size + 1
+            for cells in self._cells.values():
+                cells.extend([0] * grow)
+            self._size += grow
+            self._prefix.clear()
+        return period - self._first
+
+    def bounds(self) -> tuple[int, int] | None:
+        """The first and last period with any rows, or None if empty."""
+        if self._first is None:
+            return None
+        return self._first, self._first + self._size - 1
+
+    def keys(self) -> list[tuple[str, str]]:
+        return list(self._cells)
+
+    def total(self, key: tuple[str, str], first: int, last: int) -> int:
+        """Total of bucket key over periods first to last inclusive."""
+        cells = self._cells.get(key)
+        if cells is None:
+            return 0
+        prefix = self._prefix.get(key)
+        if prefix is None:
+            prefix = self._prefix[key] = list(itertools.accumulate(cells, initial=0))
+        lo = min(max(first - self._first, 0), self._size)
+        hi = min(max(last - self._first + 1, 0), self._size)
+        return prefix[hi] - prefix[lo] if hi > lo else 0
+
+    def totals(self, first: int, last: int) -> dict[tuple[str, str], int]:
+        """Non-zero total of every bucket over periods first to last inclusive."""
+        totals = {key: self.total(key, first, last) for key in self._cells}
+        return {key: total for key, total in totals.items() if total}
+
+    def total_between(self, key: tuple[str, str], start: datetime.date,
+                      end: datetime.date) -> int:
+        """Total of bucket key over the whole periods spanning start to end."""
+        return self.total(key, period_of(start, self.by), period_of(end, self.by))
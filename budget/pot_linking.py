@@ -0,0 +1,378 @@
+"""
+Automatic pot-transfer linking.
+
+Monzo withdraws from a pot with a "Pot transfer" row right next to the spend
+it funds, e.g. a direct debit paid from a bills pot:
+
+    trx_id_1, 1/1/2025, 10:00, Pot transfer, ..., 12.34, ...
+    trx_id_2, 1/1/2025, 10:01, Direct debit, ..., -12.34, ...
+
+propose_links() pairs such spends with their transfers in bulk, so only the
+leftovers need linking by hand with PotTransferSelectScreen.
+
+One transfer can also fund several spends (or one spend be covered by several
+top-ups). find_groupings() searches for such sets and link_group() links
+them: each member links to the single transaction, which links to all of its
+members joined by Transaction.LINK_SEPARATOR.
+"""
+import bisect
+import datetime
+import itertools
+import time
+from collections import defaultdict
+from typing import Callable, Iterable, Iterator
+
+from budget.transaction import Transaction
+
+POT_TRANSFER_TYPE = "Pot transfer"
+
+# How far apart a spend and the transfer funding it may be
+DEFAULT_WINDOW_DAYS = 3
+
+# A transfer may fund spends from across a month
+DEFAULT_GROUP_WINDOW_DAYS = 31
+# Groups are searched as pairs of pairs, so can't be any larger
+MAX_GROUP_SIZE = 4
+# Bound on the pair-sum table of find_groupings
+MAX_PAIRS_PER_SUM = 256
+
+
+def is_pot_spend(trx: Transaction) -> bool:
+    """An unlinked spend categorised as paid from a pot."""
+    return (trx.category() == "Pot" and not trx.link() and not trx.excluded()
+            and trx.type() != POT_TRANSFER_TYPE)
+
+
+def is_unlinked_transfer(trx: Transaction) -> bool:
+    return trx.type() == POT_TRANSFER_TYPE and not trx.link() and not trx.excluded()
+
+
+def _sort_key(trx: Transaction):
+    """(absolute amount in pence, date), or None if either cell is invalid."""
+    try:
+        return abs(trx.amount_pence()), trx.date()
+    except ValueError:
+        return None
+
+
+def _sorted_by_amount(transactions: Iterable[Transaction]) -> list:
+    keyed = [(key, trx) for trx in transactions if (key := _sort_key(trx)) is not None]
+    keyed.sort(key=lambda pair: pair[0])
+    return keyed
+
+
+def propose_links(transactions: Iterable[Transaction],
+                  window_days: int = DEFAULT_WINDOW_DAYS) -> list[tuple[Transaction, Transaction]]:
+    """
+    Proposes one-to-one (spend, transfer) pairs between unlinked pot spends
+    and unlinked pot transfers of the same absolute amount, at most
+    window_days apart.
+
+    Both sides are sorted by (amount, date) and paired in a single merge pass:
+    each spend takes the earliest unused transfer it can, which pairs as many
+    spends as possible. The sort dominates, so this is O(n log n).
+    """
+    transactions = list(transactions)
+    spends = _sorted_by_amount(t for t in transactions if is_pot_spend(t))
+    transfers = _sorted_by_amount(t for t in transactions if is_unlinked_transfer(t))
+    window = datetime.timedelta(days=window_days)
+
+    pairs = []
+    j = 0
+    for (amount, date), spend in spends:
+        # Transfers below this amount, or too early for this spend, are too
+        # early for every later spend of the same amount as well
+        while j < len(transfers) and transfers[j][0] < (amount, date - window):
+            j += 1
+        if j == len(transfers):
+            break
+        (transfer_amount, transfer_date), transfer = transfers[j]
+        if transfer_amount == amount and transfer_date <= date + window:
+            pairs.append((spend, transfer))
+            j += 1
+    return pairs
+
+
+class PotTransferIndex:
+    """
+    The unlinked pot transfers of a session (as is_unlinked_transfer), sorted
+    by absolute amount, for PotTransferSelectScreen. The app calls update()
+    whenever a link or the excluded flag changes, so linked and excluded
+    transfers drop out without being filtered at query time.
+    """
+
+    def __init__(self, transactions: Iterable[Transaction] = ()):
+        # Parallel lists sorted by key; (absolute pence, ID) keys keep
+        # removal exact when several transfers share an amount
+        self._keys: list[tuple[int, str]] = []
+        self._transactions: list[Transaction] = []
+        self.extend(transactions)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @staticmethod
+    def _key(trx: Transaction) -> tuple[int, str] | None:
+        try:
+            return abs(trx.amount_pence()), trx.id()
+        except ValueError:
+            return None
+
+    def extend(self, transactions: Iterable[Transaction]) -> None:
+        added = [(key, trx) for trx in transactions
+                 if is_unlinked_transfer(trx) and (key := self._key(trx)) is not None]
+        if not added:
+            return
+        # Timsort merges the existing sorted run with the new rows cheaply
+        entries = list(zip(self._keys, self._transactions)) + added
+        entries.sort(key=lambda entry: entry[0])
+        self._keys = [key for key, _ in entries]
+        self._transactions = [trx for _, trx in entries]
+
+    def update(self, trx: Transaction) -> None:
+        """Adds or removes a transfer after its link or excluded flag changed."""
+        if trx.type() != POT_TRANSFER_TYPE:
+            return
+        key = self._key(trx)
+        if key is None:
+            return
+        i = bisect.bisect_left(self._keys, key)
+        present = i < len(self._keys) and self._keys[i] == key
+        wanted = is_unlinked_transfer(trx)
+        if present and not wanted:
+            del self._keys[i]
+            del self._transactions[i]
+        elif wanted and not present:
+            self._keys.insert(i, key)
+            self._transactions.insert(i, trx)
+
+    def up_to(self, amount_pence: int) -> list[Transaction]:
+        """Unlinked transfers of at most abs(amount_pence)."""
+        return self._transactions[:bisect.bisect_left(self._keys, (abs(amount_pence) + 1,))]
+
+    def nearest(self, amount_pence: int, exclude_id: str | None = None) -> Iterator[Transaction]:
+        """
+        Yields unlinked transfers in order of closeness to abs(amount_pence),
+        expanding outwards from a bisect, so taking the first k costs
+        O(log n + k).
+        """
+        target = abs(amount_pence)
+        keys, transactions = self._keys, self._transactions
+        hi = bisect.bisect_left(keys, (target,))
+        lo = hi - 1
+        while lo >= 0 or hi < len(keys):
+            take_lo = hi == len(keys) or (
+                lo >= 0 and target - keys[lo][0] <= keys[hi][0] - target)
+            if take_lo:
+                index, lo = lo, lo - 1
+            else:
+                index, hi = hi, hi + 1
+            if keys[index][1] != exclude_id:
+                yield transactions[index]
+
+
+def link_pair(spend: Transaction, transfer: Transaction) -> None:
+    """
+    Links spend and transfer to each other, filing the transfer under the
+    spend's pot, as linking by hand does.
+    """
+    spend.set_link(transfer.id())
+    transfer.set_category("Pot")
+    transfer.set_pot_category(spend.pot_category())
+    transfer.set_link(spend.id())
+
+
+def linked_ids(trx: Transaction) -> list[str]:
+    """The IDs trx is linked to; empty if unlinked or manually linked."""
+    link = trx.link()
+    if not link or link == Transaction.MANUAL_LINK_ID:
+        return []
+    return link.split(Transaction.LINK_SEPARATOR)
+
+
+def unlink_partners(trx: Transaction,
+                    find: Callable[[str], Transaction | None]) -> list[Transaction]:
+    """
+    Removes trx from the link of every transaction it is linked to, looking
+    them up with find, and returns them. trx's own link is left to the caller.
+    """
+    partners = []
+    for partner_id in linked_ids(trx):
+        partner = find(partner_id)
+        if partner is None:
+            continue
+        remaining = [i for i in linked_ids(partner) if i != trx.id()]
+        partner.set_link(Transaction.LINK_SEPARATOR.join(remaining))
+        partners.append(partner)
+    return partners
+
+
+def link_group(target: Transaction, members: list[Transaction]) -> None:
+    """
+    Links every member to target and target to all members. Transfers on
+    either side are filed under the pot of the spend(s).
+    """
+    for member in members:
+        member.set_link(target.id())
+    target.set_link(Transaction.LINK_SEPARATOR.join(m.id() for m in members))
+
+    if target.type() == POT_TRANSFER_TYPE:
+        spends, transfers = members, [target]
+    else:
+        spends, transfers = [target], members
+    pot_category = spends[0].pot_category()
+    for transfer in transfers:
+        transfer.set_category("Pot")
+        transfer.set_pot_category(pot_category)
+
+
+def _index_pairs(lows: list[int], highs: list[int], same: bool) -> Iterator[tuple[int, int]]:
+    """
+    Pairs of one index from lows and one from highs (two distinct ones from
+    lows if same), disjoint pairs first so that a truncated list of them
+    can still be combined into groups of four.
+    """
+    if same:
+        yield from zip(lows[0::2], lows[1::2])
+        for a, b in itertools.combinations(range(len(lows)), 2):
+            if a % 2 or b != a + 1:
+                yield lows[a], lows[b]
+    else:
+        yield from zip(lows, highs)
+        for a, low in enumerate(lows):
+            for b, high in enumerate(highs):
+                if a != b:
+                    yield low, high
+
+
+def _group_candidates(target: Transaction, candidates: Iterable[Transaction],
+                      window_days: int) -> list[tuple[int, int, Transaction]]:
+    """
+    The candidates that could be part of a group funding target: smaller in
+    absolute amount than target and dated within window_days of it. Returned
+    as (pence, days from target, transaction), ascending by amount; empty if
+    target's own amount or date is invalid.
+    """
+    key = _sort_key(target)
+    if key is None:
+        return []
+    goal, date = key
+    window = datetime.timedelta(days=window_days)
+
+    items = []
+    for trx in candidates:
+        if trx is target or trx.id() == target.id():
+            continue
+        candidate_key = _sort_key(trx)
+        if candidate_key is None:
+            continue
+        pence, candidate_date = candidate_key
+        if 0 < pence < goal and abs(candidate_date - date) <= window:
+            items.append((pence, abs((candidate_date - date).days), trx))
+    items.sort(key=lambda item: item[0])
+    return items
+
+
+def _pair_sums(values: list[int], goal: int, deadline: float) -> dict[int, list[tuple[int, int]]]:
+    """
+    Tabulates sum -> index pairs (into the ascending values) adding up to it,
+    for sums up to goal. Pairs are generated per pair of distinct amounts, so
+    a run of equal amounts costs one step rather than one per pair, and at
+    most MAX_PAIRS_PER_SUM are kept per sum. Stops early at deadline.
+    """
+    by_value: dict[int, list[int]] = defaultdict(list)
+    for i, value in enumerate(values):
+        by_value[value].append(i)
+    distinct = sorted(by_value)
+
+    pairs: dict[int, list[tuple[int, int]]] = defaultdict(list)
+    for p, low in enumerate(distinct):
+        for high in distinct[p:]:
+            total = low + high
+            if total > goal:
+                break
+            same_sum = pairs[total]
+            room = MAX_PAIRS_PER_SUM - len(same_sum)
+            if room > 0:
+                same_sum.extend(itertools.islice(
+                    _index_pairs(by_value[low], by_value[high], low == high), room))
+        if time.perf_counter() > deadline:
+            break
+    return pairs
+
+
+class _GroupSearch:
+    """
+    Collects groups of distinct candidate indices adding up to a goal, until
+    limit groups are found or the deadline passes.
+    """
+
+    def __init__(self, limit: int, deadline: float):
+        self.limit = limit
+        self.deadline = deadline
+        self.found: list[tuple[int, ...]] = []
+        self._seen: set[tuple[int, ...]] = set()
+
+    def collect(self, groups: Iterable[tuple[int, ...]]) -> bool:
+        """
+        Adds each new group of distinct indices, and returns whether there is
+        room and time for more.
+        """
+        for group in groups:
+            if len(self.found) >= self.limit or time.perf_counter() > self.deadline:
+                return False
+            group = tuple(sorted(group))
+            if len(set(group)) == len(group) and group not in self._seen:
+                self._seen.add(group)
+                self.found.append(group)
+        return len(self.found) < self.limit and time.perf_counter() <= self.deadline
+
+    def search(self, values: list[int], pairs: dict[int, list[tuple[int, int]]],
+               goal: int) -> None:
+        """
+        Searches groups of two, then three, then four. Every smaller group
+        outranks a larger one, so each size is only searched while there is
+        room for more: a group of three is one pair lookup per candidate, a
+        group of four one per pair.
+        """
+        if not self.collect(pairs.get(goal, ())):
+            return
+        for i, value in enumerate(values):
+            if not self.collect((i, j, k) for j, k in pairs.get(goal - value, ())):
+                return
+        for total, lows in list(pairs.items()):
+            highs = pairs.get(goal - total)
+            if highs:
+                if not self.collect((i, j, k, l) for i, j in lows for k, l in highs):
+                    return
+            elif time.perf_counter() > self.deadline:
+                return
+
+
+def find_groupings(target: Transaction, candidates: Iterable[Transaction],
+                   window_days: int = DEFAULT_GROUP_WINDOW_DAYS, time_budget: float = 0.1,
+                   limit: int = 20) -> list[list[Transaction]]:
+    """
+    Finds sets of two to MAX_GROUP_SIZE candidates, each dated within
+    window_days of target, whose absolute amounts add up exactly to target's.
+    Groups are ranked smallest first, then by how close their dates are to
+    target's, and at most limit are returned.
+
+    Pair sums are tabulated first (meet in the middle) instead of enumerating
+    every combination. The table may use half of time_budget; the search
+    stops once limit groups are found or the whole budget has passed, and
+    returns what it has.
+    """
+    start = time.perf_counter()
+    items = _group_candidates(target, candidates, window_days)
+    if not items:
+        return []
+    goal = _sort_key(target)[0]
+    values = [pence for pence, _, _ in items]
+
+    pairs = _pair_sums(values, goal, start + time_budget / 2)
+    search = _GroupSearch(limit, start + time_budget)
+    search.search(values, pairs, goal)
+
+    found = sorted(search.found, key=lambda group: (len(group), sum(items[i][1] for i in group)))
+    return [[items[i][2] for i in group] for group in found[:limit]]
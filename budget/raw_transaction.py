@@ -1,8 +1,31 @@
 import datetime
+import functools
 from decimal import InvalidOperation
 
 from budget import common
-
+from budget.money import to_pence
+
+_ID = common.RAW_FIELD_INDEX["Transaction ID"]
+_DATE = common.RAW_FIELD_INDEX["Date"]
+_TIME = common.RAW_FIELD_INDEX["Time"]
+_TYPE = common.RAW_FIELD_INDEX["Type"]
+_NAME = common.RAW_FIELD_INDEX["Name"]
+_EMOJI = common.RAW_FIELD_INDEX["Emoji"]
+_CATEGORY = common.RAW_FIELD_INDEX["Category"]
+_AMOUNT = common.RAW_FIELD_INDEX["Amount"]
+_CURRENCY = common.RAW_FIELD_INDEX["Currency"]
+_LOCAL_AMOUNT = common.RAW_FIELD_INDEX["Local amount"]
+_LOCAL_CURRENCY = common.RAW_FIELD_INDEX["Local currency"]
+_NOTES = common.RAW_FIELD_INDEX["Notes and #tags"]
+_ADDRESS = common.RAW_FIELD_INDEX["Address"]
+_RECEIPT = common.RAW_FIELD_INDEX["Receipt"]
+_DESCRIPTION = common.RAW_FIELD_INDEX["Description"]
+_CATEGORY_SPLIT = common.RAW_FIELD_INDEX["Category split"]
+_MONEY_OUT = common.RAW_FIELD_INDEX["Money Out"]
+_MONEY_IN = common.RAW_FIELD_INDEX["Money In"]
+
+# Exports repeat a few hundred distinct dates across thousands of rows
+@functools.lru_cache(maxsize=8192)
 def parse_date(date_str: str) -> datetime.date:
     try:
         return datetime.datetime.strptime(date_str, '%d/%m/%Y').date()
@@ -12,15 +35,87 @@ def parse_date(date_str: str) -> datetime.date:
         except ValueError as exc:
             raise ValueError(f"Unable to parse date: {date_str}") from exc
 
+def _parse_money(value: str, description: str) -> float:
+    """
+    Parses one of the optional money columns, which Monzo leaves blank when
+    they don't apply (e.g. "Money In" on a card payment).
+    """
+    if not value:
+        return 0.0
+    try:
+        return float(value)
+    except (ValueError, InvalidOperation) as exc:
+        raise ValueError(f"Invalid {description}: {value}") from exc
+
 class RawTransaction:
+    """
+    An immutable row from a Monzo export.
+
+    Values are kept as a tuple laid out by common.RAW_FIELD_INDEX rather than a
+    dict per row. The original (unstripped) values are kept for to_dict() and
+    equality; the stripped values share the same tuple unless a cell actually
+    had surrounding whitespace.
+    """
+    __slots__ = ("_raw", "_values", "_extra", "_date", "_amount_pence",
+                 "_local_amount", "_money_out", "_money_in")
+
     def __init__(self, raw_data: dict):
-        self._raw = raw_data
-        self._date = None
-        self._amount = None
         for field in common.EXPECTED_RAW_FIELDS:
             if field not in raw_data:
                 raise ValueError(f"Missing expected field: {field}")
 
+        self._raw = tuple(raw_data[field] for field in common.EXPECTED_RAW_FIELDS)
+        stripped = tuple(value.strip() for value in self._raw)
+        self._values = self._raw if stripped == self._raw else stripped
+
+        # Any columns beyond the expected ones are rare, so only pay for them when present
+        self._extra = None
+        if len(raw_data) != len(self._raw):
+            self._extra = {k: v for k, v in raw_data.items()
+                           if k not in common.RAW_FIELD_INDEX}
+
+        self._date = None
+        self._amount_pence = None
+        self._local_amount = None
+        self._money_out = None
+        self._money_in = None
+
+    @classmethod
+    def restore(cls, raw: tuple, values: tuple, date=None,
+                amount_pence=None) -> "RawTransaction":
+        """
+        Rebuilds a row from already validated and stripped values, e.g. from a cache,
+        skipping the checks done in __init__.
+        """
+        trx = cls.__new__(cls)
+        trx._raw = raw
+        trx._values = values
+        trx._extra = None
+        trx._date = date
+        trx._amount_pence = amount_pence
+        trx._local_amount = None
+        trx._money_out = None
+        trx._money_in = None
+        return trx
+
+    def decode(self) -> list[tuple[str, str, str]]:
+        """
+        Converts every date and numeric field now, so later accessor calls
+        never parse. Returns (field, raw value, error) for each bad cell rather
+        than raising on the first.
+        """
+        errors = []
+        for field, accessor in (("Date", self.date),
+                                ("Amount", self.amount),
+                                ("Local amount", self.local_amount),
+                                ("Money Out", self.money_out),
+                                ("Money In", self.money_in)):
+            try:
+                accessor()
+            except ValueError as exc:
+                errors.append((field, self._raw[common.RAW_FIELD_INDEX[field]], str(exc)))
+        return errors
+
     def __str__(self) -> str:
         return (f"name={self.name():20s}, amount={self.amount():11,.2f}, "
                 f"date={self.date():%d-%m-%Y}, id={self.id()}")
@@ -28,77 +123,80 @@ class RawTransaction:
     def __eq__(self, other) -> bool:
         if not isinstance(other, RawTransaction):
             return NotImplemented
-        return self._raw == other._raw
+        return self._raw == other._raw and self._extra == other._extra
 
     def to_dict(self) -> dict:
-        return self._raw.copy()
+        data = dict(zip(common.EXPECTED_RAW_FIELDS, self._raw))
+        if self._extra:
+            data.update(self._extra)
+        return data
 
     def id(self) -> str:
-        return self._raw["Transaction ID"].strip()
+        return self._values[_ID]
 
     def date(self) -> datetime.date:
         if self._date is None:
-            self._date = parse_date(self._raw["Date"].strip())
+            self._date = parse_date(self._values[_DATE])
         return self._date
 
     def time(self):
-        return self._raw["Time"].strip()
+        return self._values[_TIME]
 
     def type(self):
-        return self._raw["Type"].strip()
+        return self._values[_TYPE]
 
     def name(self) -> str:
-        return self._raw["Name"].strip()
+        return self._values[_NAME]
 
     def emoji(self) -> str:
-        return self._raw["Emoji"].strip()
+        return self._values[_EMOJI]
 
     def category(self) -> str:
-        return self._raw["Category"].strip()
+        return self._values[_CATEGORY]
 
-    def amount(self) -> float:
-        if self._amount is None:
+    def amount_pence(self) -> int:
+        if self._amount_pence is None:
             try:
-                self._amount = float(self._raw["Amount"].strip())
-            except (ValueError, InvalidOperation) as exc:
-                raise ValueError(f"Invalid amount: {self._raw['Amount']}") from exc
-        return self._amount
+                self._amount_pence = to_pence(self._values[_AMOUNT])
+            except ValueError as exc:
+                raise ValueError(f"Invalid amount: {self._raw[_AMOUNT]}") from exc
+        return self._amount_pence
+
+    def amount(self) -> float:
+        return self.amount_pence() / 100
 
     def currency(self) -> str:
-        return self._raw["Currency"].strip()
+        return self._values[_CURRENCY]
 
     def local_amount(self) -> float:
-        try:
-            return float(self._raw["Local Amount"].strip())
-        except (ValueError, InvalidOperation) as exc:
-            raise ValueError(f"Invalid local amount: {self._raw['Local Amount']}") from exc
+        if self._local_amount is None:
+            self._local_amount = _parse_money(self._values[_LOCAL_AMOUNT], "local amount")
+        return self._local_amount
 
     def local_currency(self) -> str:
-        return self._raw["Local Currency"].strip()
+        return self._values[_LOCAL_CURRENCY]
 
     def notes(self) -> str:
-        return self._raw["Notes and #tags"].strip()
+        return self._values[_NOTES]
 
     def address(self) -> str:
-        return self._raw["Address"].strip()
+        return self._values[_ADDRESS]
 
     def receipt(self) -> str:
-        return self._raw["Receipt"].strip()
+        return self._values[_RECEIPT]
 
     def description(self) -> str:
-        return self._raw["Description"].strip()
+        return self._values[_DESCRIPTION]
 
     def category_split(self) -> str:
-        return self._raw["Category split"].strip()
+        return self._values[_CATEGORY_SPLIT]
 
     def money_out(self) -> float:
-        try:
-            return float(self._raw["Money out"].strip())
-        except (ValueError, InvalidOperation) as exc:
-            raise ValueError(f"Invalid money out: {self._raw['Money out']}") from exc
+        if self._money_out is None:
+            self._money_out = _parse_money(self._values[_MONEY_OUT], "money out")
+        return self._money_out
 
     def money_in(self) -> float:
-        try:
-            return float(self._raw["Money in"].strip())
-        except (ValueError, InvalidOperation) as exc:
-            raise ValueError(f"Invalid money in: {self._raw['Money in']}") from exc
+        if self._money_in is None:
+            self._money_in = _parse_money(self._values[_MONEY_IN], "money in")
+        return self._money_in
@@ -0,0 +1,60 @@
+"""
+Headless summary reports.
+
+Produces the income, category and pot figures SummaryScreen shows, from a
+data file streamed a row at a time, for scheduled jobs that have no use for
+the TUI. Nothing here imports Textual.
+"""
+import csv
+import json
+from typing import TextIO
+
+from budget.import_data import iter_transactions
+from budget.money import format_pence
+from budget.rules import RuleSet, apply_rules
+from budget.summary_totals import CATEGORY, INCOME, POT, summarise
+
+REPORT_FORMATS = ("json", "csv")
+
+
+def build_report(csv_filename: str, rules: RuleSet | None = None) -> dict:
+    """
+    Summarises a raw or processed data file, with journal edits applied, in
+    constant memory. Amounts are formatted as in the data files, e.g. "-3.50".
+    If rules are given, uncategorised rows are categorised by them first.
+    Raises ValueError (or DataValidationError) for a file that can't be read.
+    """
+    transactions = iter_transactions(csv_filename)
+    if rules is not None:
+        transactions = apply_rules(rules, transactions)
+    totals = summarise(transactions)
+
+    def named(kind: str) -> dict[str, str]:
+        return {name: format_pence(totals[(k, name)])
+                for k, name in sorted(totals) if k == kind}
+
+    return {
+        "file": csv_filename,
+        "income": format_pence(totals.get((INCOME, ""), 0)),
+        "categories": named(CATEGORY),
+        "pots": named(POT),
+    }
+
+
+def write_report(report: dict, out: TextIO, fmt: str = "json") -> None:
+    """
+    Writes report as JSON, or as CSV with one (section, name, amount) row per
+    figure.
+    """
+    if fmt == "json":
+        json.dump(report, out, indent=2)
+        out.write("\n")
+    elif fmt == "csv":
+        writer = csv.writer(out)
+        writer.writerow(["section", "name", "amount"])
+        writer.writerow(["income", "", report["income"]])
+        for section in ("categories", "pots"):
+            for name, amount in report[section].items():
+                writer.writerow([section, name, amount])
+    else:
+        raise ValueError(f"Unknown report format: {fmt}")
@@ -0,0 +1,87 @@
+"""
+Indexes kept over a transaction sequence as its rows are edited.
+
+FilterIndex, SummaryTotals and PeriodCube each file every row under keys
+worked out from its processed fields, and are told about an edit with the
+edited transaction alone. RowIndex holds what they have in common: the keys
+of each row, and finding a transaction's position. A TransactionRow carries
+its position; a plain Transaction is looked up by object identity in a
+RowPositions, which the app builds once per session and shares between the
+indexes, so there is a single map however many indexes there are.
+"""
+from typing import Hashable, Iterable
+
+from budget.transaction import Transaction
+from budget.transaction_store import TransactionRow
+
+
+class RowPositions:
+    """
+    Position of each plain Transaction of a sequence, by object identity.
+    TransactionRow views are created afresh on every access, so they carry
+    their position instead and aren't stored.
+    """
+
+    def __init__(self):
+        self._positions: dict[int, int] = {}
+
+    def add(self, trx: Transaction, position: int) -> None:
+        """
+        Records trx at position. Every index sharing this map adds each row
+        as it is appended, which is harmless as they agree on its position.
+        """
+        if not isinstance(trx, TransactionRow):
+            self._positions[id(trx)] = position
+
+    def get(self, trx: Transaction) -> int | None:
+        """Position of trx, or None if it isn't in the sequence."""
+        if isinstance(trx, TransactionRow):
+            return trx.position
+        return self._positions.get(id(trx))
+
+
+class RowIndex:
+    """
+    Base for an index filing each row of a sequence under the keys _keys()
+    gives it. Subclasses file a new row in _append() and move an edited one
+    between keys in _move().
+    """
+
+    def __init__(self, positions: RowPositions | None = None):
+        self._row_keys: list[Hashable] = []
+        self._positions = positions if positions is not None else RowPositions()
+
+    def __len__(self) -> int:
+        return len(self._row_keys)
+
+    def extend(self, transactions: Iterable[Transaction]) -> None:
+        """Indexes rows appended to the end of the sequence."""
+        for trx in transactions:
+            position = len(self._row_keys)
+            self._positions.add(trx, position)
+            keys = self._keys(trx)
+            self._row_keys.append(keys)
+            self._append(position, trx, keys)
+
+    def update(self, trx: Transaction) -> None:
+        """Re-files trx after one of its processed fields changed."""
+        position = self._positions.get(trx)
+        if position is None:
+            return
+        self._edited(position, trx)
+        old, new = self._row_keys[position], self._keys(trx)
+        if old != new:
+            self._row_keys[position] = new
+            self._move(position, old, new)
+
+    def _keys(self, trx: Transaction) -> Hashable:
+        raise NotImplementedError
+
+    def _append(self, position: int, trx: Transaction, keys) -> None:
+        raise NotImplementedError
+
+    def _move(self, position: int, old, new) -> None:
+        raise NotImplementedError
+
+    def _edited(self, position: int, trx: Transaction) -> None:
+        """Called for every edit, whether or not the row's keys changed."""
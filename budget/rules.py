@@ -0,0 +1,215 @@
+"""
+Rule-based categorisation.
+
+A rules file is a JSON list of rules, tried in file order; the first rule
+whose conditions all hold categorises the transaction:
+
+    [
+        {"name": "tesco mobile", "category": "Bills"},
+        {"name": "tesco", "max_amount": "0.00", "category": "Groceries"},
+        {"description": "tfl", "monzo_category": "transport", "category": "Transport"},
+        {"notes": "#holiday", "category": "Pot", "pot_category": "Holidays"}
+    ]
+
+Text conditions (name, description, notes) match case-insensitively
+anywhere in the field; monzo_category must equal the Monzo category of the
+row; min_amount and max_amount bound its signed amount, inclusively. By
+default the rules are read from rules.json in the budget_data folder.
+
+The patterns of each text field are compiled into one regex, laid out as a
+trie, so a single scan of a field finds every rule it can satisfy, however
+many rules there are.
+"""
+import json
+import re
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from budget.money import to_pence
+from budget.transaction import Transaction
+
+# Text fields a rule can match, and how to read each from a transaction
+TEXT_FIELDS = {
+    "name": lambda trx: trx.name(),
+    "description": lambda trx: trx.raw.description(),
+    "notes": lambda trx: trx.notes(),
+}
+_KNOWN_KEYS = set(TEXT_FIELDS) | {
+    "monzo_category", "min_amount", "max_amount", "category", "pot_category"}
+
+DEFAULT_RULES_PATH = Path.home() / "budget_data" / "rules.json"
+
+
+class Rule:
+    def __init__(self, spec: dict):
+        unknown = set(spec) - _KNOWN_KEYS
+        if unknown:
+            raise ValueError(f"unknown key(s) {', '.join(sorted(unknown))}")
+        if not spec.get("category"):
+            raise ValueError("no category")
+        if spec.get("pot_category") and spec["category"] != "Pot":
+            raise ValueError("pot_category is only valid with category 'Pot'")
+        for key in _KNOWN_KEYS - {"min_amount", "max_amount"}:
+            if not isinstance(spec.get(key, ""), str):
+                raise ValueError(f"{key} must be a string")
+
+        self.category: str = spec["category"]
+        self.pot_category: str = spec.get("pot_category", "")
+        # Text field -> lowercased pattern
+        self.patterns: dict[str, str] = {
+            field: spec[field].lower() for field in TEXT_FIELDS if spec.get(field)}
+        self.monzo_category: str = spec.get("monzo_category", "").lower()
+        self.min_amount = to_pence(str(spec["min_amount"])) if "min_amount" in spec else None
+        self.max_amount = to_pence(str(spec["max_amount"])) if "max_amount" in spec else None
+
+    def other_conditions_hold(self, trx: Transaction) -> bool:
+        """Whether trx meets the conditions other than the text patterns."""
+        if self.monzo_category and trx.raw.category().lower() != self.monzo_category:
+            return False
+        if self.min_amount is None and self.max_amount is None:
+            return True
+        try:
+            amount = trx.amount_pence()
+        except ValueError:
+            return False
+        return ((self.min_amount is None or amount >= self.min_amount)
+                and (self.max_amount is None or amount <= self.max_amount))
+
+    def apply(self, trx: Transaction) -> None:
+        trx.set_category(self.category)
+        if self.pot_category:
+            trx.set_pot_category(self.pot_category)
+
+
+def _trie_regex(patterns: Iterable[str]) -> str:
+    """
+    A regex matching any of patterns, laid out as a trie so that matching
+    follows one branch per character instead of trying every pattern in turn.
+    Where one pattern is a prefix of another the longer is tried first.
+    """
+    trie: dict = {}
+    for pattern in patterns:
+        node = trie
+        for char in pattern:
+            node = node.setdefault(char, {})
+        node[""] = True
+
+    def build(node: dict) -> str:
+        branches = [re.escape(char) + build(child)
+                    for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            # The pattern ending here, unless a longer one matches
+            return f"(?:{body})?"
+        return body
+
+    return build(trie)
+
+
+class _FieldMatcher:
+    """
+    Finds which of a text field's patterns occur in a value, with one regex
+    of them all.
+
+    The regex is a lookahead, so it is tried at every position of the value
+    and reports the longest pattern starting there. Any other pattern starting
+    at that position is a prefix of the reported one, and is looked up.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self._patterns = set(patterns)
+        self._regex = re.compile(f"(?=({_trie_regex(self._patterns)}))")
+
+    def matches(self, value: str) -> set[str]:
+        found = set()
+        for match in self._regex.finditer(value.lower()):
+            longest = match.group(1)
+            if longest and longest not in found:
+                found.update(longest[:end] for end in range(1, len(longest) + 1)
+                             if longest[:end] in self._patterns)
+        return found
+
+
+class RuleSet:
+    def __init__(self, rules: list[Rule]):
+        self.rules = rules
+        # Text field -> pattern -> indices of the rules requiring it
+        self._by_pattern: dict[str, dict[str, list[int]]] = {}
+        # Rules with no text condition, checked against every row
+        self._unconditional: list[int] = []
+        for index, rule in enumerate(rules):
+            for field, pattern in rule.patterns.items():
+                self._by_pattern.setdefault(field, {}).setdefault(pattern, []).append(index)
+            if not rule.patterns:
+                self._unconditional.append(index)
+        self._matchers = {field: _FieldMatcher(patterns)
+                          for field, patterns in self._by_pattern.items()}
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def match(self, trx: Transaction) -> Rule | None:
+        """The first rule, in file order, whose conditions trx meets."""
+        # Rule index -> how many of its text patterns were found
+        hits: dict[int, int] = {}
+        for field, matcher in self._matchers.items():
+            by_pattern = self._by_pattern[field]
+            for pattern in matcher.matches(TEXT_FIELDS[field](trx)):
+                for index in by_pattern[pattern]:
+                    hits[index] = hits.get(index, 0) + 1
+
+        candidates = [i for i, count in hits.items() if count == len(self.rules[i].patterns)]
+        candidates.extend(self._unconditional)
+        for index in sorted(candidates):
+            rule = self.rules[index]
+            if rule.other_conditions_hold(trx):
+                return rule
+        return None
+
+    def categorise(self, trx: Transaction) -> Rule | None:
+        """
+        Applies the first matching rule to trx if it is uncategorised and not
+        excluded, returning the rule applied.
+        """
+        if trx.category() or trx.excluded():
+            return None
+        rule = self.match(trx)
+        if rule is not None:
+            rule.apply(trx)
+        return rule
+
+
+def apply_rules(rules: RuleSet, transactions: Iterable[Transaction]) -> Iterator[Transaction]:
+    """
+    Passes every transaction through, categorising the uncategorised ones on
+    the way, so a file can be categorised as it is streamed.
+    """
+    for trx in transactions:
+        rules.categorise(trx)
+        yield trx
+
+
+def load_rules(path=DEFAULT_RULES_PATH) -> RuleSet:
+    """
+    Reads and compiles a rules file. Raises ValueError, naming the rule, if
+    the file isn't a list of valid rules.
+    """
+    with open(path, encoding="utf-8") as fh:
+        try:
+            specs = json.load(fh)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid rules file {path}: {e}") from e
+    if not isinstance(specs, list):
+        raise ValueError(f"Invalid rules file {path}: expected a list of rules")
+
+    rules = []
+    for number, spec in enumerate(specs, 1):
+        try:
+            if not isinstance(spec, dict):
+                raise ValueError("not an object")
+            rules.append(Rule(spec))
+        except ValueError as e:
+            raise ValueError(f"Invalid rule {number} in {path}: {e}") from e
+    return RuleSet(rules)
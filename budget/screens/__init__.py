@@ -7,4 +7,7 @@ from budget.screens.save import (
 from budget.screens.filter import FilterScreen, BudgetSelectionList
 from budget.screens.pot_category import PotCategoryScreen
 from budget.screens.pot_transfer import PotTransferSelectScreen
+from budget.screens.pot_group import PotGroupSelectScreen
 from budget.screens.summary import SummaryScreen
+from budget.screens.compare import PeriodComparisonScreen
+from budget.screens.auto_link import AutoLinkScreen
@@ -0,0 +1,55 @@
+from textual.app import ComposeResult
+from textual.widgets import Label, Button
+from textual.containers import Vertical, Horizontal
+from textual.screen import ModalScreen
+from textual.binding import Binding
+from budget.money import format_pence
+from budget.screens.common import BudgetSelectionList
+from budget.transaction import Transaction
+
+Pair = tuple[Transaction, Transaction]
+
+# pylint: disable=too-many-ancestors
+class AutoLinkScreen(ModalScreen[list[Pair] | None]):
+    """
+    Reviews the (spend, transfer) pairs proposed by pot_linking.propose_links.
+    Every pair starts ticked; the ticked pairs are returned on "Link".
+    """
+
+    def __init__(self, pairs: list[Pair]):
+        super().__init__()
+        self.pairs = pairs
+
+    @staticmethod
+    def _describe(pair: Pair) -> str:
+        spend, transfer = pair
+        return (f"{spend.date()}  {spend.name()}  {format_pence(spend.amount_pence())}"
+                f"  <-  {transfer.date()}  {transfer.name()}")
+
+    def compose(self) -> ComposeResult:
+        with Vertical(id="dialog"):
+            yield Label(f"Link {len(self.pairs)} pot transfer(s)?", id="question")
+            yield BudgetSelectionList(
+                *((self._describe(pair), index, True) for index, pair in enumerate(self.pairs)),
+                id="auto_link_options",
+            )
+            with Horizontal(id="buttons"):
+                yield Button("Link", variant="primary", id="link")
+                yield Button("Cancel", variant="error", id="cancel")
+
+    def on_mount(self) -> None:
+        self.query_one(BudgetSelectionList).focus()
+
+    def on_button_pressed(self, event: Button.Pressed) -> None:
+        if event.button.id == "link":
+            selected = self.query_one(BudgetSelectionList).selected
+            self.dismiss([self.pairs[index] for index in sorted(selected)])
+        elif event.button.id == "cancel":
+            self.dismiss(None)
+
+    BINDINGS = [
+        Binding("escape", "cancel", "Cancel"),
+    ]
+
+    def action_cancel(self) -> None:
+        self.dismiss(None)
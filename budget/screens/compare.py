@@ -0,0 +1,99 @@
+from textual.app import ComposeResult
+from textual.widgets import Label, DataTable, Button
+from textual.containers import Vertical, Horizontal
+from textual.screen import ModalScreen
+from textual.binding import Binding
+from budget.money import format_pence
+from budget.period_cube import MONTH, PeriodCube, period_label
+from budget.summary_totals import INCOME, CATEGORY
+
+class PeriodComparisonScreen(ModalScreen):
+    """
+    Compares one period's summary totals with the period before and the same
+    period a year earlier, starting from the latest period loaded.
+    """
+
+    def __init__(self, cube: PeriodCube):
+        super().__init__()
+        self.cube = cube
+        bounds = cube.bounds()
+        self.period = bounds[1] if bounds is not None else None
+
+    def compose(self) -> ComposeResult:
+        with Vertical(id="summary-dialog"):
+            yield Label("Period Comparison", id="summary-title")
+            yield DataTable(id="compare-table")
+            with Horizontal(id="buttons"):
+                yield Button("Close", variant="primary", id="close")
+
+    def on_mount(self) -> None:
+        table = self.query_one(DataTable)
+        table.cursor_type = "row"
+        self._populate()
+        table.focus()
+
+    def _year(self) -> int:
+        # Periods a year apart
+        return 12 if self.cube.by == MONTH else 52
+
+    def _populate(self) -> None:
+        table = self.query_one(DataTable)
+        table.clear(columns=True)
+        if self.period is None:
+            table.add_column("No transactions loaded")
+            return
+
+        current, previous, last_year = self.period, self.period - 1, self.period - self._year()
+        by = self.cube.by
+        table.add_columns("Category", period_label(current, by), period_label(previous, by),
+                          "Change", period_label(last_year, by), "Change")
+
+        now = self.cube.totals(current, current)
+        before = self.cube.totals(previous, previous)
+        year_ago = self.cube.totals(last_year, last_year)
+
+        for key in sorted(now.keys() | before.keys() | year_ago.keys(), key=_row_order):
+            amount = now.get(key, 0)
+            table.add_row(
+                _row_label(key),
+                format_pence(amount),
+                format_pence(before.get(key, 0)),
+                format_pence(amount - before.get(key, 0)),
+                format_pence(year_ago.get(key, 0)),
+                format_pence(amount - year_ago.get(key, 0)),
+            )
+
+    def on_button_pressed(self, event: Button.Pressed) -> None:
+        if event.button.id == "close":
+            self.dismiss()
+
+    BINDINGS = [
+        Binding("escape", "close", "Close"),
+        Binding("p", "shift(-1)", "Previous"),
+        Binding("n", "shift(1)", "Next"),
+    ]
+
+    def action_shift(self, step: int) -> None:
+        bounds = self.cube.bounds()
+        if bounds is None:
+            return
+        self.period = min(max(self.period + step, bounds[0]), bounds[1])
+        self._populate()
+
+    def action_close(self) -> None:
+        self.dismiss()
+
+
+def _row_order(key: tuple[str, str]):
+    # Income first, then spending categories, then pots
+    kind, name = key
+    return kind != INCOME, kind != CATEGORY, name
+
+
+def _row_label(key: tuple[str, str]) -> str:
+    kind, name = key
+    if kind == INCOME:
+        return "Income"
+    if kind == CATEGORY:
+        return name
+    return f"Pot: {name}"
@@ -4,30 +4,30 @@ from textual.events import Key
 from textual.widgets import Label, Button
 from textual.app import ComposeResult
 
+from budget.filter_index import STATUS_FILTERS
 from budget.screens.common import BudgetSelectionList
 
 # pylint: disable=too-many-ancestors
 class FilterScreen(ModalScreen[list[str]]):
-    def __init__(self, categories: list[str], selected: set[str] = None):
+    def __init__(self, categories: list[str], selected: set[str] = None,
+                 counts: dict[str, int] | None = None):
         super().__init__()
         self.categories = sorted(list(set(categories)))
         self.selected = selected or set()
+        # Matching rows per option, shown next to its name when given
+        self.counts = counts
 
     def compose(self) -> ComposeResult:
         with Vertical(id="dialog"):
             yield Label("Select Filter", id="question")
 
             options = []
-            filter_options = [
-                "All (Active)",
-                "Excluded",
-                "Uncategorized",
-                "Categorized",
-                "Unlinked Pot"
-            ]
-            for opt in filter_options + self.categories:
+            for opt in STATUS_FILTERS + self.categories:
                 state = opt in self.selected
-                options.append((opt, opt, state))
+                label = opt
+                if self.counts is not None:
+                    label = f"{opt} ({self.counts.get(opt, 0)})"
+                options.append((label, opt, state))
 
             yield BudgetSelectionList(*options, id="filter_options")
 
@@ -0,0 +1,65 @@
+from textual.app import ComposeResult
+from textual.widgets import Label, DataTable, Button
+from textual.containers import Vertical, Horizontal
+from textual.screen import ModalScreen
+from textual.binding import Binding
+from budget.money import format_pence
+from budget.transaction import Transaction
+
+class PotGroupSelectScreen(ModalScreen[list[Transaction] | None]):
+    """
+    Picks one of the groupings found by pot_linking.find_groupings, to be
+    linked to the current transaction as a set.
+    """
+
+    def __init__(self, current_transaction: Transaction, groupings: list[list[Transaction]]):
+        super().__init__()
+        self.current_transaction = current_transaction
+        self.groupings = groupings
+
+    def compose(self) -> ComposeResult:
+        with Vertical(id="dialog"):
+            label_text = (f"Select group to link to: {self.current_transaction.name()} "
+                          f"({format_pence(self.current_transaction.amount_pence())})")
+            yield Label(label_text, id="question")
+            yield DataTable(id="group_table")
+            with Horizontal(id="buttons"):
+                yield Button("Skip/Cancel", variant="default", id="cancel")
+
+    def on_mount(self) -> None:
+        table = self.query_one(DataTable)
+        table.cursor_type = "row"
+        table.add_columns("Dates", "Transactions", "Amounts")
+
+        for index, group in enumerate(self.groupings):
+            dates = sorted(t.date() for t in group)
+            table.add_row(
+                f"{dates[0]} - {dates[-1]}",
+                ", ".join(t.name() for t in group),
+                " + ".join(format_pence(abs(t.amount_pence())) for t in group),
+                key=str(index)
+            )
+
+        table.focus()
+
+    def on_data_table_row_selected(self, event: DataTable.RowSelected) -> None:
+        self.dismiss(self.groupings[int(event.row_key.value)])
+
+    def on_button_pressed(self, event: Button.Pressed) -> None:
+        if event.button.id == "cancel":
+            self.dismiss(None)
+
+    BINDINGS = [
+        Binding("escape", "cancel", "Cancel"),
+        Binding("j", "cursor_down", "Down", show=False),
+        Binding("k", "cursor_up", "Up", show=False),
+    ]
+
+    def action_cursor_down(self) -> None:
+        self.query_one(DataTable).action_cursor_down()
+
+    def action_cursor_up(self) -> None:
+        self.query_one(DataTable).action_cursor_up()
+
+    def action_cancel(self) -> None:
+        self.dismiss(None)
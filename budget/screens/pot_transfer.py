@@ -3,26 +3,37 @@ from textual.widgets import Label, DataTable, Button
 from textual.containers import Vertical, Horizontal
 from textual.screen import ModalScreen
 from textual.binding import Binding
+from budget.pot_linking import PotTransferIndex
 from budget.transaction import Transaction
 
+# Candidates are listed a page at a time as the cursor nears the end
+PAGE_SIZE = 50
+
 class PotTransferSelectScreen(ModalScreen[str | None]):
-    def __init__(self, current_transaction: Transaction, all_transactions: list[Transaction]):
+    def __init__(self, current_transaction: Transaction,
+                 transfers: PotTransferIndex | list[Transaction]):
+        """
+        transfers is the app's PotTransferIndex, or a list of transactions to
+        build one from.
+        """
         super().__init__()
         self.current_transaction = current_transaction
-        self.candidates = self._get_candidates(all_transactions)
-
-    def _get_candidates(self, all_transactions: list[Transaction]) -> list[Transaction]:
-        # Filter out the current transaction itself and ensure type is "Pot transfer"
-        candidates = [
-            t for t in all_transactions
-            if t.id() != self.current_transaction.id() and t.type() == "Pot transfer"
-        ]
-
-        # Sort by closeness to the absolute amount
-        target_amount = abs(self.current_transaction.amount())
-        candidates.sort(key=lambda t: abs(abs(t.amount()) - target_amount))
+        if not isinstance(transfers, PotTransferIndex):
+            transfers = PotTransferIndex(transfers)
+        # Unlinked transfers, closest in amount first
+        self._nearest = transfers.nearest(
+            current_transaction.amount_pence(), exclude_id=current_transaction.id())
+        self.candidates: list[Transaction] = []
+        self._next_page()
 
-        return candidates
+    def _next_page(self) -> list[Transaction]:
+        page = []
+        for trx in self._nearest:
+            page.append(trx)
+            if len(page) == PAGE_SIZE:
+                break
+        self.candidates.extend(page)
+        return page
 
     def compose(self) -> ComposeResult:
         with Vertical(id="dialog"):
@@ -37,8 +48,12 @@ class PotTransferSelectScreen(ModalScreen[str | None]):
         table = self.query_one(DataTable)
         table.cursor_type = "row"
         table.add_columns("Date", "Name", "Amount", "Category")
+        self._add_rows(self.candidates)
+        table.focus()
 
-        for trx in self.candidates:
+    def _add_rows(self, transactions: list[Transaction]) -> None:
+        table = self.query_one(DataTable)
+        for trx in transactions:
             table.add_row(
                 str(trx.date()),
                 trx.name(),
@@ -47,7 +62,9 @@ class PotTransferSelectScreen(ModalScreen[str | None]):
                 key=trx.id()
             )
 
-        table.focus()
+    def on_data_table_row_highlighted(self, event: DataTable.RowHighlighted) -> None:
+        if event.cursor_row >= event.data_table.row_count - 5:
+            self._add_rows(self._next_page())
 
     def on_data_table_row_selected(self, event: DataTable.RowSelected) -> None:
         self.dismiss(event.row_key.value)
@@ -1,14 +1,76 @@
 from textual.app import ComposeResult
-from textual.widgets import Label, DataTable, Button
+from textual.widgets import Label, DataTable, Button, Collapsible
 from textual.containers import Vertical, Horizontal, VerticalScroll
 from textual.screen import ModalScreen
 from textual.binding import Binding
+from budget.id_index import IdIndex
+from budget.money import format_pence
+from budget.pot_linking import unlink_partners
+from budget.summary_totals import SummaryTotals
 from budget.transaction import Transaction
 
+# Pot tables are filled a page at a time as the cursor nears the end
+PAGE_SIZE = 50
+
+def _linked_status(trx: Transaction) -> str:
+    if trx.link() == Transaction.MANUAL_LINK_ID:
+        return "Manual"
+    return "Yes" if trx.link() else "No"
+
+class PotSection(Collapsible):
+    """
+    One pot's spends, collapsed to a header with the pot's total until
+    expanded. The table is only created on first expansion.
+    """
+
+    def __init__(self, pot: str, total: int, positions: list[int],
+                 transactions: list[Transaction]):
+        title = f"Pot: {pot} ({len(positions)} transactions, total {format_pence(total)})"
+        super().__init__(title=title, collapsed=True, classes="pot-section")
+        self.pot = pot
+        self.positions = positions
+        self.transactions = transactions
+        self._shown = 0
+
+    def on_collapsible_expanded(self, event: Collapsible.Expanded) -> None:
+        if event.collapsible is not self or self.query(DataTable):
+            return
+
+        dt = DataTable(classes="pot-table")
+        dt.add_column("Date", key="Date")
+        dt.add_column("Name", key="Name")
+        dt.add_column("Amount", key="Amount")
+        dt.add_column("Linked", key="Linked")
+        dt.add_column("Notes", key="Notes")
+        dt.cursor_type = "row"
+        self._add_page(dt)
+        self.query_one(Collapsible.Contents).mount(dt)
+
+    def _add_page(self, dt: DataTable) -> None:
+        for i in self.positions[self._shown:self._shown + PAGE_SIZE]:
+            trx = self.transactions[i]
+            dt.add_row(
+                str(trx.date()),
+                trx.name(),
+                format_pence(trx.amount_pence()),
+                _linked_status(trx),
+                trx.notes(),
+                key=trx.id()
+            )
+        self._shown = min(self._shown + PAGE_SIZE, len(self.positions))
+
+    def on_data_table_row_highlighted(self, event: DataTable.RowHighlighted) -> None:
+        if self._shown < len(self.positions) and \
+                event.cursor_row >= event.data_table.row_count - 5:
+            self._add_page(event.data_table)
+
 class SummaryScreen(ModalScreen):
-    def __init__(self, transactions: list[Transaction]):
+    def __init__(self, transactions: list[Transaction], id_index: IdIndex | None = None,
+                 totals: SummaryTotals | None = None):
         super().__init__()
         self.transactions = transactions
+        self.id_index = id_index if id_index is not None else IdIndex(transactions)
+        self.totals = totals if totals is not None else SummaryTotals(transactions)
 
     def compose(self) -> ComposeResult:
         with Vertical(id="summary-dialog"):
@@ -36,98 +98,35 @@ class SummaryScreen(ModalScreen):
         table.add_columns("Date", "Name", "Amount")
         table.cursor_type = "row"
 
-        income_trxs = [t for t in self.transactions if t.income() and not t.excluded()]
-
-        total_income = 0.0
-        for trx in income_trxs:
-            table.add_row(str(trx.date()), trx.name(), f"{trx.amount():.2f}")
-            total_income += trx.amount()
+        for i in self.totals.income_positions():
+            trx = self.transactions[i]
+            table.add_row(str(trx.date()), trx.name(), format_pence(trx.amount_pence()))
 
-        table.add_row("Total", "", f"{total_income:.2f}")
+        table.add_row("Total", "", format_pence(self.totals.income_total()))
 
     def _populate_category_summary(self) -> None:
         table = self.query_one("#category-table", DataTable)
         table.add_columns("Category", "Total Amount")
         table.cursor_type = "row"
 
-        # Calculate sums
-        sums = {}
-        for trx in self.transactions:
-            if trx.excluded():
-                continue
-
-            if trx.income():
-                continue
-
-            cat = trx.category()
-            if not cat:
-                cat = "Uncategorized"
-
-            if cat == "Pot":
-                continue
-
-            if cat not in sums:
-                sums[cat] = 0.0
-            sums[cat] += trx.amount()
-
-        # Add to table
+        sums = self.totals.category_totals()
         for cat in sorted(sums.keys()):
             amount = sums[cat]
-            table.add_row(cat, f"{amount:.2f}")
+            table.add_row(cat, format_pence(amount))
 
     def _populate_pot_details(self) -> None:
         container = self.query_one("#pot-details-container", Vertical)
 
-        # Group pot transactions by pot category
-        pot_trxs = {}
-        for trx in self.transactions:
-            if trx.excluded():
-                continue
-
-            if trx.category() == "Pot":
-                # Filter out "Pot transfer" type
-                if trx.type() == "Pot transfer":
-                    continue
-
-                pot_cat = trx.pot_category()
-                if not pot_cat:
-                    pot_cat = "Unassigned Pot"
-
-                if pot_cat not in pot_trxs:
-                    pot_trxs[pot_cat] = []
-                pot_trxs[pot_cat].append(trx)
-
-        if not pot_trxs:
+        pot_totals = self.totals.pot_totals()
+        if not pot_totals:
             container.mount(Label("No pot transactions found."))
             return
 
-        for pot_cat in sorted(pot_trxs.keys()):
-            container.mount(Label(f"Pot: {pot_cat}", classes="pot-header"))
-
-            dt = DataTable(classes="pot-table")
-            dt.add_column("Date", key="Date")
-            dt.add_column("Name", key="Name")
-            dt.add_column("Amount", key="Amount")
-            dt.add_column("Linked", key="Linked")
-            dt.add_column("Notes", key="Notes")
-            dt.cursor_type = "row"
-
-            for trx in pot_trxs[pot_cat]:
-                linked_status = "No"
-                if trx.link():
-                    linked_status = "Yes"
-                    if trx.link() == Transaction.MANUAL_LINK_ID:
-                        linked_status = "Manual"
-
-                dt.add_row(
-                    str(trx.date()),
-                    trx.name(),
-                    f"{trx.amount():.2f}",
-                    linked_status,
-                    trx.notes(),
-                    key=trx.id()
-                )
-            container.mount(dt)
+        container.mount_all(
+            PotSection(pot_cat, pot_totals[pot_cat], self.totals.pot_positions(pot_cat),
+                       self.transactions)
+            for pot_cat in sorted(pot_totals.keys())
+        )
 
     def on_data_table_row_selected(self, event: DataTable.RowSelected) -> None:
         # Optional: maybe show details or something?
@@ -157,7 +156,7 @@ class SummaryScreen(ModalScreen):
             return
 
         # Find transaction
-        trx = next((t for t in self.transactions if t.id() == trx_id), None)
+        trx = self.id_index.get(trx_id)
         if not trx:
             return
 
@@ -168,24 +167,13 @@ class SummaryScreen(ModalScreen):
         else:
             # If linked to something else, unlink it first?
             # Consistent with main screen behavior:
-            if trx.link():
-                # We need to find the linked transaction to clear its link
-                linked_trx = next((t for t in self.transactions if t.id() == trx.link()), None)
-                if linked_trx:
-                    linked_trx.set_link("")
+            unlink_partners(trx, self.id_index.get)
 
             trx.set_link(Transaction.MANUAL_LINK_ID)
             self.notify("Marked as manually linked")
 
-        # Refresh the specific row in the table
-        linked_status = "No"
-        if trx.link():
-            linked_status = "Yes"
-            if trx.link() == Transaction.MANUAL_LINK_ID:
-                linked_status = "Manual"
-
-        # Update the "Linked" column (index 3)
-        focused.update_cell(row_key, "Linked", linked_status)
+        # Refresh the "Linked" column of the specific row in the table
+        focused.update_cell(row_key, "Linked", _linked_status(trx))
 
     def on_button_pressed(self, event: Button.Pressed) -> None:
         if event.button.id == "close":
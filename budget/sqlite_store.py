@@ -0,0 +1,276 @@
+"""
+Optional SQLite storage backend for budgeting sessions.
+
+A session saved to a ``.db``/``.sqlite`` file keeps the raw Monzo fields and the
+Transaction.fields_to_persist columns in indexed tables. Edits are written as
+single-row UPDATEs as they happen and committed on save, instead of rewriting
+the whole file. Filters and summaries are answered in SQL, reading only the
+matching rows, or none at all for totals.
+"""
+import os
+import sqlite3
+from pathlib import Path
+from typing import Iterable, Iterator, List
+
+from budget import common
+from budget.pot_linking import POT_TRANSFER_TYPE
+from budget.raw_transaction import RawTransaction
+from budget.summary_totals import UNASSIGNED_POT, UNCATEGORIZED
+from budget.transaction import Transaction
+
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+
+_RAW_COLUMNS = ", ".join(f'"{field}" TEXT' for field in common.EXPECTED_RAW_FIELDS)
+_RAW_NAMES = ", ".join(f'"{field}"' for field in common.EXPECTED_RAW_FIELDS)
+_SELECT_RAW = ", ".join(f'r."{field}"' for field in common.EXPECTED_RAW_FIELDS)
+_PROCESSED_NAMES = ", ".join(Transaction.fields_to_persist)
+_FROM = "FROM raw r JOIN processed p ON p.seq = r.seq"
+
+# The rows summary_keys files under a spending category or a pot
+_SPENDING = "p.excluded = 0 AND p.income = 0 AND p.category != 'Pot'"
+_POT_SPENDING = "p.excluded = 0 AND p.category = 'Pot' AND r.\"Type\" != ?"
+_POT_NAME = "CASE p.pot_category WHEN '' THEN ? ELSE p.pot_category END"
+_STATUS_FILTERS = {"all (active)", "excluded", "uncategorized", "categorized", "unlinked pot"}
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS raw (
+    seq INTEGER PRIMARY KEY,
+    trx_id TEXT NOT NULL,
+    iso_date TEXT,
+    amount_pence INTEGER,
+    {_RAW_COLUMNS}
+);
+CREATE TABLE IF NOT EXISTS processed (
+    seq INTEGER PRIMARY KEY REFERENCES raw(seq),
+    trx_id TEXT NOT NULL,
+    excluded INTEGER NOT NULL DEFAULT 0,
+    category TEXT NOT NULL DEFAULT '',
+    pot_category TEXT NOT NULL DEFAULT '',
+    status TEXT NOT NULL DEFAULT '',
+    link TEXT NOT NULL DEFAULT '',
+    income INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS raw_trx_id ON raw(trx_id);
+CREATE INDEX IF NOT EXISTS raw_iso_date ON raw(iso_date);
+CREATE INDEX IF NOT EXISTS raw_type ON raw("Type");
+CREATE INDEX IF NOT EXISTS processed_trx_id ON processed(trx_id);
+CREATE INDEX IF NOT EXISTS processed_category ON processed(category);
+"""
+
+
+def is_sqlite_path(path) -> bool:
+    return os.fspath(path).lower().endswith(SQLITE_SUFFIXES)
+
+
+class SqliteSession:
+    """
+    A budgeting session stored in an SQLite database.
+
+    Changes recorded through record_change() are held in an open SQLite
+    transaction until commit(), matching the app's explicit save model.
+    The database must already exist unless create is set.
+    """
+
+    def __init__(self, path, create: bool = False):
+        self.path = os.fspath(path)
+        if create:
+            self._conn = sqlite3.connect(self.path)
+        else:
+            if not os.path.exists(self.path):
+                raise FileNotFoundError(f"No such file: {self.path}")
+            # mode=rw fails rather than creating an empty database
+            uri = f"{Path(self.path).absolute().as_uri()}?mode=rw"
+            self._conn = sqlite3.connect(uri, uri=True)
+        self._conn.executescript(_SCHEMA)
+        # Row (seq) of each transaction loaded or saved, by object identity as
+        # in FilterIndex, since Transaction IDs need not be unique, and the
+        # position of each row in the sequence returned by load()
+        self._seqs: dict[int, int] = {}
+        self._positions: dict[int, int] = {}
+
+    def close(self) -> None:
+        # Anything not committed is discarded, like quitting without saving
+        self._conn.rollback()
+        self._conn.close()
+
+    def commit(self) -> None:
+        self._conn.commit()
+
+    def save(self, transactions: Iterable[Transaction]) -> None:
+        """
+        Replaces the stored session with transactions and commits.
+        """
+        cur = self._conn.cursor()
+        cur.execute("DELETE FROM processed")
+        cur.execute("DELETE FROM raw")
+        placeholders = ", ".join("?" for _ in common.EXPECTED_RAW_FIELDS)
+        self._seqs = {}
+        self._positions = {}
+        for seq, trx in enumerate(transactions):
+            self._seqs[id(trx)] = seq
+            self._positions[seq] = seq
+            raw = trx.raw.to_dict()
+            try:
+                iso_date = trx.date().isoformat()
+            except ValueError:
+                iso_date = None
+            try:
+                amount = trx.amount_pence()
+            except ValueError:
+                amount = None
+            cur.execute(
+                f"INSERT INTO raw (seq, trx_id, iso_date, amount_pence, {_RAW_NAMES}) "
+                f"VALUES (?, ?, ?, ?, {placeholders})",
+                (seq, trx.id(), iso_date, amount,
+                 *(raw[field] for field in common.EXPECTED_RAW_FIELDS)),
+            )
+            cur.execute(
+                f"INSERT INTO processed (seq, trx_id, {_PROCESSED_NAMES}) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (seq, trx.id(),
+                 *(getattr(trx, field)() for field in Transaction.fields_to_persist)),
+            )
+        self._conn.commit()
+
+    def _query(self, where: str = "1", params: tuple = ()) -> Iterator[tuple[int, Transaction]]:
+        cur = self._conn.execute(
+            f"SELECT r.seq, {_SELECT_RAW}, p.excluded, p.category, p.pot_category, "
+            f"p.status, p.link, p.income {_FROM} WHERE {where} ORDER BY r.seq",
+            params,
+        )
+        n_raw = len(common.EXPECTED_RAW_FIELDS)
+        for seq, *row in cur:
+            rt = RawTransaction(dict(zip(common.EXPECTED_RAW_FIELDS, row[:n_raw])))
+            excluded, category, pot_category, status, link, income = row[n_raw:]
+            yield seq, Transaction.restore(rt, bool(excluded), category, pot_category,
+                                           status, link, bool(income))
+
+    def load(self) -> List[Transaction]:
+        transactions = []
+        self._seqs = {}
+        self._positions = {}
+        for seq, trx in self._query():
+            self._seqs[id(trx)] = seq
+            self._positions[seq] = len(transactions)
+            transactions.append(trx)
+        return transactions
+
+    def record_change(self, trx: Transaction, field: str, _old, new) -> None:
+        """
+        Observer callback (see Transaction.set_observer): writes one processed
+        field of the row trx was loaded from or saved to.
+        """
+        if field not in Transaction.fields_to_persist:
+            return
+        seq = self._seqs.get(id(trx))
+        if seq is None:
+            return
+        self._conn.execute(f"UPDATE processed SET {field} = ? WHERE seq = ?", (new, seq))
+
+    def _seq_positions(self, where: str, params: tuple = ()) -> list[int]:
+        """Positions in the loaded sequence of the rows matching where."""
+        cur = self._conn.execute(f"SELECT r.seq {_FROM} WHERE {where} ORDER BY r.seq", params)
+        return [self._positions[seq] for (seq,) in cur if seq in self._positions]
+
+    @staticmethod
+    def _filter_where(filters: Iterable[str]) -> tuple[str, tuple] | None:
+        """
+        The WHERE clause selecting the rows BudgetApp._apply_filters displays
+        for filters, as filter_keys would match them, or None if none are.
+        """
+        filters = {f.lower() for f in filters}
+        active = []
+        if "all (active)" in filters:
+            active.append("1")
+        if "uncategorized" in filters:
+            active.append("p.category = ''")
+        if "categorized" in filters:
+            active.append("p.category != ''")
+        if "unlinked pot" in filters:
+            active.append("(p.category = 'Pot' AND p.link = '')")
+        categories = sorted(filters - _STATUS_FILTERS)
+        if categories:
+            active.append(f"lower(p.category) IN ({', '.join('?' for _ in categories)})")
+
+        clauses = []
+        if "excluded" in filters:
+            clauses.append("p.excluded = 1")
+        if active:
+            clauses.append(f"(p.excluded = 0 AND ({' OR '.join(active)}))")
+        if not clauses:
+            return None
+        return " OR ".join(clauses), tuple(categories)
+
+    def iter_filtered(self, filters: Iterable[str]) -> Iterator[Transaction]:
+        """
+        Yields the transactions shown under filters, reading only those rows.
+        """
+        where = self._filter_where(filters)
+        if where is not None:
+            for _seq, trx in self._query(*where):
+                yield trx
+
+    def filtered_positions(self, filters: Iterable[str]) -> list[int]:
+        """
+        Positions in the loaded sequence of the rows shown under filters, as
+        FilterIndex.positions gives them.
+        """
+        where = self._filter_where(filters)
+        return [] if where is None else self._seq_positions(*where)
+
+    def income_total(self) -> int:
+        cur = self._conn.execute(
+            f"SELECT COALESCE(SUM(r.amount_pence), 0) {_FROM} "
+            "WHERE p.income = 1 AND p.excluded = 0"
+        )
+        return cur.fetchone()[0]
+
+    def income_positions(self) -> list[int]:
+        return self._seq_positions("p.income = 1 AND p.excluded = 0")
+
+    def category_totals(self) -> dict[str, int]:
+        """
+        Spending total in pence of each category, as SummaryTotals gives them:
+        excluded, income and Pot rows are left out and blank categories are
+        reported as Uncategorized.
+        """
+        cur = self._conn.execute(
+            "SELECT CASE p.category WHEN '' THEN ? ELSE p.category END AS cat, "
+            f"COALESCE(SUM(r.amount_pence), 0) {_FROM} WHERE {_SPENDING} GROUP BY cat",
+            (UNCATEGORIZED,),
+        )
+        return dict(cur.fetchall())
+
+    def spending_total(self) -> int:
+        cur = self._conn.execute(
+            f"SELECT COALESCE(SUM(r.amount_pence), 0) {_FROM} WHERE {_SPENDING}")
+        return cur.fetchone()[0]
+
+    def pot_totals(self) -> dict[str, int]:
+        """Total spent in pence from each pot, pot transfers aside."""
+        cur = self._conn.execute(
+            f"SELECT {_POT_NAME} AS pot, COALESCE(SUM(r.amount_pence), 0) "
+            f"{_FROM} WHERE {_POT_SPENDING} GROUP BY pot",
+            (UNASSIGNED_POT, POT_TRANSFER_TYPE),
+        )
+        return dict(cur.fetchall())
+
+    def pot_positions(self, pot: str) -> list[int]:
+        return self._seq_positions(f"{_POT_SPENDING} AND {_POT_NAME} = ?",
+                                   (POT_TRANSFER_TYPE, UNASSIGNED_POT, pot))
+
+
+def load_sqlite(path) -> List[Transaction]:
+    session = SqliteSession(path)
+    try:
+        return session.load()
+    finally:
+        session.close()
+
+
+def save_sqlite(path, transactions: Iterable[Transaction]) -> None:
+    session = SqliteSession(path, create=True)
+    try:
+        session.save(transactions)
+    finally:
+        session.close()
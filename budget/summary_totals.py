@@ -0,0 +1,129 @@
+"""
+Running totals for the budget summary.
+
+Every row is filed under the summary buckets it counts towards: the income
+total, the total of its spending category, or the pot it was paid from. The
+app keeps the totals current from the transaction observer, so SummaryScreen
+reads them per category instead of adding up every row when it opens, and
+the main screen can show them live.
+"""
+from typing import Iterable, Sequence
+
+from budget.pot_linking import POT_TRANSFER_TYPE
+from budget.row_index import RowIndex, RowPositions
+from budget.transaction import Transaction
+
+INCOME = "income"
+CATEGORY = "category"
+POT = "pot"
+
+UNCATEGORIZED = "Uncategorized"
+UNASSIGNED_POT = "Unassigned Pot"
+
+# The processed fields that move a row between buckets
+SUMMARY_FIELDS = frozenset(["excluded", "income", "category", "pot_category"])
+
+
+def summary_keys(trx: Transaction) -> tuple[tuple[str, str], ...]:
+    """
+    The (kind, name) buckets trx counts towards. Excluded rows count towards
+    none; income is totalled apart from spending categories; Pot spends are
+    grouped by pot, and pot transfers are left out as they only move money.
+    """
+    if trx.excluded():
+        return ()
+
+    keys = []
+    cat = trx.category()
+    if trx.income():
+        keys.append((INCOME, ""))
+    elif cat != "Pot":
+        keys.append((CATEGORY, cat or UNCATEGORIZED))
+
+    if cat == "Pot" and trx.type() != POT_TRANSFER_TYPE:
+        keys.append((POT, trx.pot_category() or UNASSIGNED_POT))
+    return tuple(keys)
+
+
+def summarise(transactions: Iterable[Transaction]) -> dict[tuple[str, str], int]:
+    """
+    Total of each bucket over transactions in a single pass, holding no rows,
+    for headless reports over histories too large to load.
+    """
+    totals: dict[tuple[str, str], int] = {}
+    for trx in transactions:
+        keys = summary_keys(trx)
+        if keys:
+            amount = trx.amount_pence()
+            for key in keys:
+                totals[key] = totals.get(key, 0) + amount
+    return totals
+
+
+class SummaryTotals(RowIndex):
+    """
+    Totals in pence, and row positions, for each summary bucket of a
+    transaction sequence.
+    """
+
+    def __init__(self, transactions: Sequence[Transaction] = (),
+                 positions: RowPositions | None = None):
+        super().__init__(positions)
+        self._totals: dict[tuple[str, str], int] = {}
+        self._members: dict[tuple[str, str], set[int]] = {}
+        self._amounts: list[int] = []
+        self.extend(transactions)
+
+    def _keys(self, trx: Transaction) -> tuple[tuple[str, str], ...]:
+        return summary_keys(trx)
+
+    def _append(self, position: int, trx: Transaction,
+                keys: tuple[tuple[str, str], ...]) -> None:
+        try:
+            amount = trx.amount_pence()
+        except ValueError:
+            amount = 0
+        self._amounts.append(amount)
+        self._add(position, keys)
+
+    def _move(self, position: int, old: tuple[tuple[str, str], ...],
+              new: tuple[tuple[str, str], ...]) -> None:
+        amount = self._amounts[position]
+        for key in old:
+            members = self._members[key]
+            members.discard(position)
+            if members:
+                self._totals[key] -= amount
+            else:
+                del self._members[key]
+                del self._totals[key]
+        self._add(position, new)
+
+    def _add(self, position: int, keys: Iterable[tuple[str, str]]) -> None:
+        amount = self._amounts[position]
+        for key in keys:
+            self._members.setdefault(key, set()).add(position)
+            self._totals[key] = self._totals.get(key, 0) + amount
+
+    def income_total(self) -> int:
+        return self._totals.get((INCOME, ""), 0)
+
+    def income_positions(self) -> list[int]:
+        """Positions of the income rows, in sequence order."""
+        return sorted(self._members.get((INCOME, ""), ()))
+
+    def category_totals(self) -> dict[str, int]:
+        """Spending total of each category (pot spends aside), by category name."""
+        return {name: total for (kind, name), total in self._totals.items()
+                if kind == CATEGORY}
+
+    def spending_total(self) -> int:
+        return sum(self.category_totals().values())
+
+    def pot_totals(self) -> dict[str, int]:
+        """Total spent from each pot, by pot name."""
+        return {name: total for (kind, name), total in self._totals.items() if kind == POT}
+
+    def pot_positions(self, pot: str) -> list[int]:
+        """Positions of the spends from pot, in sequence order."""
+        return sorted(self._members.get((POT, pot), ()))
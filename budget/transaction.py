@@ -1,10 +1,17 @@
 import csv
-from typing import List
+import os
+import shutil
+import tempfile
+from typing import Callable, List
 from budget.raw_transaction import RawTransaction
+from budget.journal_file import discard_journal
 from budget import common
 
 class Transaction:
     MANUAL_LINK_ID = "MANUAL"
+    # Joins the IDs of a group link, where one transaction funds (or is
+    # funded by) several others; see pot_linking.link_group
+    LINK_SEPARATOR = ","
 
     fields_to_persist = [
         "excluded",
@@ -17,6 +24,7 @@ class Transaction:
 
     def __init__(self, raw_transaction: RawTransaction, processed_columns: dict = None):
         self.raw = raw_transaction
+        self._observer = None
 
         # Processed fields
         self._excluded: bool = False
@@ -50,6 +58,24 @@ class Transaction:
             else:
                 self._income = bool(val)
 
+    @classmethod
+    def restore(cls, raw_transaction: RawTransaction, excluded: bool, category: str,
+                pot_category: str, status: str, link: str, income: bool) -> "Transaction":
+        """
+        Rebuilds a transaction from already decoded processed values (in
+        fields_to_persist order), skipping the string parsing done in __init__.
+        """
+        trx = cls.__new__(cls)
+        trx.raw = raw_transaction
+        trx._observer = None
+        trx._excluded = excluded
+        trx._category = category
+        trx._pot_category = pot_category
+        trx._status = status
+        trx._link = link
+        trx._income = income
+        return trx
+
     def __eq__(self, other):
         if not isinstance(other, Transaction):
             return NotImplemented
@@ -89,31 +115,46 @@ class Transaction:
     def excluded(self):
         return self._excluded
 
+    def set_observer(self, observer) -> None:
+        """
+        Registers a callable(trx, field, old_value, new_value) that is told about
+        every change to a processed field. Only one observer is kept; pass None
+        to detach.
+        """
+        self._observer = observer
+
+    def _set(self, field: str, value) -> None:
+        attr = f"_{field}"
+        old = getattr(self, attr)
+        setattr(self, attr, value)
+        if self._observer is not None and old != value:
+            self._observer(self, field, old, value)
+
     def set_category(self, category: str):
-        self._category = category
+        self._set("category", category)
 
     def set_pot_category(self, pot_category: str):
-        self._pot_category = pot_category
+        self._set("pot_category", pot_category)
 
     def set_status(self, status: str):
-        self._status = status
+        self._set("status", status)
 
     def set_link(self, link: str):
-        self._link = link
+        self._set("link", link)
 
     def set_income(self, income: bool):
-        self._income = income
+        self._set("income", income)
 
     def set_excluded(self, excluded: bool):
-        self._excluded = excluded
+        self._set("excluded", excluded)
 
     def clear_processed_fields(self):
-        self._excluded = False
-        self._category = ""
-        self._pot_category = ""
-        self._status = ""
-        self._link = ""
-        self._income = False
+        self.set_excluded(False)
+        self.set_category("")
+        self.set_pot_category("")
+        self.set_status("")
+        self.set_link("")
+        self.set_income(False)
 
     def id(self):
         return self.raw.id()
@@ -130,16 +171,60 @@ class Transaction:
     def amount(self):
         return self.raw.amount()
 
+    def amount_pence(self):
+        return self.raw.amount_pence()
+
     def notes(self):
         return self.raw.notes()
 
-def save_transactions(filename: str, transactions: List[Transaction]):
-    with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-        # Combine raw fields and processed fields
-        processed_fields = [f"bt_{f}" for f in Transaction.fields_to_persist]
-        fieldnames = common.EXPECTED_RAW_FIELDS + processed_fields
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-
-        writer.writeheader()
-        for trx in transactions:
-            writer.writerow(trx.to_prefixed_dict())
+# Read once at import, while nothing else can be changing it
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+def save_transactions(filename: str, transactions: List[Transaction],
+                      progress: Callable[[int], None] | None = None,
+                      progress_every: int = 1000):
+    """
+    Writes transactions as a processed CSV.
+
+    The data goes to a temporary file in the same directory, which is fsynced
+    and then atomically renamed over filename, so a crash or error part way
+    through never leaves a truncated file behind. Any edit journal of filename
+    is deleted once it is replaced, as its edits are either in transactions or
+    meant to be overwritten. If given, progress is called with the number of
+    rows written every progress_every rows and at the end.
+    """
+
+    filename = os.fspath(filename)
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', newline='', encoding='utf-8') as csvfile:
+            # Combine raw fields and processed fields
+            processed_fields = [f"bt_{f}" for f in Transaction.fields_to_persist]
+            fieldnames = common.EXPECTED_RAW_FIELDS + processed_fields
+            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+
+            writer.writeheader()
+            count = 0
+            for count, trx in enumerate(transactions, 1):
+                writer.writerow(trx.to_prefixed_dict())
+                if progress is not None and count % progress_every == 0:
+                    progress(count)
+
+            csvfile.flush()
+            os.fsync(csvfile.fileno())
+
+        if os.path.exists(filename):
+            shutil.copymode(filename, tmp_path)
+        else:
+            os.chmod(tmp_path, 0o666 & ~_UMASK)
+        os.replace(tmp_path, filename)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    discard_journal(filename)
+
+    if progress is not None:
+        progress(count)
@@ -0,0 +1,246 @@
+import datetime
+import os
+from array import array
+from typing import Iterable, Iterator
+
+from budget import common
+from budget.raw_transaction import RawTransaction, parse_date
+from budget.transaction import Transaction
+
+_INVALID_AMOUNT = -(2 ** 63)
+
+
+class TransactionStore:
+    """
+    Column oriented container for a whole session of transactions.
+
+    Every raw CSV field and every processed field lives in its own array, so a
+    session costs one list per column rather than a Transaction, RawTransaction
+    and dict per row. Rows are accessed through lightweight TransactionRow views
+    that offer the same accessor API as Transaction, so the store can be used
+    anywhere a list of Transactions is expected.
+    """
+
+    def __init__(self):
+        # Stripped cell values; the few cells that had surrounding whitespace
+        # keep their original value in _padded, keyed by (index, field)
+        self._raw = {field: [] for field in common.EXPECTED_RAW_FIELDS}
+        self._padded: dict[tuple[int, str], str] = {}
+        self._dates: list = []
+        # Integer pence; _INVALID_AMOUNT marks a cell that failed to parse
+        self._amounts = array("q")
+
+        self._excluded = bytearray()
+        self._category: list[str] = []
+        self._pot_category: list[str] = []
+        self._status: list[str] = []
+        self._link: list[str] = []
+        self._income = bytearray()
+
+        self._observer = None
+
+    @classmethod
+    def from_transactions(cls, transactions: Iterable[Transaction]) -> "TransactionStore":
+        store = cls()
+        store.extend(transactions)
+        return store
+
+    @classmethod
+    def from_csv(cls, csv_filename: str) -> "TransactionStore":
+        """
+        Loads a raw or processed data file as load_data does (through its
+        cache, with journal edits replayed), one batch of rows at a time, so
+        only a batch of Transaction objects is alive at once.
+        """
+        # pylint: disable=import-outside-toplevel
+        from budget.import_data import iter_batches
+        store = cls()
+        for batch in iter_batches(os.fspath(csv_filename)):
+            store.extend(batch)
+        return store
+
+    def append(self, trx) -> None:
+        index = len(self)
+        raw = trx.raw.to_dict()
+        for field, column in self._raw.items():
+            value = raw[field]
+            stripped = value.strip()
+            if stripped != value:
+                self._padded[index, field] = value
+            column.append(stripped)
+
+        try:
+            self._dates.append(trx.date())
+        except ValueError:
+            self._dates.append(None)
+        try:
+            self._amounts.append(trx.amount_pence())
+        except ValueError:
+            self._amounts.append(_INVALID_AMOUNT)
+
+        self._excluded.append(trx.excluded())
+        self._category.append(trx.category())
+        self._pot_category.append(trx.pot_category())
+        self._status.append(trx.status())
+        self._link.append(trx.link())
+        self._income.append(trx.income())
+
+    def extend(self, transactions: Iterable[Transaction]) -> None:
+        for trx in transactions:
+            self.append(trx)
+
+    def __len__(self) -> int:
+        return len(self._category)
+
+    def __getitem__(self, index: int) -> "TransactionRow":
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("TransactionStore index out of range")
+        return TransactionRow(self, index)
+
+    def __iter__(self) -> Iterator["TransactionRow"]:
+        for index in range(len(self)):
+            yield TransactionRow(self, index)
+
+    def raw_value(self, index: int, field: str) -> str:
+        """The cell as it was read, including any surrounding whitespace."""
+        return self._padded.get((index, field), self._raw[field][index])
+
+    def set_observer(self, observer) -> None:
+        """
+        Registers a callable(row, field, old_value, new_value), as with
+        Transaction.set_observer, for changes made through any row view.
+        """
+        self._observer = observer
+
+    def set_value(self, index: int, field: str, value) -> None:
+        column = getattr(self, f"_{field}")
+        old = column[index]
+        if isinstance(column, bytearray):
+            old = bool(old)
+            value = bool(value)
+        column[index] = value
+        if self._observer is not None and old != value:
+            self._observer(TransactionRow(self, index), field, old, value)
+
+
+class TransactionRow:
+    """
+    A view onto a single row of a TransactionStore.
+
+    Mirrors the Transaction API; reads and writes go straight to the columns.
+    """
+    __slots__ = ("_store", "_index")
+
+    MANUAL_LINK_ID = Transaction.MANUAL_LINK_ID
+    LINK_SEPARATOR = Transaction.LINK_SEPARATOR
+    fields_to_persist = Transaction.fields_to_persist
+
+    def __init__(self, store: TransactionStore, index: int):
+        self._store = store
+        self._index = index
+
+    def __eq__(self, other):
+        if not isinstance(other, (Transaction, TransactionRow)):
+            return NotImplemented
+        return self.to_prefixed_dict() == other.to_prefixed_dict()
+
+    def __str__(self) -> str:
+        return str(self.raw)
+
+    @property
+    def raw(self) -> RawTransaction:
+        return RawTransaction(self._raw_dict())
+
+    @property
+    def position(self) -> int:
+        """This row's position in its store."""
+        return self._index
+
+    def _raw_dict(self) -> dict:
+        return {field: self._store.raw_value(self._index, field)
+                for field in common.EXPECTED_RAW_FIELDS}
+
+    def _raw_field(self, field: str) -> str:
+        # pylint: disable=protected-access
+        return self._store._raw[field][self._index]
+
+    def to_prefixed_dict(self) -> dict:
+        data = self._raw_dict()
+        for field in self.fields_to_persist:
+            data[f"bt_{field}"] = getattr(self, field)()
+        return data
+
+    # pylint: disable=protected-access
+    def category(self) -> str:
+        return self._store._category[self._index]
+
+    def pot_category(self) -> str:
+        return self._store._pot_category[self._index]
+
+    def status(self) -> str:
+        return self._store._status[self._index]
+
+    def link(self) -> str:
+        return self._store._link[self._index]
+
+    def income(self) -> bool:
+        return bool(self._store._income[self._index])
+
+    def excluded(self) -> bool:
+        return bool(self._store._excluded[self._index])
+
+    def set_category(self, category: str):
+        self._store.set_value(self._index, "category", category)
+
+    def set_pot_category(self, pot_category: str):
+        self._store.set_value(self._index, "pot_category", pot_category)
+
+    def set_status(self, status: str):
+        self._store.set_value(self._index, "status", status)
+
+    def set_link(self, link: str):
+        self._store.set_value(self._index, "link", link)
+
+    def set_income(self, income: bool):
+        self._store.set_value(self._index, "income", income)
+
+    def set_excluded(self, excluded: bool):
+        self._store.set_value(self._index, "excluded", excluded)
+
+    def clear_processed_fields(self):
+        self.set_excluded(False)
+        self.set_category("")
+        self.set_pot_category("")
+        self.set_status("")
+        self.set_link("")
+        self.set_income(False)
+
+    def id(self) -> str:
+        return self._raw_field("Transaction ID")
+
+    def date(self) -> datetime.date:
+        value = self._store._dates[self._index]
+        if value is None:
+            # Re-parse to surface the original error message
+            return parse_date(self._raw_field("Date"))
+        return value
+
+    def type(self) -> str:
+        return self._raw_field("Type")
+
+    def name(self) -> str:
+        return self._raw_field("Name")
+
+    def amount_pence(self) -> int:
+        value = self._store._amounts[self._index]
+        if value == _INVALID_AMOUNT:
+            raise ValueError(f"Invalid amount: {self._store.raw_value(self._index, 'Amount')}")
+        return value
+
+    def amount(self) -> float:
+        return self.amount_pence() / 100
+
+    def notes(self) -> str:
+        return self._raw_field("Notes and #tags")
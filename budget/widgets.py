@@ -1,7 +1,16 @@
+from rich.cells import cell_len, set_cell_size
+from rich.segment import Segment
+from textual import events
 from textual.app import ComposeResult
-from textual.widgets import Label, Static, DataTable
-from textual.containers import Vertical
 from textual.binding import Binding
+from textual.containers import Vertical
+from textual.coordinate import Coordinate
+from textual.geometry import Size
+from textual.message import Message
+from textual.reactive import Reactive
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
+from textual.widgets import Label, Static
 from budget.transaction import Transaction
 
 FIELDS_TO_DISPLAY = [
@@ -14,42 +23,237 @@ FIELDS_TO_DISPLAY = [
     "pot_category",
 ]
 
-class TransactionTable(DataTable):
+# Fixed widths keep the layout independent of how many rows there are
+COLUMNS = [
+    ("Date", 10),
+    ("Type", 14),
+    ("Name", 28),
+    ("Amount", 10),
+    ("Notes", 24),
+    ("Category", 20),
+    ("Pot Category", 20),
+]
+
+CELL_PADDING = 1
+
+
+def _fit(text: str, width: int, right: bool = False) -> str:
+    """Crops or pads text to exactly width cells."""
+    if cell_len(text) > width:
+        return set_cell_size(text, width)
+    padding = " " * (width - cell_len(text))
+    return padding + text if right else text + padding
+
+
+class TransactionTable(ScrollView, can_focus=True):
+    """
+    A virtual table of transactions.
+
+    Only references to the displayed transactions are kept; the cells of a
+    row are built when its line is drawn, so loading and scrolling cost the
+    same for a hundred rows as for a hundred thousand. Row i always shows the
+    i-th transaction passed in.
+    """
+
     BINDINGS = [
-        Binding("j", "cursor_down", "Down", show=False),
-        Binding("k", "cursor_up", "Up", show=False),
+        Binding("up,k", "cursor_up", "Up", show=False),
+        Binding("down,j", "cursor_down", "Down", show=False),
+        Binding("pageup", "page_cursor_up", "Page Up", show=False),
+        Binding("pagedown", "page_cursor_down", "Page Down", show=False),
+        Binding("home", "cursor_home", "First Row", show=False),
+        Binding("end", "cursor_end", "Last Row", show=False),
     ]
 
-    def on_mount(self) -> None:
-        self.zebra_stripes = True
-        self.cursor_type = "row"
-        self.add_columns("Date", "Type", "Name", "Amount", "Notes")
-        self.add_column("Category", width=20)
-        self.add_column("Pot Category", width=20)
+    COMPONENT_CLASSES = {
+        "transaction-table--header",
+        "transaction-table--cursor",
+        "transaction-table--even-row",
+    }
+
+    DEFAULT_CSS = """
+    TransactionTable {
+        background: $surface;
+        color: $foreground;
+        height: 1fr;
+        & > .transaction-table--header {
+            text-style: bold;
+            background: $panel;
+            color: $foreground;
+        }
+        & > .transaction-table--even-row {
+            background: $surface-lighten-1 50%;
+        }
+        & > .transaction-table--cursor {
+            background: $block-cursor-blurred-background;
+            color: $block-cursor-blurred-foreground;
+            text-style: $block-cursor-blurred-text-style;
+        }
+        &:focus > .transaction-table--cursor {
+            background: $block-cursor-background;
+            color: $block-cursor-foreground;
+            text-style: $block-cursor-text-style;
+        }
+    }
+    """
+
+    class RowHighlighted(Message):
+        """Posted when the cursor moves to a row, or the row under it changes."""
+
+        def __init__(self, table: "TransactionTable", cursor_row: int) -> None:
+            super().__init__()
+            self.table = table
+            self.cursor_row = cursor_row
+
+        @property
+        def control(self) -> "TransactionTable":
+            return self.table
+
+    cursor_coordinate: Reactive[Coordinate] = Reactive(Coordinate(0, 0), repaint=False)
+    zebra_stripes = True
+
+    def __init__(self, *, name=None, id=None, classes=None, disabled=False):
+        # pylint: disable=redefined-builtin
+        super().__init__(name=name, id=id, classes=classes, disabled=disabled)
+        self._transactions: list[Transaction] = []
+        self._row_width = sum(width + 2 * CELL_PADDING for _, width in COLUMNS)
+
+    @property
+    def row_count(self) -> int:
+        return len(self._transactions)
 
     def load_data(self, transactions: list[Transaction]) -> None:
-        self.clear()
-        for index, trx in enumerate(transactions):
-            fields = [getattr(trx, field)() for field in FIELDS_TO_DISPLAY]
-            self.add_row(
-                *fields,
-                key=str(index)
-            )
+        self._transactions = list(transactions)
+        self._rows_changed()
         self.focus()
 
+    def append_rows(self, transactions: list[Transaction]) -> None:
+        """
+        Adds rows to the end of the table. Row i of the table always shows
+        the i-th displayed transaction.
+        """
+        self._transactions.extend(transactions)
+        self._rows_changed()
+
+    def clear(self) -> None:
+        self._transactions = []
+        self._rows_changed()
+
     def update_current_row(self, trx: Transaction) -> None:
         self.update_row_by_index(self.cursor_coordinate.row, trx)
 
     def update_row_by_index(self, index: int, trx: Transaction) -> None:
-        for col_index, field in enumerate(FIELDS_TO_DISPLAY):
-            value = getattr(trx, field)()
-            self.update_cell_at((index, col_index), value)
+        self._transactions[index] = trx
+        self.refresh()
+
+    def remove_row_at(self, index: int) -> None:
+        del self._transactions[index]
+        self._rows_changed()
+
+    def get_cell_at(self, coordinate) -> object:
+        row, column = coordinate
+        return getattr(self._transactions[row], FIELDS_TO_DISPLAY[column])()
 
     def get_current_transaction_index(self) -> int:
         if self.row_count == 0:
             raise ValueError("No rows in the table")
-        row_key = self.coordinate_to_cell_key(self.cursor_coordinate).row_key
-        return int(row_key.value)
+        return self.cursor_coordinate.row
+
+    def move_cursor(self, *, row: int | None = None, column: int | None = None,
+                    animate: bool = False, scroll: bool = True) -> None:
+        # pylint: disable=unused-argument
+        if row is not None:
+            self.cursor_coordinate = Coordinate(row, 0)
+
+    def validate_cursor_coordinate(self, value) -> Coordinate:
+        row = min(max(Coordinate(*value).row, 0), max(self.row_count - 1, 0))
+        return Coordinate(row, 0)
+
+    def watch_cursor_coordinate(self) -> None:
+        self._scroll_to_cursor()
+        self.refresh()
+        self._post_highlight()
+
+    def _rows_changed(self) -> None:
+        self.virtual_size = Size(self._row_width, self.row_count + 1)
+        # Clamp the cursor; the row under it may also have changed
+        cursor = self.validate_cursor_coordinate(self.cursor_coordinate)
+        if cursor != self.cursor_coordinate:
+            self.cursor_coordinate = cursor
+        else:
+            self._post_highlight()
+        self.refresh()
+
+    def _post_highlight(self) -> None:
+        if self._transactions:
+            self.post_message(self.RowHighlighted(self, self.cursor_coordinate.row))
+
+    def _visible_rows(self) -> int:
+        # The first line is taken by the header
+        return max(self.size.height - 1, 1)
+
+    def _scroll_to_cursor(self) -> None:
+        row = self.cursor_coordinate.row
+        top = round(self.scroll_offset.y)
+        if row < top:
+            self.scroll_to(y=row, animate=False)
+        elif row >= top + self._visible_rows():
+            self.scroll_to(y=row - self._visible_rows() + 1, animate=False)
+
+    def action_cursor_up(self) -> None:
+        self.move_cursor(row=self.cursor_coordinate.row - 1)
+
+    def action_cursor_down(self) -> None:
+        self.move_cursor(row=self.cursor_coordinate.row + 1)
+
+    def action_page_cursor_up(self) -> None:
+        self.move_cursor(row=self.cursor_coordinate.row - self._visible_rows())
+
+    def action_page_cursor_down(self) -> None:
+        self.move_cursor(row=self.cursor_coordinate.row + self._visible_rows())
+
+    def action_cursor_home(self) -> None:
+        self.move_cursor(row=0)
+
+    def action_cursor_end(self) -> None:
+        self.move_cursor(row=self.row_count - 1)
+
+    def on_click(self, event: events.Click) -> None:
+        offset = event.get_content_offset(self)
+        if offset is None or offset.y == 0:
+            return
+        row = round(self.scroll_offset.y) + offset.y - 1
+        if row < self.row_count:
+            self.move_cursor(row=row)
+
+    def render_line(self, y: int) -> Strip:
+        scroll_x, scroll_y = self.scroll_offset
+        width = self.size.width
+        base_style = self.rich_style
+
+        if y == 0:
+            cells = [name for name, _ in COLUMNS]
+            style = base_style + self.get_component_rich_style("transaction-table--header")
+        else:
+            index = round(scroll_y) + y - 1
+            if index >= self.row_count:
+                return Strip.blank(width, base_style)
+            trx = self._transactions[index]
+            cells = [getattr(trx, field)() for field in FIELDS_TO_DISPLAY]
+            style = base_style
+            if self.zebra_stripes and index % 2 == 0:
+                style += self.get_component_rich_style("transaction-table--even-row")
+            if index == self.cursor_coordinate.row:
+                style += self.get_component_rich_style("transaction-table--cursor")
+
+        pad = " " * CELL_PADDING
+        text = "".join(
+            pad + _fit(str(value).replace("\n", " "), column_width,
+                       right=isinstance(value, (int, float))) + pad
+            for value, (_, column_width) in zip(cells, COLUMNS)
+        )
+        strip = Strip([Segment(text, style)], self._row_width)
+        strip = strip.extend_cell_length(scroll_x + width, style)
+        return strip.crop(scroll_x, scroll_x + width)
 
 class TransactionDetails(Vertical):
     def compose(self) -> ComposeResult:
@@ -73,13 +277,16 @@ class TransactionDetails(Vertical):
 
     def update_transaction(self, trx: Transaction, linked_trx: Transaction | None = None) -> None:
         self.query_one("#det-date", Static).update(str(trx.date()))
-        self.query_one("#det-desc", Static).update(trx.raw.name())
-        self.query_one("#det-amt", Static).update(str(trx.raw.amount()))
+        self.query_one("#det-desc", Static).update(trx.name())
+        self.query_one("#det-amt", Static).update(str(trx.amount()))
         self.query_one("#det-category", Static).update(trx.category())
         self.query_one("#det-pot-category", Static).update(trx.pot_category())
 
         if trx.link() == Transaction.MANUAL_LINK_ID:
             link_text = "Manually Linked"
+        elif Transaction.LINK_SEPARATOR in trx.link():
+            count = len(trx.link().split(Transaction.LINK_SEPARATOR))
+            link_text = f"Group of {count} transactions"
         elif linked_trx:
             link_text = f"{linked_trx.name()} ({linked_trx.amount()}) - {linked_trx.date()}"
         elif trx.link():
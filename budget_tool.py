@@ -1,18 +1,77 @@
 #!/usr/bin/env python3
 
 import argparse
+import sys
 
-from budget.main import BudgetApp
+from budget import iter_transactions, save_transactions
+from budget.report import REPORT_FORMATS, build_report, write_report
+from budget.rules import DEFAULT_RULES_PATH, apply_rules, load_rules
 
-def parse_args():
+def add_rules_argument(parser, default):
+    parser.add_argument('--rules', default=default,
+                        help=f'categorisation rules file (default: {DEFAULT_RULES_PATH})')
+
+def parse_args(argv=None):
     arg_parse = argparse.ArgumentParser()
     arg_parse.add_argument('--file', '-f', required=False)
-    return arg_parse.parse_args()
+    add_rules_argument(arg_parse, default=str(DEFAULT_RULES_PATH))
+
+    commands = arg_parse.add_subparsers(dest='command')
+    report = commands.add_parser(
+        'report', help="print a file's income, category and pot totals without the TUI")
+    report.add_argument('data_file', metavar='FILE')
+    report.add_argument('--format', choices=REPORT_FORMATS, default='json')
+    report.add_argument('--output', '-o', help='write to this file instead of stdout')
+    report.add_argument('--categorise', action='store_true',
+                        help='categorise uncategorised rows with the rules file first')
+    # Accepted after the command too; SUPPRESS keeps the top-level default
+    add_rules_argument(report, default=argparse.SUPPRESS)
+
+    categorise = commands.add_parser(
+        'categorise', help='categorise the uncategorised rows of a file with the rules file')
+    categorise.add_argument('data_file', metavar='FILE')
+    categorise.add_argument('--output', '-o', required=True,
+                            help='processed CSV to write the categorised rows to')
+    add_rules_argument(categorise, default=argparse.SUPPRESS)
+    return arg_parse.parse_args(argv)
+
+def run_report(args) -> int:
+    try:
+        rules = load_rules(args.rules) if args.categorise else None
+        report = build_report(args.data_file, rules)
+    except (ValueError, IOError) as e:
+        print(f"Error reading {args.data_file}: {e}", file=sys.stderr)
+        return 1
+
+    if args.output:
+        with open(args.output, 'w', newline='', encoding='utf-8') as out:
+            write_report(report, out, args.format)
+    else:
+        write_report(report, sys.stdout, args.format)
+    return 0
+
+def run_categorise(args) -> int:
+    try:
+        rules = load_rules(args.rules)
+        # Streamed straight from one file to the other, a row at a time
+        save_transactions(args.output, apply_rules(rules, iter_transactions(args.data_file)))
+    except (ValueError, IOError) as e:
+        print(f"Error categorising {args.data_file}: {e}", file=sys.stderr)
+        return 1
+    return 0
 
 def main():
     args = parse_args()
 
-    app = BudgetApp(file_path=args.file)
+    if args.command == 'report':
+        sys.exit(run_report(args))
+    if args.command == 'categorise':
+        sys.exit(run_categorise(args))
+
+    # Only the TUI needs Textual, so headless commands don't wait for it to load
+    from budget.main import BudgetApp  # pylint: disable=import-outside-toplevel
+
+    app = BudgetApp(file_path=args.file, rules_path=args.rules)
     app.run()
 
 
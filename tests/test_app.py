@@ -1,12 +1,16 @@
+import threading
+import unittest.mock
 import pytest
 # pylint: disable=duplicate-code
 from textual.coordinate import Coordinate
-from budget.main import BudgetApp
+from budget.main import BudgetApp, _DisplayPositions
 from budget.screens import SaveOrLoadScreen
 from budget.widgets import TransactionTable, TransactionDetails
 from budget.transaction import Transaction
 from budget.raw_transaction import RawTransaction
+from budget.transaction_store import TransactionStore
 from . import utils
+from .test_data_io import create_csv
 
 @pytest.mark.asyncio
 async def test_app_load_transactions():
@@ -155,3 +159,155 @@ async def test_app_clear_data_save_success():
         # Data should be cleared
         assert not app.transactions
         assert app.query_one(TransactionTable).row_count == 0
+
+@pytest.mark.asyncio
+async def test_edit_during_background_save_keeps_unsaved_changes():
+    mock_trxs = [Transaction(RawTransaction(utils.mock_raw_trx_data()))]
+    release = threading.Event()
+
+    def slow_save(*_args, **_kwargs):
+        release.wait(5)
+
+    async with utils.run_app_with_mock_data(mock_trxs) as (app, pilot, _):
+        with unittest.mock.patch("budget.main.save_transactions", side_effect=slow_save):
+            app.unsaved_changes = True
+            app._save("out.csv")  # pylint: disable=protected-access
+            await pilot.pause()
+
+            # The UI keeps working while the save is in flight
+            await pilot.press("g")
+            assert mock_trxs[0].category() == "Groceries"
+
+            release.set()
+            await app.workers.wait_for_complete()
+            await pilot.pause()
+
+        assert app.unsaved_changes is True
+
+@pytest.mark.asyncio
+async def test_background_save_clears_unsaved_changes():
+    mock_trxs = [Transaction(RawTransaction(utils.mock_raw_trx_data()))]
+
+    async with utils.run_app_with_mock_data(mock_trxs, mock_save=True) as (app, pilot, mock_save):
+        app.unsaved_changes = True
+        app._save("out.csv")  # pylint: disable=protected-access
+        await app.workers.wait_for_complete()
+        await pilot.pause()
+
+        mock_save.assert_called_once()
+        assert app.unsaved_changes is False
+
+@pytest.mark.asyncio
+async def test_stream_transactions_fills_table_in_batches(tmp_path):
+    rows = [utils.mock_raw_trx_data(Name=f"T{i}", **{"Transaction ID": str(i)})
+            for i in range(250)]
+    csv_file = create_csv(tmp_path, list(rows[0].keys()), rows)
+
+    app = BudgetApp()
+    async with app.run_test() as pilot:
+        app.stream_transactions(csv_file)
+        await app.workers.wait_for_complete()
+        await pilot.pause()
+
+        assert isinstance(app.transactions, TransactionStore)
+        assert [t.name() for t in app.transactions] == [f"T{i}" for i in range(250)]
+        table = app.query_one(TransactionTable)
+        assert table.row_count == 250
+        assert table.get_cell_at(Coordinate(249, 2)) == "T249"
+        assert app.query_one("#load-status").display is False
+
+@pytest.mark.asyncio
+async def test_load_transactions_fills_store(tmp_path):
+    rows = [utils.mock_raw_trx_data(Name=f"T{i}", **{"Transaction ID": str(i)})
+            for i in range(3)]
+    csv_file = create_csv(tmp_path, list(rows[0].keys()), rows)
+
+    app = BudgetApp()
+    async with app.run_test() as pilot:
+        assert app.load_transactions(csv_file)
+        assert isinstance(app.transactions, TransactionStore)
+
+        table = app.query_one(TransactionTable)
+        assert table.row_count == 3
+        table.move_cursor(row=1)
+        await pilot.press("t")
+        await pilot.pause()
+
+        assert app.transactions[1].category() == "Transport"
+        assert app.unsaved_changes is True
+
+@pytest.mark.asyncio
+async def test_cancelled_load_discards_partial_data():
+    first = [Transaction(RawTransaction(utils.mock_raw_trx_data(Name="First")))]
+    second = [Transaction(RawTransaction(utils.mock_raw_trx_data(Name="Second")))]
+    release = threading.Event()
+
+    def slow_batches(_file_path):
+        yield first
+        release.wait(5)
+        yield second
+
+    app = BudgetApp()
+    async with app.run_test() as pilot:
+        with unittest.mock.patch("budget.main.iter_batches", side_effect=slow_batches):
+            app.stream_transactions("big.csv")
+            while not app.transactions:
+                await pilot.pause()
+
+            # The first rows are usable while the rest is still loading
+            assert app.query_one(TransactionTable).row_count == 1
+            assert "1 rows" in str(app.query_one("#load-status").render())
+
+            await pilot.press("escape")
+            release.set()
+            await app.workers.wait_for_complete()
+            await pilot.pause()
+
+        assert not app.transactions
+        assert app.query_one(TransactionTable).row_count == 0
+
+@pytest.mark.asyncio
+async def test_find_transaction_by_id_follows_reload():
+    first = [Transaction(RawTransaction(utils.mock_raw_trx_data(**{"Transaction ID": "a"})))]
+    second = [Transaction(RawTransaction(utils.mock_raw_trx_data(**{"Transaction ID": "b"})))]
+
+    async with utils.run_app_with_mock_data(first) as (app, _, _):
+        # pylint: disable=protected-access
+        assert app._find_transaction_by_id("a") is first[0]
+
+        app.transactions = second
+        assert app._find_transaction_by_id("a") is None
+        assert app._find_transaction_by_id("b") is second[0]
+
+        app._clear_internal()
+        assert app._find_transaction_by_id("b") is None
+
+def test_display_positions_follow_appends_and_removals():
+    shown = [0, 2, 3, 5, 8, 9, 11, 12, 13, 20]
+    positions = _DisplayPositions(shown[:6])
+    positions.extend(shown[6:])
+
+    for index in (7, 0, 3, 3, 5, 0):
+        positions.remove_at(index)
+        removed = shown.pop(index)
+        assert positions.index(removed) is None
+    positions.extend([21, 22])
+    shown += [21, 22]
+    positions.remove_at(len(shown) - 1)
+    shown.pop()
+
+    for index, position in enumerate(shown):
+        assert positions.index(position) == index
+    assert positions.index(1) is None
+
+@pytest.mark.asyncio
+async def test_partner_rows_with_duplicate_ids_are_found_by_position():
+    trxs = [Transaction(RawTransaction(utils.mock_raw_trx_data(**{"Transaction ID": "dup"})))
+            for _ in range(3)]
+    async with utils.run_app_with_mock_data(trxs) as (app, _, _):
+        # pylint: disable=protected-access
+        app._display_positions.remove_at(0)
+        del app.displayed_transactions[0]
+        assert app._displayed_index(trxs[0]) is None
+        assert app._displayed_index(trxs[1]) == 0
+        assert app._displayed_index(trxs[2]) == 1
@@ -0,0 +1,139 @@
+import os
+import unittest.mock
+
+import budget
+from budget import cache
+from . import utils
+from .test_data_io import create_csv
+
+def make_session(tmp_path):
+    rows = [
+        utils.mock_raw_trx_data(Name="T1", **{"Transaction ID": "1",
+                                              "bt_category": "Groceries", "bt_excluded": ""}),
+        utils.mock_raw_trx_data(Name="T2", Date="2025-01-02",
+                                **{"Transaction ID": "2", "bt_category": "",
+                                   "bt_excluded": "True"}),
+    ]
+    return create_csv(tmp_path, list(rows[0].keys()), rows)
+
+def test_load_writes_sidecar_cache(tmp_path):
+    csv_file = make_session(tmp_path)
+
+    budget.load_data(csv_file)
+
+    assert os.path.exists(cache.cache_path(csv_file))
+
+def test_unchanged_file_loads_from_cache(tmp_path):
+    csv_file = make_session(tmp_path)
+    expected = budget.load_data(csv_file)
+
+    with unittest.mock.patch("budget.import_data.iter_transactions") as parse_mock:
+        loaded = budget.load_data(csv_file)
+
+    parse_mock.assert_not_called()
+    assert loaded == expected
+    assert loaded[0].category() == "Groceries"
+    assert loaded[1].excluded() is True
+    assert loaded[0].raw.to_dict() == expected[0].raw.to_dict()
+
+def test_modified_file_invalidates_cache(tmp_path):
+    csv_file = make_session(tmp_path)
+    budget.load_data(csv_file)
+
+    trxs = budget.load_data(csv_file)
+    trxs[0].set_category("Transport")
+    budget.save_transactions(csv_file, trxs)
+
+    assert budget.load_data(csv_file)[0].category() == "Transport"
+
+def test_same_size_and_mtime_skips_hashing(tmp_path):
+    csv_file = make_session(tmp_path)
+    budget.load_data(csv_file)
+
+    with unittest.mock.patch("budget.cache._sha256") as hash_mock, \
+            unittest.mock.patch("budget.import_data.iter_transactions") as parse_mock:
+        budget.load_data(csv_file)
+
+    hash_mock.assert_not_called()
+    parse_mock.assert_not_called()
+
+def test_touched_file_with_same_content_keeps_cache(tmp_path):
+    csv_file = make_session(tmp_path)
+    budget.load_data(csv_file)
+    stat = os.stat(csv_file)
+    os.utime(csv_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    with unittest.mock.patch("budget.import_data.iter_transactions") as parse_mock:
+        budget.load_data(csv_file)
+
+    parse_mock.assert_not_called()
+
+    # The cache takes on the new mtime, so the next open trusts it again
+    with unittest.mock.patch("budget.cache._sha256") as hash_mock, \
+            unittest.mock.patch("budget.import_data.iter_transactions") as parse_mock:
+        assert len(budget.load_data(csv_file)) == 2
+
+    hash_mock.assert_not_called()
+    parse_mock.assert_not_called()
+
+def test_same_size_new_mtime_and_different_content(tmp_path):
+    csv_file = make_session(tmp_path)
+    budget.load_data(csv_file)
+    stat = os.stat(csv_file)
+
+    with open(csv_file, "r", encoding="utf-8") as fh:
+        content = fh.read()
+    with open(csv_file, "w", encoding="utf-8") as fh:
+        fh.write(content.replace("Groceries", "Groceriez"))
+    os.utime(csv_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert budget.load_data(csv_file)[0].category() == "Groceriez"
+
+def test_corrupt_cache_falls_back_to_csv(tmp_path):
+    csv_file = make_session(tmp_path)
+    with open(cache.cache_path(csv_file), "wb") as fh:
+        fh.write(b"not a cache")
+
+    assert len(budget.load_data(csv_file)) == 2
+
+def test_iter_batches_caches_rows_as_parsed(tmp_path):
+    csv_file = make_session(tmp_path)
+
+    batches = []
+    for batch in budget.iter_batches(csv_file, first_batch=1, batch_size=1):
+        # Edits made while loading are unsaved, so must not reach the cache
+        batch[0].set_category("Transport")
+        batches.append(batch)
+
+    assert [len(b) for b in batches] == [1, 1]
+    with unittest.mock.patch("budget.import_data.iter_transactions") as parse_mock:
+        loaded = budget.load_data(csv_file)
+    parse_mock.assert_not_called()
+    assert loaded[0].category() == "Groceries"
+
+def test_iter_batches_reads_cache_one_batch_at_a_time(tmp_path):
+    csv_file = make_session(tmp_path)
+    with unittest.mock.patch("budget.cache.CACHE_BATCH_SIZE", 1):
+        budget.load_data(csv_file)
+
+    with unittest.mock.patch("budget.cache.from_columns",
+                             wraps=cache.from_columns) as decode_mock:
+        batches = budget.iter_batches(csv_file, first_batch=1, batch_size=1)
+        first = next(batches)
+        assert decode_mock.call_count == 1
+        rest = list(batches)
+
+    assert [t.id() for t in first + rest[0]] == ["1", "2"]
+
+def test_truncated_cache_falls_back_to_csv_part_way(tmp_path):
+    csv_file = make_session(tmp_path)
+    with unittest.mock.patch("budget.cache.CACHE_BATCH_SIZE", 1):
+        budget.load_data(csv_file)
+    with open(cache.cache_path(csv_file), "r+b") as fh:
+        fh.truncate(os.path.getsize(cache.cache_path(csv_file)) - 12)
+
+    rows = [t for batch in budget.iter_batches(csv_file) for t in batch]
+
+    assert [t.id() for t in rows] == ["1", "2"]
+    assert rows[1].excluded() is True
+    assert len(budget.load_data(csv_file)) == 2
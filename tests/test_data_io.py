@@ -126,3 +126,126 @@ def test_round_trip(tmp_path):
     assert loaded_trx.pot_category() == "RoundTripPot"
     assert loaded_trx.status() == "Done"
     assert loaded_trx.excluded() is True
+
+def test_iter_transactions_yields_rows_lazily(tmp_path):
+    rows = [utils.mock_raw_trx_data(Name=f"T{i}", **{"Transaction ID": str(i)}) for i in range(3)]
+    csv_file = create_csv(tmp_path, list(rows[0].keys()), rows)
+
+    it = budget.iter_transactions(csv_file)
+
+    assert not isinstance(it, list)
+    first = next(it)
+    assert first.name() == "T0"
+    assert [t.name() for t in it] == ["T1", "T2"]
+
+def test_iter_transactions_missing_field_raises(tmp_path):
+    row_data = utils.mock_raw_trx_data()
+    del row_data["Amount"]
+    csv_file = create_csv(tmp_path, list(row_data), [row_data])
+
+    with pytest.raises(ValueError, match="Missing fields: Amount"):
+        list(budget.iter_transactions(csv_file))
+
+def test_save_reports_progress(tmp_path):
+    trxs = [budget.Transaction(budget.RawTransaction(utils.mock_raw_trx_data()))
+            for _ in range(5)]
+    calls = []
+
+    budget.save_transactions(tmp_path / "out.csv", trxs, progress=calls.append, progress_every=2)
+
+    assert calls == [2, 4, 5]
+
+def test_failed_save_leaves_existing_file_untouched(tmp_path):
+    csv_file = tmp_path / "out.csv"
+    good = budget.Transaction(budget.RawTransaction(utils.mock_raw_trx_data()))
+    budget.save_transactions(csv_file, [good])
+    original = csv_file.read_bytes()
+
+    class Broken:
+        def to_prefixed_dict(self):
+            raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        budget.save_transactions(csv_file, [good, Broken()])
+
+    assert csv_file.read_bytes() == original
+    assert [p.name for p in tmp_path.iterdir()] == ["out.csv"]
+
+def _monthly_csv(directory: Path, name: str, rows: list[dict]) -> str:
+    directory.mkdir(exist_ok=True)
+    fields = list(utils.mock_raw_trx_data().keys()) + ["bt_category", "bt_excluded"]
+    p = directory / name
+    with open(p, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fields, restval="")
+        writer.writeheader()
+        writer.writerows(rows)
+    return str(p)
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_load_many_merges_overlapping_files(tmp_path, max_workers):
+    months = tmp_path / "months"
+    _monthly_csv(months, "2025-02.csv", [
+        utils.mock_raw_trx_data(Date="03/02/2025", **{"Transaction ID": "c"}),
+        utils.mock_raw_trx_data(Date="31/01/2025", Time="10:00:00",
+                                **{"Transaction ID": "b", "bt_excluded": "True"}),
+    ])
+    _monthly_csv(months, "2025-01.csv", [
+        utils.mock_raw_trx_data(Date="31/01/2025", Time="10:00:00",
+                                **{"Transaction ID": "b", "bt_category": "Groceries"}),
+        utils.mock_raw_trx_data(Date="31/01/2025", Time="09:00:00",
+                                **{"Transaction ID": "a", "bt_category": "Transport"}),
+    ])
+
+    merged = budget.load_many(str(months / "*.csv"), max_workers=max_workers)
+
+    assert [t.id() for t in merged] == ["a", "b", "c"]
+    assert merged[0].category() == "Transport"
+    # Set values from either file survive the merge
+    assert merged[1].category() == "Groceries"
+    assert merged[1].excluded() is True
+
+def test_load_many_later_source_wins_conflicts(tmp_path):
+    first = _monthly_csv(tmp_path, "a.csv", [
+        utils.mock_raw_trx_data(**{"Transaction ID": "x", "bt_category": "Groceries"})])
+    second = _monthly_csv(tmp_path, "b.csv", [
+        utils.mock_raw_trx_data(**{"Transaction ID": "x", "bt_category": "Transport"})])
+
+    merged = budget.load_many([first, second], max_workers=1)
+
+    assert len(merged) == 1
+    assert merged[0].category() == "Transport"
+
+def test_load_reports_every_bad_cell(tmp_path):
+    rows = [
+        utils.mock_raw_trx_data(Date="not a date"),
+        utils.mock_raw_trx_data(),
+        utils.mock_raw_trx_data(Amount="abc", **{"Money Out": "x"}),
+    ]
+    csv_file = create_csv(tmp_path, list(rows[0].keys()), rows)
+
+    with pytest.raises(budget.DataValidationError) as exc_info:
+        budget.load_data(csv_file)
+
+    errors = [(line, field) for line, field, _, _ in exc_info.value.report.errors]
+    assert errors == [(2, "Date"), (4, "Amount"), (4, "Money Out")]
+    assert "3 invalid cell(s)" in str(exc_info.value)
+
+def test_iter_transactions_collects_into_given_report(tmp_path):
+    rows = [utils.mock_raw_trx_data(Amount="abc"), utils.mock_raw_trx_data()]
+    csv_file = create_csv(tmp_path, list(rows[0].keys()), rows)
+    report = budget.ValidationReport()
+
+    trxs = list(budget.iter_transactions(csv_file, report=report))
+
+    assert len(trxs) == 2
+    assert len(report) == 1
+
+def test_typed_columns_decoded_at_load(tmp_path):
+    row = utils.mock_raw_trx_data(**{"Money In": "", "Local amount": "-4.10"})
+    csv_file = create_csv(tmp_path, list(row.keys()), [row])
+
+    trx = budget.load_data(csv_file, use_cache=False)[0]
+
+    assert trx.raw.money_in() == 0.0
+    assert trx.raw.money_out() == -3.50
+    assert trx.raw.local_amount() == -4.10
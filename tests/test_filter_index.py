@@ -0,0 +1,67 @@
+import pytest
+
+from budget.filter_index import FilterIndex
+from budget.transaction_store import TransactionStore
+from . import utils
+
+def make_trxs():
+    trxs = [utils.make_trx(Name=f"T{i}") for i in range(5)]
+    trxs[0].set_category("Groceries")
+    trxs[1].set_category("Pot")
+    trxs[2].set_category("Pot")
+    trxs[2].set_link("T9")
+    trxs[3].set_excluded(True)
+    return trxs
+
+@pytest.mark.parametrize("filters, expected", [
+    (["All (Active)"], [0, 1, 2, 4]),
+    (["Excluded"], [3]),
+    (["Uncategorized"], [4]),
+    (["Categorized"], [0, 1, 2]),
+    (["Unlinked Pot"], [1]),
+    (["groceries", "Excluded"], [0, 3]),
+    ([], []),
+])
+def test_positions(filters, expected):
+    assert FilterIndex(make_trxs()).positions(filters) == expected
+
+def test_follows_edits():
+    trxs = make_trxs()
+    index = FilterIndex(trxs)
+
+    trxs[4].set_category("Groceries")
+    index.update(trxs[4])
+    trxs[0].set_excluded(True)
+    index.update(trxs[0])
+
+    assert index.positions(["Groceries"]) == [4]
+    assert index.positions(["Excluded"]) == [0, 3]
+    assert index.count("Uncategorized") == 0
+
+def test_counts_and_categories():
+    index = FilterIndex(make_trxs())
+
+    assert index.count("All (Active)") == 4
+    assert index.count("Pot") == 2
+    assert index.categories() == ["Groceries", "Pot"]
+
+def test_categories_include_excluded_rows():
+    trxs = make_trxs()
+    trxs[3].set_category("Holiday")
+    index = FilterIndex(trxs)
+    assert index.categories() == ["Groceries", "Holiday", "Pot"]
+
+    trxs[3].set_category("Travel")
+    index.update(trxs[3])
+    trxs[0].set_category("")
+    index.update(trxs[0])
+    assert index.categories() == ["Pot", "Travel"]
+
+def test_store_rows_are_tracked_by_position():
+    store = TransactionStore.from_transactions(make_trxs())
+    index = FilterIndex(store)
+
+    store[4].set_category("Transport")
+    index.update(store[4])
+
+    assert index.positions(["Transport"]) == [4]
@@ -70,3 +70,20 @@ async def test_filter_screen_select_all():
 
         assert "All (Active)" in app.filter_categories
         assert len(app.displayed_transactions) == 1
+
+@pytest.mark.asyncio
+async def test_filter_screen_shows_counts():
+    mock_trxs = utils.mock_transactions_for_filtering()
+
+    async with utils.run_app_with_mock_data(mock_trxs) as (app, pilot, _):
+        mock_trxs[0].set_category("Transport")
+        app.action_filter_menu()
+        await pilot.pause()
+
+        selection_list = app.screen.query_one(SelectionList)
+        prompts = {selection_list.get_option_at_index(i).value:
+                   str(selection_list.get_option_at_index(i).prompt)
+                   for i in range(selection_list.option_count)}
+        assert prompts["All (Active)"] == "All (Active) (3)"
+        assert prompts["Transport"] == "Transport (2)"
+        assert "Groceries" not in prompts
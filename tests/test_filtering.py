@@ -1,3 +1,4 @@
+import unittest.mock
 import pytest
 from textual.coordinate import Coordinate
 from budget.widgets import TransactionTable
@@ -261,3 +262,30 @@ async def test_auto_update_last_row_cursor_moves_up():
         
         # Sidebar should show T1
         assert str(app.query_one("#det-desc").render()) == "T1"
+
+@pytest.mark.asyncio
+async def test_edit_updates_rows_in_place():
+    t1 = Transaction(RawTransaction(utils.mock_raw_trx_data(
+        Name="T1", **{"Transaction ID": "1"})))
+    t2 = Transaction(RawTransaction(utils.mock_raw_trx_data(
+        Name="T2", **{"Transaction ID": "2"})))
+    t1.set_category("Pot")
+    t1.set_pot_category("Holidays")
+    t1.set_link("2")
+    t2.set_category("Pot")
+    t2.set_pot_category("Holidays")
+    t2.set_link("1")
+
+    async with utils.run_app_with_mock_data([t1, t2]) as (app, _, _):
+        table = app.query_one(TransactionTable)
+        table.move_cursor(row=0)
+
+        with unittest.mock.patch.object(table, "load_data") as rebuild:
+            app.action_clear_row_data()
+
+        rebuild.assert_not_called()
+        assert table.row_count == 2
+        # The cleared row and its former partner are both redrawn
+        assert table.get_cell_at(Coordinate(0, 5)) == ""
+        assert t2.link() == ""
+        assert table.get_cell_at(Coordinate(1, 6)) == "Holidays"
@@ -0,0 +1,19 @@
+from budget.id_index import IdIndex
+from . import utils
+
+def test_lookup_by_id():
+    trxs = [utils.make_trx(str(i)) for i in range(3)]
+    index = IdIndex(trxs)
+
+    assert index.get("1") is trxs[1]
+    assert index.get("missing") is None
+    assert "2" in index
+    assert len(index) == 3
+
+def test_first_occurrence_wins():
+    first, second = utils.make_trx("1", Name="First"), utils.make_trx("1", Name="Second")
+    index = IdIndex([first])
+
+    assert index.add(second) is first
+    assert index.get("1") is first
+    assert list(index) == [first]
@@ -0,0 +1,154 @@
+import csv
+import os
+
+import pytest
+
+import budget
+from budget.journal import EditJournal, journal_path
+from budget.main import BudgetApp
+from budget.transaction import save_transactions
+from . import utils
+from .test_data_io import create_csv
+
+def make_session(tmp_path):
+    rows = [utils.mock_raw_trx_data(Name=f"T{i}", **{"Transaction ID": str(i)}) for i in range(3)]
+    return create_csv(tmp_path, list(rows[0].keys()), rows)
+
+def track(csv_file, **kwargs):
+    trxs = budget.load_data(csv_file)
+    journal = EditJournal(csv_file, **kwargs)
+    for trx in trxs:
+        trx.set_observer(journal.record)
+    return trxs, journal
+
+def test_unflushed_changes_are_not_written(tmp_path):
+    csv_file = make_session(tmp_path)
+    trxs, journal = track(csv_file)
+
+    trxs[0].set_category("Groceries")
+
+    assert journal.pending == 1
+    assert not os.path.exists(journal_path(csv_file))
+    assert budget.load_data(csv_file)[0].category() == ""
+
+def test_flushed_changes_are_replayed_on_load(tmp_path):
+    csv_file = make_session(tmp_path)
+    with open(csv_file, "rb") as fh:
+        original = fh.read()
+    trxs, journal = track(csv_file)
+
+    trxs[1].set_category("Pot")
+    trxs[1].set_link("2")
+    trxs[2].set_excluded(True)
+    trxs[1].set_category("Groceries")
+    journal.flush()
+
+    with open(csv_file, "rb") as fh:
+        assert fh.read() == original
+    for loader in (budget.load_data, lambda f: list(budget.iter_transactions(f))):
+        loaded = loader(csv_file)
+        assert loaded[1].category() == "Groceries"
+        assert loaded[1].link() == "2"
+        assert loaded[2].excluded() is True
+
+def test_torn_last_line_is_ignored(tmp_path):
+    csv_file = make_session(tmp_path)
+    trxs, journal = track(csv_file)
+    trxs[0].set_category("Groceries")
+    journal.flush()
+    with open(journal_path(csv_file), "a", encoding="utf-8") as fh:
+        fh.write('{"id": "1", "field": "categ')
+
+    loaded = budget.load_data(csv_file)
+
+    assert loaded[0].category() == "Groceries"
+    assert loaded[1].category() == ""
+
+def test_save_compacts_into_csv(tmp_path):
+    csv_file = make_session(tmp_path)
+    trxs, journal = track(csv_file, compact_after=2)
+
+    trxs[0].set_category("Groceries")
+    journal.save(trxs)
+    assert os.path.exists(journal_path(csv_file))
+
+    trxs[1].set_category("Transport")
+    journal.save(trxs)
+
+    assert not os.path.exists(journal_path(csv_file))
+    with open(csv_file, encoding="utf-8") as fh:
+        rows = list(csv.DictReader(fh))
+    assert [r["bt_category"] for r in rows] == ["Groceries", "Transport", ""]
+
+def test_full_save_discards_journal(tmp_path):
+    csv_file = make_session(tmp_path)
+    trxs, journal = track(csv_file)
+    trxs[0].set_category("Groceries")
+    journal.flush()
+
+    fresh = budget.load_data(csv_file)
+    for trx in fresh:
+        trx.set_category("")
+    save_transactions(csv_file, fresh)
+
+    assert not os.path.exists(journal_path(csv_file))
+    assert budget.load_data(csv_file)[0].category() == ""
+
+def test_journal_is_ignored_once_csv_is_rewritten(tmp_path):
+    csv_file = make_session(tmp_path)
+    trxs, journal = track(csv_file)
+    trxs[0].set_category("Groceries")
+    journal.flush()
+
+    # Rewritten by something that doesn't know about the journal
+    with open(csv_file, "a", encoding="utf-8", newline="") as fh:
+        fh.write("\n")
+
+    assert budget.load_data(csv_file)[0].category() == ""
+
+    # Further edits start a new journal against the CSV as it is now
+    trxs, journal = track(csv_file)
+    trxs[1].set_category("Transport")
+    journal.flush()
+    loaded = budget.load_data(csv_file)
+    assert loaded[0].category() == ""
+    assert loaded[1].category() == "Transport"
+
+@pytest.mark.asyncio
+async def test_app_save_to_loaded_file_appends_to_journal(tmp_path):
+    csv_file = make_session(tmp_path)
+    with open(csv_file, "rb") as fh:
+        original = fh.read()
+
+    app = BudgetApp()
+    async with app.run_test():
+        app.load_transactions(csv_file)
+        app.transactions[0].set_category("Groceries")
+        app._save(csv_file)  # pylint: disable=protected-access
+
+    with open(csv_file, "rb") as fh:
+        assert fh.read() == original
+    assert budget.load_data(csv_file)[0].category() == "Groceries"
+
+@pytest.mark.asyncio
+async def test_app_save_over_file_with_journal_discards_it(tmp_path):
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    file_a = make_session(tmp_path / "a")
+    file_b = make_session(tmp_path / "b")
+    trxs, journal = track(file_b)
+    trxs[0].set_category("Transport")
+    trxs[1].set_category("Bills")
+    journal.flush()
+
+    app = BudgetApp()
+    async with app.run_test():
+        app.load_transactions(file_a)
+        app.transactions[0].set_category("Groceries")
+        app._save(file_b)  # pylint: disable=protected-access
+        await app.workers.wait_for_complete()
+
+    assert not os.path.exists(journal_path(file_b))
+    loaded = budget.load_data(file_b)
+    assert loaded[0].category() == "Groceries"
+    assert loaded[1].category() == ""
@@ -0,0 +1,82 @@
+import time
+
+import pytest
+from budget.link_graph import check_links, repair_links
+from budget.pot_linking import link_group, link_pair
+from budget.transaction import Transaction
+from . import utils
+
+def test_consistent_links_pass():
+    spend, transfer = utils.make_trx("s1"), utils.make_trx("t1")
+    link_pair(spend, transfer)
+    group = [utils.make_trx("s2"), utils.make_trx("s3")]
+    target = utils.make_trx("t2")
+    link_group(target, group)
+    manual = utils.make_trx("m1", link=Transaction.MANUAL_LINK_ID)
+
+    report = check_links([spend, transfer, target, manual, *group])
+
+    assert not report
+    assert not report.collisions
+
+def test_reports_orphans_and_one_sided_links():
+    orphan = utils.make_trx("s1", link="gone")
+    one_sided = utils.make_trx("s2", link="t2")
+    partner = utils.make_trx("t2")
+    manual_partner = utils.make_trx("t3", link=Transaction.MANUAL_LINK_ID)
+    pointing_at_manual = utils.make_trx("s3", link="t3")
+
+    report = check_links([orphan, one_sided, partner, manual_partner, pointing_at_manual])
+
+    assert report.orphans == [(orphan, "gone")]
+    assert report.asymmetric == [(one_sided, "t2"), (pointing_at_manual, "t3")]
+    assert len(report) == 3
+    assert report.summary() == "3 broken link(s): 1 dangling, 2 one-sided"
+
+def test_reports_collisions():
+    transfer = utils.make_trx("t1", link="s1")
+    first, second = utils.make_trx("s1", link="t1"), utils.make_trx("s2", link="t1")
+
+    report = check_links([transfer, first, second])
+
+    assert report.collisions == {"t1": [first, second]}
+    assert report.asymmetric == [(second, "t1")]
+
+def test_repair_keeps_links_that_hold():
+    target = utils.make_trx("t1", link="s1,s2,gone")
+    members = [utils.make_trx("s1", link="t1"), utils.make_trx("s2", link="t1")]
+    stray = utils.make_trx("s3", link="t1")
+
+    changed = repair_links(check_links([target, stray, *members]))
+
+    assert changed == [target, stray]
+    assert target.link() == "s1,s2"
+    assert stray.link() == ""
+    assert not check_links([target, stray, *members])
+
+def test_check_scales_to_large_sessions():
+    trxs = []
+    for i in range(50000):
+        spend, transfer = utils.make_trx(f"s{i}"), utils.make_trx(f"t{i}")
+        link_pair(spend, transfer)
+        trxs += [spend, transfer, utils.make_trx(f"u{i}")]
+
+    start = time.perf_counter()
+    report = check_links(trxs)
+
+    assert not report
+    assert time.perf_counter() - start < 1
+
+@pytest.mark.asyncio
+async def test_app_repairs_broken_links():
+    spend = utils.make_trx("s1", link="t1")
+    transfer = utils.make_trx("t1")
+
+    async with utils.run_app_with_mock_data([spend, transfer]) as (app, pilot, _):
+        assert app.unsaved_changes is False
+
+        await pilot.press("R")
+        await pilot.pause()
+
+        assert spend.link() == ""
+        assert app.unsaved_changes is True
@@ -1,6 +1,7 @@
 import pytest
 from budget.transaction import Transaction
 from budget.raw_transaction import RawTransaction
+from budget.pot_linking import PotTransferIndex
 from budget.screens.pot_transfer import PotTransferSelectScreen
 from . import utils
 
@@ -85,3 +86,66 @@ def test_clear_row_data_unlinks_partner():
 
     assert t1.link() == ""
     assert t2.link() == ""
+
+def test_pot_transfer_candidates_skip_linked_transfers():
+    current = create_transaction("0", -15.0)
+    t1 = create_transaction("1", 15.0, type="Pot transfer")
+    t2 = create_transaction("2", 15.0, type="Pot transfer")
+    t2.set_link("9")
+
+    screen = PotTransferSelectScreen(current, [current, t1, t2])
+
+    assert [t.id() for t in screen.candidates] == ["1"]
+
+def test_pot_transfer_index_follows_link_changes():
+    t1 = create_transaction("1", 15.0, type="Pot transfer")
+    t2 = create_transaction("2", 14.0, type="Pot transfer")
+    index = PotTransferIndex([t1, t2])
+
+    t1.set_link("9")
+    index.update(t1)
+    assert [t.id() for t in index.nearest(-1500)] == ["2"]
+
+    t1.set_link("")
+    index.update(t1)
+    assert [t.id() for t in index.nearest(-1500)] == ["1", "2"]
+
+def test_pot_transfer_index_leaves_out_excluded_transfers():
+    t1 = create_transaction("1", 15.0, type="Pot transfer")
+    t2 = create_transaction("2", 14.0, type="Pot transfer")
+    t2.set_excluded(True)
+    index = PotTransferIndex([t1, t2])
+    assert [t.id() for t in index.up_to(2000)] == ["1"]
+
+    t1.set_excluded(True)
+    index.update(t1)
+    t2.set_excluded(False)
+    index.update(t2)
+    assert [t.id() for t in index.up_to(2000)] == ["2"]
+
+@pytest.mark.asyncio
+async def test_pot_transfer_candidates_load_as_cursor_moves():
+    current = create_transaction("0", -15.0)
+    transfers = [create_transaction(str(i), float(i), name=f"T{i}", type="Pot transfer")
+                 for i in range(1, 201)]
+    screen = PotTransferSelectScreen(current, transfers)
+    app = utils.ScreenTestApp(screen)
+
+    async with app.run_test() as pilot:
+        table = screen.query_one("#candidate_table")
+        assert table.row_count == 50
+        assert table.get_cell_at((0, 1)) == "T15"
+
+        table.move_cursor(row=49)
+        await pilot.pause()
+
+        assert table.row_count == 100
+
+@pytest.mark.asyncio
+async def test_app_drops_excluded_transfers_from_candidates():
+    transfer = create_transaction("1", 15.0, type="Pot transfer")
+    async with utils.run_app_with_mock_data([transfer]) as (app, _, _):
+        # pylint: disable=protected-access
+        assert app._transfer_index.up_to(1500) == [transfer]
+        transfer.set_excluded(True)
+        assert app._transfer_index.up_to(1500) == []
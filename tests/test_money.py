@@ -0,0 +1,40 @@
+import pytest
+
+from budget.money import format_pence, to_pence
+from budget.raw_transaction import RawTransaction
+from . import utils
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("-3.50", -350),
+    ("2000.00", 200000),
+    ("0.10", 10),
+    ("+1.05", 105),
+    ("12", 1200),
+    ("-0.5", -50),
+    ("1.005", 100),
+    ("1.015", 102),
+])
+def test_to_pence(value, expected):
+    assert to_pence(value) == expected
+
+@pytest.mark.parametrize("value", ["", "abc", "1.2.3", "--1.00", "nan", "inf"])
+def test_to_pence_rejects_invalid(value):
+    with pytest.raises(ValueError, match="Invalid amount"):
+        to_pence(value)
+
+@pytest.mark.parametrize("pence, expected", [
+    (-350, "-3.50"),
+    (5, "0.05"),
+    (-5, "-0.05"),
+    (200000, "2000.00"),
+    (0, "0.00"),
+])
+def test_format_pence(pence, expected):
+    assert format_pence(pence) == expected
+
+def test_sum_of_amounts_is_exact():
+    trxs = [RawTransaction(utils.mock_raw_trx_data(Amount="0.10")) for _ in range(10)]
+
+    assert sum(t.amount_pence() for t in trxs) == 100
+    assert format_pence(sum(t.amount_pence() for t in trxs)) == "1.00"
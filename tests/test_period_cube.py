@@ -0,0 +1,86 @@
+import datetime
+import time
+
+import pytest
+from budget.period_cube import MONTH, WEEK, PeriodCube, period_of, period_start, period_label
+from budget.transaction_store import TransactionStore
+from . import utils
+
+GROCERIES = ("category", "Groceries")
+INCOME = ("income", "")
+
+def make_trxs():
+    return [
+        utils.make_trx(amount="-10.00", category="Groceries", Date="15/01/2024"),
+        utils.make_trx(amount="-20.00", category="Groceries", Date="01/03/2024"),
+        utils.make_trx(amount="-5.00", category="Transport", Date="31/03/2024"),
+        utils.make_trx(amount="1000.00", category="Groceries", income=True, Date="28/03/2024"),
+        utils.make_trx(amount="-7.00", category="Groceries", Date="10/01/2025"),
+    ]
+
+@pytest.mark.parametrize("by", [MONTH, WEEK])
+def test_period_round_trip(by):
+    date = datetime.date(2024, 3, 13)
+    start = period_start(period_of(date, by), by)
+
+    assert start <= date < start + datetime.timedelta(days=31)
+    assert period_of(start, by) == period_of(date, by)
+
+def test_labels():
+    assert period_label(period_of(datetime.date(2024, 3, 13))) == "Mar 2024"
+    assert period_label(period_of(datetime.date(2024, 3, 13), WEEK), WEEK) == "2024-W11"
+
+def test_range_totals():
+    cube = PeriodCube(make_trxs())
+    jan_24 = period_of(datetime.date(2024, 1, 1))
+
+    assert cube.bounds() == (jan_24, jan_24 + 12)
+    assert cube.total(GROCERIES, jan_24, jan_24 + 2) == -3000
+    assert cube.total(GROCERIES, jan_24 + 1, jan_24 + 1) == 0
+    assert cube.total(GROCERIES, jan_24 - 50, jan_24 + 50) == -3700
+    assert cube.totals(jan_24 + 2, jan_24 + 2) == {
+        GROCERIES: -2000, ("category", "Transport"): -500, INCOME: 100000}
+    assert cube.total_between(GROCERIES, datetime.date(2024, 3, 20),
+                              datetime.date(2025, 1, 1)) == -2700
+
+def test_follows_edits_and_earlier_rows():
+    trxs = make_trxs()
+    cube = PeriodCube(trxs[1:])
+    cube.extend([utils.make_trx(amount="-1.00", category="Groceries", Date="01/12/2023")])
+
+    trxs[1].set_excluded(True)
+    cube.update(trxs[1])
+
+    first, last = cube.bounds()
+    assert period_start(first) == datetime.date(2023, 12, 1)
+    assert cube.total(GROCERIES, first, last) == -800
+
+def test_weekly_totals():
+    cube = PeriodCube(make_trxs(), by=WEEK)
+    week = period_of(datetime.date(2024, 3, 31), WEEK)
+
+    assert cube.totals(week, week) == {("category", "Transport"): -500, INCOME: 100000}
+
+def test_store_rows_are_tracked_by_position():
+    store = TransactionStore.from_transactions(make_trxs())
+    cube = PeriodCube(store)
+
+    store[0].set_category("Transport")
+    cube.update(store[0])
+
+    jan_24 = period_of(datetime.date(2024, 1, 1))
+    assert cube.totals(jan_24, jan_24) == {("category", "Transport"): -1000}
+
+def test_queries_ten_years_quickly():
+    trxs = [utils.make_trx(amount="-1.00", category=f"Category {i % 20}",
+                           Date=f"{i % 28 + 1:02d}/{i % 12 + 1:02d}/{2015 + i % 10}")
+            for i in range(50000)]
+    cube = PeriodCube(trxs)
+    first, last = cube.bounds()
+
+    start = time.perf_counter()
+    for period in range(first, last + 1):
+        cube.totals(first, period)
+
+    assert time.perf_counter() - start < 0.5
+    assert sum(cube.totals(first, last).values()) == -5000000
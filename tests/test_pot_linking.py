@@ -0,0 +1,160 @@
+import time
+
+import pytest
+from budget.pot_linking import find_groupings, link_group, link_pair, propose_links, unlink_partners
+from budget.screens import AutoLinkScreen, PotGroupSelectScreen
+from budget.transaction import Transaction
+from . import utils
+
+POT_SPEND = {"category": "Pot", "pot_category": "Bills"}
+
+def test_pairs_equal_amounts_within_window():
+    spend = utils.make_trx("s1", "-12.34", **POT_SPEND)
+    other = utils.make_trx("s2", "-50.00", **POT_SPEND)
+    transfer = utils.make_trx("t1", "12.34", Type="Pot transfer")
+    decoy = utils.make_trx("t2", "12.35", Type="Pot transfer")
+
+    assert propose_links([spend, other, transfer, decoy]) == [(spend, transfer)]
+
+def test_respects_date_window():
+    spend = utils.make_trx("s1", "-10.00", **POT_SPEND, Date="10/01/2025")
+    transfer = utils.make_trx("t1", "10.00", Date="01/01/2025", Type="Pot transfer")
+
+    assert not propose_links([spend, transfer])
+    assert propose_links([spend, transfer], window_days=9) == [(spend, transfer)]
+
+def test_each_transfer_is_used_once():
+    spends = [utils.make_trx(f"s{i}", "-10.00", **POT_SPEND, Date=f"0{i + 1}/01/2025")
+              for i in range(3)]
+    transfers = [utils.make_trx(f"t{i}", "10.00", Date=f"0{i + 1}/01/2025", Type="Pot transfer")
+                 for i in range(2)]
+
+    pairs = propose_links(spends + transfers)
+
+    assert pairs == [(spends[0], transfers[0]), (spends[1], transfers[1])]
+
+def test_ignores_linked_and_uncategorised_rows():
+    linked = utils.make_trx("s1", "-10.00", **POT_SPEND)
+    linked.set_link(Transaction.MANUAL_LINK_ID)
+    not_pot = utils.make_trx("s2", "-10.00")
+    transfer = utils.make_trx("t1", "10.00", Type="Pot transfer")
+
+    assert not propose_links([linked, not_pot, transfer])
+
+def test_link_pair_is_bidirectional():
+    spend = utils.make_trx("s1", "-10.00", **POT_SPEND)
+    transfer = utils.make_trx("t1", "10.00", Type="Pot transfer")
+
+    link_pair(spend, transfer)
+
+    assert spend.link() == "t1"
+    assert transfer.link() == "s1"
+    assert transfer.category() == "Pot"
+    assert transfer.pot_category() == "Bills"
+
+def test_scales_to_tens_of_thousands():
+    trxs = []
+    for i in range(20000):
+        day = f"{i % 28 + 1:02d}/01/2025"
+        trxs.append(utils.make_trx(f"s{i}", f"-{i % 500}.{i % 100:02d}", **POT_SPEND, Date=day))
+        trxs.append(utils.make_trx(f"t{i}", f"{i % 500}.{i % 100:02d}", Date=day,
+                                   Type="Pot transfer"))
+
+    start = time.perf_counter()
+    pairs = propose_links(trxs)
+
+    assert len(pairs) == 20000
+    assert time.perf_counter() - start < 2
+
+@pytest.mark.asyncio
+async def test_auto_link_review_links_accepted_pairs():
+    spend = utils.make_trx("s1", "-12.34", **POT_SPEND)
+    transfer = utils.make_trx("t1", "12.34", Type="Pot transfer")
+
+    async with utils.run_app_with_mock_data([spend, transfer]) as (app, pilot, _):
+        await pilot.press("a")
+        await pilot.pause()
+        assert isinstance(app.screen, AutoLinkScreen)
+
+        await pilot.click("#link")
+        await pilot.pause()
+
+        assert spend.link() == "t1"
+        assert transfer.link() == "s1"
+        assert app.unsaved_changes is True
+
+def test_find_groupings_ranks_smaller_groups_first():
+    transfer = utils.make_trx("t1", "30.00", Type="Pot transfer")
+    spends = [utils.make_trx(f"s{i}", amount, **POT_SPEND)
+              for i, amount in enumerate(["-10.00", "-20.00", "-5.00", "-15.00", "-7.00"], 1)]
+
+    groups = find_groupings(transfer, spends)
+
+    assert [sorted(t.id() for t in g) for g in groups] == [
+        ["s1", "s2"], ["s1", "s3", "s4"]]
+
+def test_find_groupings_respects_window():
+    transfer = utils.make_trx("t1", "30.00", Date="01/03/2025", Type="Pot transfer")
+    near = utils.make_trx("s1", "-10.00", **POT_SPEND, Date="20/02/2025")
+    far = utils.make_trx("s2", "-20.00", **POT_SPEND, Date="01/01/2025")
+
+    assert not find_groupings(transfer, [near, far])
+    assert len(find_groupings(transfer, [near, far], window_days=60)) == 1
+
+def test_find_groupings_finds_groups_of_four():
+    transfer = utils.make_trx("t", "1000.00", Type="Pot transfer")
+    spends = [utils.make_trx(f"s{i}", f"-{i}.00", **POT_SPEND) for i in range(1, 150)]
+    spends += [utils.make_trx(f"g{i}", "-250.00", **POT_SPEND) for i in range(4)]
+
+    groups = find_groupings(transfer, spends)
+
+    assert any(sorted(t.id() for t in g) == ["g0", "g1", "g2", "g3"] for g in groups)
+
+def test_find_groupings_keeps_to_budget_with_equal_amounts():
+    # Every four of these add up to the transfer: C(150, 4) groups
+    transfer = utils.make_trx("t", "20.00", Type="Pot transfer")
+    spends = [utils.make_trx(f"s{i}", "-5.00", **POT_SPEND) for i in range(150)]
+
+    start = time.perf_counter()
+    groups = find_groupings(transfer, spends)
+
+    assert time.perf_counter() - start < 0.25
+    assert len(groups) == 20
+    assert all(len({t.id() for t in g}) == 4 for g in groups)
+
+def test_link_group_and_unlink_partners():
+    transfer = utils.make_trx("t1", "30.00", Type="Pot transfer")
+    spends = [utils.make_trx("s1", "-10.00", **POT_SPEND),
+              utils.make_trx("s2", "-20.00", **POT_SPEND)]
+    by_id = {t.id(): t for t in spends + [transfer]}
+
+    link_group(transfer, spends)
+
+    assert transfer.link() == "s1,s2"
+    assert [s.link() for s in spends] == ["t1", "t1"]
+    assert transfer.category() == "Pot"
+    assert transfer.pot_category() == "Bills"
+
+    assert unlink_partners(spends[0], by_id.get) == [transfer]
+    assert transfer.link() == "s2"
+
+    assert unlink_partners(transfer, by_id.get) == [spends[1]]
+    assert spends[1].link() == ""
+
+@pytest.mark.asyncio
+async def test_group_link_links_selected_group():
+    transfer = utils.make_trx("t1", "30.00", Type="Pot transfer")
+    spends = [utils.make_trx("s1", "-10.00", **POT_SPEND),
+              utils.make_trx("s2", "-20.00", **POT_SPEND)]
+
+    async with utils.run_app_with_mock_data([transfer] + spends) as (app, pilot, _):
+        await pilot.press("G")
+        await pilot.pause()
+        assert isinstance(app.screen, PotGroupSelectScreen)
+
+        await pilot.press("enter")
+        await pilot.pause()
+
+        assert transfer.link() == "s1,s2"
+        assert [s.link() for s in spends] == ["t1", "t1"]
+        assert app.unsaved_changes is True
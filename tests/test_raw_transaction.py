@@ -48,3 +48,31 @@ def test_equality_operator():
     trx3 = RawTransaction(row2)
 
     assert trx1 != trx3
+
+def test_compact_representation():
+    trx = RawTransaction(utils.mock_raw_trx_data())
+
+    assert not hasattr(trx, "__dict__")
+    # Accessors return stripped values while to_dict keeps the original
+    assert trx.id() == "tx123"
+    assert trx.to_dict()["Transaction ID"] == " tx123 "
+
+def test_extra_fields_kept_in_dict_and_equality():
+    row = utils.mock_raw_trx_data()
+    row["Extra"] = "value"
+
+    trx = RawTransaction(row)
+
+    assert trx.to_dict() == row
+    assert trx != RawTransaction(utils.mock_raw_trx_data())
+
+def test_local_and_money_fields():
+    row = utils.mock_raw_trx_data(**{"Local amount": "-4.20", "Local currency": "EUR",
+                                     "Money Out": "-3.50", "Money In": "1.00"})
+
+    trx = RawTransaction(row)
+
+    assert trx.local_amount() == -4.20
+    assert trx.local_currency() == "EUR"
+    assert trx.money_out() == -3.50
+    assert trx.money_in() == 1.00
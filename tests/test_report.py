@@ -0,0 +1,74 @@
+import csv
+import io
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import budget_tool
+from budget.report import build_report, write_report
+from budget.transaction import save_transactions
+from . import utils
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+def make_session(tmp_path):
+    path = str(tmp_path / "session.csv")
+    save_transactions(path, [
+        utils.make_trx("1", "-10.00", "Groceries"),
+        utils.make_trx("2", "-5.50", "Groceries"),
+        utils.make_trx("3", "-2.00"),
+        utils.make_trx("4", "2000.00", income=True),
+        utils.make_trx("5", "-200.00", "Pot", pot_category="Holidays"),
+        utils.make_trx("6", "-1.00", "Transport", excluded=True),
+    ])
+    return path
+
+def test_build_report(tmp_path):
+    path = make_session(tmp_path)
+
+    assert build_report(path) == {
+        "file": path,
+        "income": "2000.00",
+        "categories": {"Groceries": "-15.50", "Uncategorized": "-2.00"},
+        "pots": {"Holidays": "-200.00"},
+    }
+
+def test_write_csv(tmp_path):
+    out = io.StringIO()
+    write_report(build_report(make_session(tmp_path)), out, "csv")
+
+    assert list(csv.reader(io.StringIO(out.getvalue()))) == [
+        ["section", "name", "amount"],
+        ["income", "", "2000.00"],
+        ["categories", "Groceries", "-15.50"],
+        ["categories", "Uncategorized", "-2.00"],
+        ["pots", "Holidays", "-200.00"],
+    ]
+
+def test_cli_report_to_file(tmp_path):
+    path = make_session(tmp_path)
+    output = tmp_path / "report.json"
+
+    args = budget_tool.parse_args(["report", path, "--output", str(output)])
+
+    assert budget_tool.run_report(args) == 0
+    assert json.loads(output.read_text())["income"] == "2000.00"
+
+def test_cli_report_missing_file(tmp_path, capsys):
+    args = budget_tool.parse_args(["report", str(tmp_path / "missing.csv")])
+
+    assert budget_tool.run_report(args) == 1
+    assert "Error reading" in capsys.readouterr().err
+
+def test_report_does_not_import_textual(tmp_path):
+    path = make_session(tmp_path)
+    code = ("import sys, budget_tool; "
+            f"budget_tool.run_report(budget_tool.parse_args(['report', {path!r}])); "
+            "assert not any(m.startswith('textual') for m in sys.modules)")
+
+    result = subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT,
+                            capture_output=True, text=True, check=False)
+
+    assert result.returncode == 0, result.stderr
+    assert json.loads(result.stdout)["pots"] == {"Holidays": "-200.00"}
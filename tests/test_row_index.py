@@ -0,0 +1,32 @@
+from budget.filter_index import FilterIndex
+from budget.row_index import RowPositions
+from budget.summary_totals import SummaryTotals
+from budget.transaction_store import TransactionStore
+from . import utils
+
+def make_trxs():
+    return [utils.make_trx(str(i), "-1.00") for i in range(3)]
+
+def test_indexes_share_one_position_map():
+    trxs = make_trxs()
+    positions = RowPositions()
+    filters = FilterIndex(trxs[:2], positions)
+    totals = SummaryTotals(trxs[:2], positions)
+    filters.extend(trxs[2:])
+    totals.extend(trxs[2:])
+
+    assert [positions.get(t) for t in trxs] == [0, 1, 2]
+    trxs[2].set_category("Groceries")
+    filters.update(trxs[2])
+    totals.update(trxs[2])
+    assert filters.positions(["Groceries"]) == [2]
+    assert totals.category_totals() == {"Uncategorized": -200, "Groceries": -100}
+
+def test_store_rows_are_not_stored():
+    store = TransactionStore.from_transactions(make_trxs())
+    positions = RowPositions()
+    for position, row in enumerate(store):
+        positions.add(row, position)
+
+    assert positions.get(store[1]) == 1
+    assert positions.get(make_trxs()[0]) is None
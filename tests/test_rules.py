@@ -0,0 +1,122 @@
+import json
+import time
+
+import pytest
+import budget
+import budget_tool
+from budget.rules import RuleSet, Rule, load_rules
+from .test_report import make_session
+from . import utils
+
+def make_rules(*specs):
+    return RuleSet([Rule(spec) for spec in specs])
+
+def write_rules(tmp_path, *specs):
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps(list(specs)))
+    return str(path)
+
+def test_first_matching_rule_wins():
+    rules = make_rules(
+        {"name": "tesco mobile", "category": "Bills"},
+        {"name": "tesco", "category": "Groceries"},
+        {"name": "TESCO", "category": "General"},
+    )
+
+    assert rules.match(utils.make_trx(Name="Tesco Mobile Ltd")).category == "Bills"
+    assert rules.match(utils.make_trx(Name="TESCO STORES 2041")).category == "Groceries"
+    assert rules.match(utils.make_trx(Name="Aldi")) is None
+
+def test_shorter_and_overlapping_patterns_are_found():
+    rules = make_rules(
+        {"name": "tesco express", "max_amount": "-100.00", "category": "Holidays"},
+        {"name": "express", "category": "Transport"},
+        {"name": "sexpr", "category": "General"},
+        {"name": "tesco", "category": "Groceries"},
+    )
+
+    # "tesco express" is the longest match but its amount condition fails,
+    # so the rules for the patterns inside and overlapping it are tried
+    assert rules.match(utils.make_trx(Name="Tesco Express")).category == "Transport"
+
+def test_all_conditions_must_hold():
+    rules = make_rules(
+        {"description": "tfl", "monzo_category": "transport", "category": "Transport"},
+        {"notes": "#holiday", "min_amount": "-500", "max_amount": "-10.00",
+         "category": "Pot", "pot_category": "Holidays"},
+        {"monzo_category": "groceries", "category": "Groceries"},
+    )
+
+    holiday = {"Notes and #tags": "Hotel #holiday"}
+    assert rules.match(utils.make_trx(Description="TFL TRAVEL", Category="transport"))
+    assert rules.match(utils.make_trx(Description="TFL TRAVEL")) is None
+    assert rules.match(utils.make_trx(amount="-50.00", **holiday)).pot_category == "Holidays"
+    assert rules.match(utils.make_trx(amount="-5.00", **holiday)) is None
+    assert rules.match(utils.make_trx(Category="groceries")).category == "Groceries"
+
+def test_categorise_skips_categorised_and_excluded():
+    rules = make_rules({"name": "tesco", "category": "Pot", "pot_category": "Bills"})
+    fresh, categorised, excluded = (utils.make_trx(Name="Tesco") for _ in range(3))
+    categorised.set_category("General")
+    excluded.set_excluded(True)
+
+    assert [bool(rules.categorise(t)) for t in (fresh, categorised, excluded)] == [
+        True, False, False]
+    assert (fresh.category(), fresh.pot_category()) == ("Pot", "Bills")
+    assert categorised.category() == "General"
+    assert excluded.category() == ""
+
+@pytest.mark.parametrize("specs, message", [
+    ({"name": "x"}, "Invalid rule 1"),
+    ([{"name": "x", "category": "Groceries", "colour": "red"}], "unknown key"),
+    ([{"name": "x", "category": "General", "pot_category": "Bills"}], "only valid"),
+    ([{"name": 3, "category": "General"}], "must be a string"),
+    ([{"name": "x", "category": "General", "min_amount": "lots"}], "Invalid amount"),
+])
+def test_load_rules_rejects_bad_rules(tmp_path, specs, message):
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps(specs if isinstance(specs, list) else [1]))
+
+    with pytest.raises(ValueError, match=message):
+        load_rules(str(path))
+
+def test_thousands_of_rules_in_one_pass():
+    rules = make_rules(*({"name": f"merchant {i:04d}", "category": f"C{i % 7}"}
+                         for i in range(5000)))
+    trxs = [utils.make_trx(Name=f"CARD PAYMENT MERCHANT {i % 6000:04d} LONDON")
+            for i in range(20000)]
+
+    start = time.perf_counter()
+    matched = [rules.match(t) for t in trxs]
+
+    assert time.perf_counter() - start < 2
+    assert sum(1 for rule in matched if rule is not None) == 17000
+    assert matched[1234].category == "C2"
+
+@pytest.mark.asyncio
+async def test_app_auto_categorises_uncategorised_rows(tmp_path):
+    rules_path = write_rules(tmp_path, {"name": "tesco", "category": "Groceries"})
+    trxs = [utils.make_trx(Name=name) for name in ("Tesco", "Aldi", "Tesco Metro")]
+    trxs[2].set_category("General")
+
+    async with utils.run_app_with_mock_data(trxs) as (app, pilot, _):
+        app.rules_path = rules_path
+        await pilot.press("A")
+        await pilot.pause()
+
+        assert [t.category() for t in trxs] == ["Groceries", "", "General"]
+        assert app.unsaved_changes is True
+
+def test_cli_categorise_and_report(tmp_path):
+    data = make_session(tmp_path)
+    rules_path = write_rules(tmp_path, {"name": "coffee", "category": "Eating Out"})
+    output = str(tmp_path / "categorised.csv")
+
+    args = budget_tool.parse_args(["categorise", data, "-o", output, "--rules", rules_path])
+    assert budget_tool.run_categorise(args) == 0
+
+    categories = [t.category() for t in budget.load_data(output, use_cache=False)]
+    assert categories == ["Groceries", "Groceries", "Eating Out", "Eating Out", "Pot", "Transport"]
+
+    args = budget_tool.parse_args(["report", data, "--categorise", "--rules", rules_path])
+    assert budget_tool.run_report(args) == 0
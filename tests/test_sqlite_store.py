@@ -0,0 +1,176 @@
+import unittest.mock
+import pytest
+
+from budget.filter_index import FilterIndex
+from budget.summary_totals import SummaryTotals
+from budget.sqlite_store import SqliteSession, is_sqlite_path, load_sqlite, save_sqlite
+from budget.main import BudgetApp
+from budget.widgets import TransactionTable
+from . import utils
+
+def make_session_trxs():
+    return [
+        utils.make_trx("1", "-10.00", "Groceries", Name="Tesco"),
+        utils.make_trx("2", "-5.50", "Groceries", Name="Aldi"),
+        utils.make_trx("3", "-2.00", Name="Bus"),
+        utils.make_trx("4", "2000.00", income=True, Name="Salary"),
+        utils.make_trx("5", "-200.00", "Pot", pot_category="Holidays", Name="Flight"),
+        utils.make_trx("6", "-1.00", "Transport", excluded=True, Name="Ignored"),
+        utils.make_trx("7", "-80.00", "Pot", link="5", Name="Hotel"),
+    ]
+
+def test_is_sqlite_path():
+    assert is_sqlite_path("session.db")
+    assert is_sqlite_path("session.SQLITE")
+    assert not is_sqlite_path("session.csv")
+
+def test_round_trip(tmp_path):
+    trxs = make_session_trxs()
+    db = tmp_path / "session.db"
+
+    save_sqlite(db, trxs)
+
+    assert load_sqlite(db) == trxs
+
+def test_record_change_is_committed_on_commit(tmp_path):
+    db = tmp_path / "session.db"
+    save_sqlite(db, make_session_trxs())
+
+    session = SqliteSession(db)
+    trx = session.load()[2]
+    trx.set_observer(session.record_change)
+    trx.set_category("Transport")
+    session.commit()
+    session.close()
+
+    assert load_sqlite(db)[2].category() == "Transport"
+
+def test_uncommitted_change_is_discarded(tmp_path):
+    db = tmp_path / "session.db"
+    save_sqlite(db, make_session_trxs())
+
+    session = SqliteSession(db)
+    trx = session.load()[2]
+    trx.set_observer(session.record_change)
+    trx.set_category("Transport")
+    session.close()
+
+    assert load_sqlite(db)[2].category() == ""
+
+def test_loading_missing_database_does_not_create_it(tmp_path):
+    db = tmp_path / "missing.db"
+
+    with pytest.raises(FileNotFoundError):
+        load_sqlite(db)
+
+    assert not db.exists()
+
+def test_record_change_updates_only_that_row_of_a_duplicate_id(tmp_path):
+    db = tmp_path / "session.db"
+    save_sqlite(db, [utils.make_trx("1", "-10.00", Name="Tesco"),
+                     utils.make_trx("1", "-5.50", Name="Aldi")])
+
+    session = SqliteSession(db)
+    trxs = session.load()
+    for trx in trxs:
+        trx.set_observer(session.record_change)
+    trxs[1].set_category("Groceries")
+    session.commit()
+    session.close()
+
+    assert [t.category() for t in load_sqlite(db)] == ["", "Groceries"]
+
+@pytest.mark.parametrize("filters, expected", [
+    ({"All (Active)"}, ["1", "2", "3", "4", "5", "7"]),
+    ({"Excluded"}, ["6"]),
+    ({"Uncategorized"}, ["3", "4"]),
+    ({"Unlinked Pot"}, ["5"]),
+    ({"Groceries", "Excluded"}, ["1", "2", "6"]),
+    (set(), []),
+])
+def test_iter_filtered(tmp_path, filters, expected):
+    db = tmp_path / "session.db"
+    save_sqlite(db, make_session_trxs())
+
+    session = SqliteSession(db)
+    assert [t.id() for t in session.iter_filtered(filters)] == expected
+    session.close()
+
+@pytest.mark.parametrize("filters", [
+    {"all (active)"}, {"excluded"}, {"uncategorized"}, {"categorized"},
+    {"unlinked pot"}, {"groceries", "excluded"}, {"pot"}, set(),
+])
+def test_filtered_positions_match_filter_index(tmp_path, filters):
+    db = tmp_path / "session.db"
+    save_sqlite(db, make_session_trxs())
+
+    session = SqliteSession(db)
+    trxs = session.load()
+    assert session.filtered_positions(filters) == FilterIndex(trxs).positions(filters)
+    session.close()
+
+def test_summary_queries_match_summary_totals(tmp_path):
+    db = tmp_path / "session.db"
+    save_sqlite(db, make_session_trxs())
+
+    session = SqliteSession(db)
+    totals = SummaryTotals(session.load())
+
+    assert session.category_totals() == {"Groceries": -1550, "Uncategorized": -200}
+    assert session.income_total() == 200000
+    assert session.pot_totals() == {"Holidays": -20000, "Unassigned Pot": -8000}
+    for query in ("category_totals", "income_total", "income_positions",
+                  "spending_total", "pot_totals"):
+        assert getattr(session, query)() == getattr(totals, query)()
+    for pot in ("Holidays", "Unassigned Pot"):
+        assert session.pot_positions(pot) == totals.pot_positions(pot)
+    session.close()
+
+def test_queries_see_uncommitted_changes(tmp_path):
+    db = tmp_path / "session.db"
+    save_sqlite(db, make_session_trxs())
+
+    session = SqliteSession(db)
+    trxs = session.load()
+    trxs[2].set_observer(session.record_change)
+    trxs[2].set_category("Transport")
+
+    assert session.filtered_positions({"transport"}) == [2]
+    assert "Uncategorized" not in session.category_totals()
+    session.close()
+
+@pytest.mark.asyncio
+async def test_app_filters_and_totals_come_from_database(tmp_path):
+    db = tmp_path / "session.db"
+    save_sqlite(db, make_session_trxs())
+
+    app = BudgetApp()
+    async with app.run_test() as pilot:
+        app.load_transactions(str(db))
+        # pylint: disable=protected-access
+        session = app._sqlite_session
+        with unittest.mock.patch.object(
+                session, "filtered_positions", wraps=session.filtered_positions) as query:
+            app.filter_categories = {"Groceries"}
+            app._apply_filters()
+            query.assert_called_once_with({"groceries"})
+        assert app.query_one(TransactionTable).row_count == 2
+        assert app._totals() is session
+
+        app.transactions[2].set_category("Groceries")
+        await pilot.pause()
+        assert "Spending -17.50" in str(app.query_one("#running-totals").render())
+
+@pytest.mark.asyncio
+async def test_app_commits_edits_to_loaded_database(tmp_path):
+    db = tmp_path / "session.db"
+    save_sqlite(db, make_session_trxs())
+
+    app = BudgetApp()
+    async with app.run_test() as pilot:
+        app.load_transactions(str(db))
+        app.transactions[0].set_category("Eating Out")
+        app._save(str(db))  # pylint: disable=protected-access
+        await pilot.pause()
+
+    assert load_sqlite(db)[0].category() == "Eating Out"
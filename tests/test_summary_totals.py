@@ -0,0 +1,73 @@
+import pytest
+from textual.widgets import Label
+
+from budget.summary_totals import SummaryTotals
+from budget.transaction_store import TransactionStore
+from . import utils
+
+def make_trxs():
+    amounts = ["-10.00", "-20.00", "-5.00", "2000.00", "-100.00", "100.00", "-50.00", "-1.00"]
+    trxs = [utils.make_trx(str(i), amount, Type="Pot transfer" if i == 5 else "Card payment")
+            for i, amount in enumerate(amounts)]
+    trxs[0].set_category("Groceries")
+    trxs[1].set_category("Groceries")
+    trxs[3].set_income(True)
+    trxs[4].set_category("Pot")
+    trxs[4].set_pot_category("Holiday")
+    trxs[5].set_category("Pot")
+    trxs[5].set_pot_category("Holiday")
+    trxs[6].set_category("Pot")
+    trxs[7].set_category("Transport")
+    trxs[7].set_excluded(True)
+    return trxs
+
+def test_totals():
+    totals = SummaryTotals(make_trxs())
+
+    assert totals.income_total() == 200000
+    assert totals.income_positions() == [3]
+    assert totals.category_totals() == {"Groceries": -3000, "Uncategorized": -500}
+    assert totals.spending_total() == -3500
+    assert totals.pot_totals() == {"Holiday": -10000, "Unassigned Pot": -5000}
+    assert totals.pot_positions("Holiday") == [4]
+
+def test_follows_edits():
+    trxs = make_trxs()
+    totals = SummaryTotals(trxs)
+
+    trxs[2].set_category("Transport")
+    totals.update(trxs[2])
+    trxs[1].set_excluded(True)
+    totals.update(trxs[1])
+    trxs[7].set_excluded(False)
+    totals.update(trxs[7])
+    trxs[6].set_pot_category("Holiday")
+    totals.update(trxs[6])
+
+    assert totals.category_totals() == {"Groceries": -1000, "Transport": -600}
+    assert totals.pot_totals() == {"Holiday": -15000}
+    assert totals.pot_positions("Holiday") == [4, 6]
+
+def test_store_rows_are_tracked_by_position():
+    store = TransactionStore.from_transactions(make_trxs())
+    totals = SummaryTotals(store)
+
+    store[2].set_income(True)
+    totals.update(store[2])
+
+    assert totals.income_total() == 199500
+    assert "Uncategorized" not in totals.category_totals()
+
+@pytest.mark.asyncio
+async def test_app_keeps_running_totals():
+    trxs = make_trxs()
+    async with utils.run_app_with_mock_data(trxs) as (app, pilot, _):
+        await pilot.pause()
+        status = app.query_one("#running-totals", Label)
+        assert "Spending -35.00" in str(status.render())
+
+        await pilot.press("i")
+        await pilot.pause()
+
+        assert "Income 1990.00" in str(status.render())
+        assert "Spending -25.00" in str(status.render())
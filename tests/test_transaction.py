@@ -101,3 +101,20 @@ def test_clear_processed_fields():
     assert trx.status() == ""
     assert trx.excluded() is False
     assert trx.link() == ""
+
+def test_observer_notified_of_changes():
+    trx = Transaction(RawTransaction(utils.mock_raw_trx_data()))
+    changes = []
+    trx.set_observer(lambda t, field, old, new: changes.append((t, field, old, new)))
+
+    trx.set_category("Food")
+    trx.set_category("Food")
+    trx.set_excluded(True)
+    trx.clear_processed_fields()
+
+    assert changes == [
+        (trx, "category", "", "Food"),
+        (trx, "excluded", False, True),
+        (trx, "excluded", True, False),
+        (trx, "category", "Food", ""),
+    ]
@@ -0,0 +1,107 @@
+import datetime
+import pytest
+
+from budget.journal import EditJournal
+from budget.transaction import Transaction, save_transactions
+from budget.raw_transaction import RawTransaction
+from budget.transaction_store import TransactionStore
+from budget.widgets import TransactionTable
+from . import utils
+
+def make_store():
+    t1 = Transaction(RawTransaction(utils.mock_raw_trx_data(
+        Name="T1", Amount="-10.00", **{"Transaction ID": "1"})))
+    t1.set_category("Groceries")
+    t2 = Transaction(RawTransaction(utils.mock_raw_trx_data(
+        Name="T2", Amount="-20.00", Date="2025-01-02", **{"Transaction ID": "2"})))
+    t2.set_excluded(True)
+    return [t1, t2], TransactionStore.from_transactions([t1, t2])
+
+def test_row_view_matches_transaction():
+    trxs, store = make_store()
+
+    assert len(store) == 2
+    for trx, row in zip(trxs, store):
+        assert row == trx
+        assert row.id() == trx.id()
+        assert row.name() == trx.name()
+        assert row.amount() == trx.amount()
+        assert row.date() == trx.date()
+        assert row.category() == trx.category()
+        assert row.excluded() == trx.excluded()
+        assert row.to_prefixed_dict() == trx.to_prefixed_dict()
+
+    assert store[1].date() == datetime.date(2025, 1, 2)
+    assert store[-1].name() == "T2"
+
+def test_row_view_setters_write_to_columns():
+    _, store = make_store()
+
+    row = store[0]
+    row.set_category("Pot")
+    row.set_pot_category("Bills")
+    row.set_link("2")
+    row.set_income(True)
+
+    fresh = store[0]
+    assert fresh.category() == "Pot"
+    assert fresh.pot_category() == "Bills"
+    assert fresh.link() == "2"
+    assert fresh.income() is True
+
+    fresh.clear_processed_fields()
+    assert store[0].category() == ""
+    assert store[0].income() is False
+
+def test_bad_amount_raises_on_access():
+    store = TransactionStore.from_transactions(
+        [Transaction(RawTransaction(utils.mock_raw_trx_data(Amount="abc")))])
+
+    with pytest.raises(ValueError, match="Invalid amount"):
+        store[0].amount()
+
+def test_save_and_load_store(tmp_path):
+    trxs, store = make_store()
+    csv_file = tmp_path / "store.csv"
+
+    save_transactions(csv_file, store)
+    loaded = TransactionStore.from_csv(csv_file)
+
+    assert len(loaded) == 2
+    assert list(loaded) == trxs
+
+def test_padded_cells_are_stripped_once_and_kept_for_saving():
+    store = TransactionStore.from_transactions(
+        [Transaction(RawTransaction(utils.mock_raw_trx_data(Name="  Cafe ")))])
+
+    assert store[0].name() == "Cafe"
+    assert store[0].raw.to_dict()["Name"] == "  Cafe "
+    assert store[0].to_prefixed_dict()["Name"] == "  Cafe "
+
+def test_from_csv_replays_journal(tmp_path):
+    trxs, store = make_store()
+    csv_file = tmp_path / "store.csv"
+    save_transactions(csv_file, store)
+
+    journal = EditJournal(csv_file)
+    journal.record(trxs[0], "category", "Groceries", "Bills")
+    journal.flush()
+
+    loaded = TransactionStore.from_csv(csv_file)
+    assert loaded[0].category() == "Bills"
+    assert loaded[1].category() == ""
+
+@pytest.mark.asyncio
+async def test_app_runs_against_store():
+    _, store = make_store()
+
+    async with utils.run_app_with_mock_data(store) as (app, pilot, _):
+        table = app.query_one(TransactionTable)
+        # Excluded row is hidden by the default filter
+        assert table.row_count == 1
+
+        table.move_cursor(row=0)
+        await pilot.press("t")
+        await pilot.pause()
+
+        assert store[0].category() == "Transport"
@@ -0,0 +1,32 @@
+import pytest
+from textual.widgets import DataTable
+from budget.period_cube import PeriodCube
+from budget.screens import PeriodComparisonScreen
+from .. import utils
+
+@pytest.mark.asyncio
+async def test_compares_with_previous_month_and_year():
+    transactions = [
+        utils.make_trx(amount="-30.00", category="Groceries", Date="05/03/2024"),
+        utils.make_trx(amount="-10.00", category="Groceries", Date="05/02/2025"),
+        utils.make_trx(amount="-25.00", category="Groceries", Date="05/03/2025"),
+        utils.make_trx(amount="-4.00", category="Transport", Date="06/03/2025"),
+    ]
+
+    screen = PeriodComparisonScreen(PeriodCube(transactions))
+    app = utils.ScreenTestApp(screen)
+
+    async with app.run_test() as pilot:
+        table = app.screen.query_one("#compare-table", DataTable)
+
+        assert [str(c.label) for c in table.columns.values()] == [
+            "Category", "Mar 2025", "Feb 2025", "Change", "Mar 2024", "Change"]
+        assert table.get_row_at(0) == ["Groceries", "-25.00", "-10.00", "-15.00",
+                                       "-30.00", "5.00"]
+        assert table.get_row_at(1) == ["Transport", "-4.00", "0.00", "-4.00", "0.00", "-4.00"]
+
+        await pilot.press("p")
+        await pilot.pause()
+
+        assert str(list(table.columns.values())[1].label) == "Feb 2025"
+        assert table.get_row_at(0)[1] == "-10.00"
@@ -136,8 +136,8 @@ async def test_empty_data_load_file():
 
 
         await pilot.click("#filename")
-        # patch the BudgetApp's load_data to simulate file existence
-        with unittest.mock.patch("budget.main.load_data") as mock_load:
+        # patch the BudgetApp's CSV load to simulate file existence
+        with unittest.mock.patch("budget.main.TransactionStore.from_csv") as mock_load:
             await pilot.press("e", "x", "i", "s", "t", "s", ".", "c", "s", "v")
             await pilot.click("#load")
 
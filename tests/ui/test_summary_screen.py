@@ -81,11 +81,17 @@ async def test_summary_screen_pot_details():
     
     async with app.run_test() as pilot:
         # Check Pot Headers
-        # We expect "Pot: Car" and "Pot: Holiday" labels
+        # We expect collapsed "Pot: Car" and "Pot: Holiday" sections with totals
         
-        labels = [str(w.render()) for w in app.screen.query(".pot-header")]
-        assert "Pot: Car" in labels[0]
-        assert "Pot: Holiday" in labels[1]
+        sections = list(app.screen.query(".pot-section"))
+        assert sections[0].title == "Pot: Car (1 transactions, total -50.00)"
+        assert sections[1].title == "Pot: Holiday (2 transactions, total -350.00)"
+        
+        # Tables are only created once a section is expanded
+        assert not app.screen.query(".pot-table")
+        for section in sections:
+            section.collapsed = False
+        await pilot.pause()
         
         # Check Tables
         tables = list(app.screen.query(".pot-table"))
@@ -125,6 +131,9 @@ async def test_summary_screen_manual_link_toggle():
     app = utils.ScreenTestApp(screen)
     
     async with app.run_test() as pilot:
+        app.screen.query_one(".pot-section").collapsed = False
+        await pilot.pause()
+        
         # Find the table
         table = app.screen.query_one(".pot-table", DataTable)
         
@@ -151,3 +160,28 @@ async def test_summary_screen_manual_link_toggle():
         # Should be No
         assert table.get_cell_at((0, 3)) == "No"
         assert t1.link() == ""
+
+@pytest.mark.asyncio
+async def test_summary_screen_pot_table_pages_rows():
+    transactions = []
+    for i in range(120):
+        trx = Transaction(RawTransaction(utils.mock_raw_trx_data(
+            Name=f"T{i}", Amount="-1.00", **{"Transaction ID": str(i)})))
+        trx.set_category("Pot")
+        trx.set_pot_category("Bills")
+        transactions.append(trx)
+    
+    screen = SummaryScreen(transactions)
+    app = utils.ScreenTestApp(screen)
+    
+    async with app.run_test() as pilot:
+        app.screen.query_one(".pot-section").collapsed = False
+        await pilot.pause()
+        
+        table = app.screen.query_one(".pot-table", DataTable)
+        assert table.row_count == 50
+        
+        table.move_cursor(row=49)
+        await pilot.pause()
+        
+        assert table.row_count == 100
@@ -33,13 +33,33 @@ def mock_raw_trx_data(**overrides):
     row.update(overrides)
     return row
 
+def make_trx(trx_id=None, amount=None, category="", **fields):
+    """
+    Returns a Transaction built from mock_raw_trx_data.
+
+    Keyword arguments named after Transaction.fields_to_persist (pot_category,
+    link, income...) set processed fields; any others override raw fields by
+    column name, e.g. Name="Tesco" or Date="01/01/2025".
+    """
+    raw = {f: v for f, v in fields.items() if f not in Transaction.fields_to_persist}
+    if trx_id is not None:
+        raw["Transaction ID"] = trx_id
+    if amount is not None:
+        raw["Amount"] = amount
+    trx = Transaction(RawTransaction(mock_raw_trx_data(**raw)))
+    trx.set_category(category)
+    for field in Transaction.fields_to_persist:
+        if field in fields:
+            getattr(trx, f"set_{field}")(fields[field])
+    return trx
+
 @contextlib.asynccontextmanager
 async def run_app_with_mock_data(transactions=None, mock_save=False, mock_path_exists=None):
     """
-    Runs the BudgetApp with mocked load_data.
+    Runs the BudgetApp with a mocked CSV load (TransactionStore.from_csv).
 
     Args:
-        transactions: List of Transaction objects to return from load_data.
+        transactions: Transactions (a list or TransactionStore) for the load to return.
         mock_save: If True, mocks save_transactions.
         mock_path_exists: If set (True/False), mocks pathlib.Path.exists.
 
@@ -49,7 +69,8 @@ async def run_app_with_mock_data(transactions=None, mock_save=False, mock_path_e
     if transactions is None:
         transactions = []
 
-    with unittest.mock.patch("budget.main.load_data", return_value=transactions):
+    with unittest.mock.patch("budget.main.TransactionStore.from_csv",
+                             return_value=transactions):
 
         stack = contextlib.ExitStack()
 
@@ -84,6 +105,9 @@ async def perform_save_flow(pilot, filename="save.csv"):
         await pilot.press(char)
     await pilot.click("#save")
     await pilot.pause()
+    # Saves are written on a worker thread
+    await pilot.app.workers.wait_for_complete()
+    await pilot.pause()
 
 def mock_transactions_for_filtering():
     """Returns a list of 3 transactions for filtering tests."""